@@ -1,5 +1,8 @@
 from .apply_geometry_lookup_table import *
+from .chunk_row_blocks import *
+from .compact_GLT_dtype import *
 from .constants import *
+from .emit_ortho_blocks import *
 from .emit_ortho_raster import *
 from .emit_xarray import *
 from .EMITL2AMASKNetCDF import *
@@ -10,22 +13,42 @@ from .EMITNetCDF import *
 from .extract_GLT import *
 from .extract_GLT_array import *
 from .find_EMIT_L2A_RFL_granule import *
+from .fully_masked_chunks import *
 from .generate_earthaccess_query import *
 from .generate_EMIT_L2A_RFL_timeseries import *
 from .get_pixel_center_coords import *
+from .metadata_sidecar import *
 from .GLT import *
+from .InverseGLT import *
+from .netcdf_auto_mask import *
+from .netcdf_handle_pool import *
+from .ortho_fill_value import *
 from .ortho_xr import *
+from .OrthoPlan import *
+from .PackedMask import *
 from .read_elevation import *
+from .read_emit_window import *
 from .read_geolocation import *
+from .read_GLT import *
 from .read_latitude_array import *
 from .read_longitude_array import *
 from .read_netcdf_array import *
+from .read_netcdf_array_into import *
+from .read_netcdf_array_parallel import *
+from .read_netcdf_dask_array import *
+from .read_netcdf_pixels import *
 from .read_netcdf_raster import *
 from .retrieve_EMIT_L2A_RFL import *
 from .retrieve_EMIT_L2A_RFL_granule import *
 from .search_EMIT_L2A_RFL_granules import *
 from .search_earthaccess_granules import *
+from .select_bands import *
+from .SwathResampler import *
 from .show_netcdf_tree import *
 from .spatially_constrain_earthaccess_query import *
+from .swath_footprint_index import *
+from .swath_pixels_from_points import *
+from .target_grid_hash import *
 from .temporally_constrain_earthaccess_query import *
+from .TiePointGeolocation import *
 from .version import __version__
@@ -1,6 +1,9 @@
+import threading
+from collections import OrderedDict
 from os.path import abspath, expanduser
-from typing import List, Union
+from typing import List, NamedTuple, Optional, Sequence, Tuple, Union
 import numpy as np
+import dask.array as da
 
 from rasterio.windows import Window
 
@@ -10,19 +13,48 @@ from rasters import Raster, RasterGeometry, RasterGeolocation, RasterGrid
 from .EMITL2ARFLNetCDF import EMITL2ARFLNetCDF
 from .EMITL2AMASKNetCDF import EMITL2AMASKNetCDF
 from .EMITL2ARFLUNCERTNetCDF import EMITL2ARFLUNCERTNetCDF
-from .constants import QUALITY_BANDS
+from .constants import MAX_CACHED_QUALITY_MASKS, QUALITY_BANDS
 from .read_qmask import read_qmask
 from .emit_ortho_raster import emit_ortho_raster
 
 from .GLT import GeometryLookupTable
 from .read_netcdf_raster import read_netcdf_raster
 from .read_geolocation import read_geolocation
+from .read_netcdf_dask_array import read_netcdf_dask_array
+from .PackedMask import PackedMask
+from .fully_masked_chunks import fully_masked_chunks
+from .netcdf_handle_pool import open_netcdf
+from .metadata_sidecar import read_netcdf_metadata
+from .read_netcdf_pixels import read_netcdf_pixels
+from .select_bands import select_bands
+from .swath_pixels_from_points import swath_pixels_from_points
+from .swath_footprint_index import geometry_swath_window
+from .SwathResampler import SwathResampler, read_swath_resampler
+
+class PointSamples(NamedTuple):
+    """
+    Reflectance spectra and quality flags sampled at points.
+
+    spectra: (points, bands) reflectance, NaN for points without a swath pixel.
+    quality_flags: (points, quality bands) mask flags, NaN for points without a swath pixel.
+    rows, cols: zero-based swath pixel of each point, -1 for points without a swath pixel.
+    """
+    spectra: np.ndarray
+    quality_flags: np.ndarray
+    rows: np.ndarray
+    cols: np.ndarray
 
 class EMITL2ARFLGranule:
     def __init__(self, reflectance_filename: str, mask_filename: str, uncertainty_filename: str) -> None:
         self.reflectance_filename: str = abspath(expanduser(reflectance_filename))
         self.mask_filename: str = abspath(expanduser(mask_filename))
         self.uncertainty_filename: str = abspath(expanduser(uncertainty_filename))
+        # bit-packed quality masks keyed by (quality bands, swath window)
+        self._quality_masks: "OrderedDict[Tuple[Tuple[int, ...], Optional[Tuple[int, int, int, int]]], PackedMask]" = OrderedDict()
+        self._quality_masks_lock = threading.Lock()
+        # fully masked reflectance chunks keyed by (quality bands, chunk window), guarded by the quality mask lock
+        self._masked_chunks: "OrderedDict[Tuple[Tuple[int, ...], Tuple[int, int, int, int]], np.ndarray]" = OrderedDict()
+        self._reflectance_chunk_layout = None
 
     def __repr__(self) -> str:
         return (f"EMITL2ARFL(reflectance_filename=\"{self.reflectance_filename}\", "
@@ -69,35 +101,188 @@ class EMITL2ARFLGranule:
 
     GLT = property(extract_GLT)
 
-    def quality_mask(
-            self, 
+    def resampler(self, geometry: RasterGrid) -> SwathResampler:
+        """
+        Return the cached nearest-neighbour resampler from the swath of this granule onto a target grid.
+
+        The reflectance, mask and uncertainty files share the geolocation of the reflectance file,
+        so one resampler serves all three.
+        """
+        return read_swath_resampler(self.reflectance_filename, geometry)
+
+    def swath_quality_mask(
+            self,
             swath_window: Window = None,
-            geometry: RasterGeometry = None,
-            quality_bands: List[int] = QUALITY_BANDS) -> Union[Raster, np.ndarray]:
-        granule_geolocation = read_geolocation(filename=self.reflectance_filename)
-        
-        if swath_window is None and geometry is not None:
-            swath_window = granule_geolocation.window(geometry)
-            subset_geolocation = granule_geolocation[swath_window]
+            quality_bands: List[int] = QUALITY_BANDS) -> np.ndarray:
+        """
+        Return the boolean swath quality mask for a window, computed once per quality bands and window.
 
-        if geometry is None and swath_window is not None:
-            subset_geolocation = granule_geolocation[swath_window]
+        The mask is kept bit-packed on the granule and unpacked on every call, so repeated reads of the
+        same window share one read of the mask file at 1 bit per pixel. A window inside a cached mask,
+        such as the whole swath, is unpacked from it without reading the file again.
+        """
+        quality_bands_key = tuple(int(band) for band in quality_bands)
+        window_key = None if swath_window is None else (
+            int(swath_window.row_off),
+            int(swath_window.col_off),
+            int(swath_window.height),
+            int(swath_window.width)
+        )
 
-        if geometry is None and swath_window is None:
-            subset_geolocation = granule_geolocation
+        with self._quality_masks_lock:
+            packed = self._quality_masks.get((quality_bands_key, window_key))
+
+            if packed is not None:
+                self._quality_masks.move_to_end((quality_bands_key, window_key))
+                return packed.unpack()
+
+            containing = self._containing_quality_mask(quality_bands_key, window_key)
+
+        if containing is not None:
+            packed, relative_window = containing
+            return packed.unpack(relative_window)
 
         qmask: np.ndarray = read_qmask(
             filename=self.mask_filename,
             window=swath_window,
             quality_bands=quality_bands
         )
-        
-        qmask = Raster(qmask, geometry=subset_geolocation)
-        
-        if geometry is not None:
-            # qmask = Raster(qmask, geometry=subset_geolocation)
-            qmask = qmask.to_geometry(geometry)
-            
+
+        # fill values sum to NaN and count as clear
+        packed = PackedMask.from_array(np.nan_to_num(qmask).astype(bool))
+
+        with self._quality_masks_lock:
+            self._quality_masks[(quality_bands_key, window_key)] = packed
+
+            while len(self._quality_masks) > MAX_CACHED_QUALITY_MASKS:
+                self._quality_masks.popitem(last=False)
+
+        return packed.unpack()
+
+    def _containing_quality_mask(
+            self,
+            quality_bands_key: Tuple[int, ...],
+            window_key: Optional[Tuple[int, int, int, int]]) -> Optional[Tuple[PackedMask, Optional[Window]]]:
+        # a cached mask of the same quality bands whose window covers the requested one, with the
+        # requested window relative to it; called with the quality mask lock held
+        for (cached_bands, cached_window), packed in self._quality_masks.items():
+            if cached_bands != quality_bands_key:
+                continue
+
+            if cached_window is None:
+                if window_key is None:
+                    return packed, None
+
+                row_off, col_off, height, width = window_key
+                return packed, Window(col_off=col_off, row_off=row_off, width=width, height=height)
+
+            if window_key is None:
+                continue
+
+            row_off, col_off, height, width = window_key
+            cached_row_off, cached_col_off, cached_height, cached_width = cached_window
+
+            if (cached_row_off <= row_off and row_off + height <= cached_row_off + cached_height and
+                    cached_col_off <= col_off and col_off + width <= cached_col_off + cached_width):
+                return packed, Window(
+                    col_off=col_off - cached_col_off,
+                    row_off=row_off - cached_row_off,
+                    width=width,
+                    height=height
+                )
+
+        return None
+
+    def masked_reflectance_chunks(
+            self,
+            swath_window: Window = None,
+            quality_bands: List[int] = QUALITY_BANDS) -> Optional[np.ndarray]:
+        """
+        Return which on-disk chunks of the reflectance cube are fully masked under the quality bands.
+
+        Only the chunks intersecting `swath_window` are summarized, from the quality mask of those chunks,
+        so a small window never reads the mask of the whole swath. Chunks outside the window are reported
+        as not masked. The summary is cached per quality bands and chunk window, and its mask is cached by
+        `swath_quality_mask`, where it also serves the window itself. None if the cube is not chunked.
+        """
+        with self._quality_masks_lock:
+            layout = self._reflectance_chunk_layout
+
+        if layout is None:
+            with open_netcdf(self.reflectance_filename) as ds:
+                variable = ds.variables["reflectance"]
+                chunking = variable.chunking()
+                layout = (tuple(variable.shape[:2]), tuple(chunking[:2]) if isinstance(chunking, list) else None)
+
+            with self._quality_masks_lock:
+                self._reflectance_chunk_layout = layout
+
+        (rows, cols), chunk_shape = layout
+
+        if chunk_shape is None:
+            return None
+
+        if swath_window is None:
+            swath_window = Window(col_off=0, row_off=0, width=cols, height=rows)
+
+        chunk_rows, chunk_cols = chunk_shape
+        row_off, col_off = int(swath_window.row_off), int(swath_window.col_off)
+        # the chunks intersecting the window, as (start, stop) along each axis of the chunk grid
+        chunk_row_start, chunk_row_stop = row_off // chunk_rows, -(-(row_off + int(swath_window.height)) // chunk_rows)
+        chunk_col_start, chunk_col_stop = col_off // chunk_cols, -(-(col_off + int(swath_window.width)) // chunk_cols)
+        quality_bands_key = tuple(int(band) for band in quality_bands)
+        key = (quality_bands_key, (chunk_row_start, chunk_row_stop, chunk_col_start, chunk_col_stop))
+
+        with self._quality_masks_lock:
+            masked_chunks = self._masked_chunks.get(key)
+
+            if masked_chunks is not None:
+                self._masked_chunks.move_to_end(key)
+                return masked_chunks
+
+        chunk_window = Window(
+            col_off=chunk_col_start * chunk_cols,
+            row_off=chunk_row_start * chunk_rows,
+            width=min(cols, chunk_col_stop * chunk_cols) - chunk_col_start * chunk_cols,
+            height=min(rows, chunk_row_stop * chunk_rows) - chunk_row_start * chunk_rows
+        )
+
+        qmask = self.swath_quality_mask(swath_window=chunk_window, quality_bands=quality_bands)
+        masked_chunks = np.zeros((-(-rows // chunk_rows), -(-cols // chunk_cols)), dtype=bool)
+        masked_chunks[chunk_row_start:chunk_row_stop, chunk_col_start:chunk_col_stop] = fully_masked_chunks(qmask, chunk_shape)
+
+        with self._quality_masks_lock:
+            self._masked_chunks[key] = masked_chunks
+
+            while len(self._masked_chunks) > MAX_CACHED_QUALITY_MASKS:
+                self._masked_chunks.popitem(last=False)
+
+        return masked_chunks
+
+    def quality_mask(
+            self, 
+            swath_window: Window = None,
+            geometry: RasterGeometry = None,
+            quality_bands: List[int] = QUALITY_BANDS) -> Union[Raster, np.ndarray]:
+        if swath_window is None and isinstance(geometry, RasterGrid):
+            # gather onto the grid with the cached resampler instead of reading the geolocation
+            resampler = self.resampler(geometry)
+            qmask = self.swath_quality_mask(swath_window=resampler.swath_window, quality_bands=quality_bands)
+
+            return resampler.resample(qmask, nodata=False)
+
+        if swath_window is None and geometry is not None:
+            swath_window = geometry_swath_window(self.reflectance_filename, geometry)
+
+        # only the geolocation inside the swath window is read
+        subset_geolocation = read_geolocation(filename=self.reflectance_filename, window=swath_window)
+        qmask = self.swath_quality_mask(swath_window=swath_window, quality_bands=quality_bands)
+
+        if geometry is None:
+            return Raster(qmask, geometry=subset_geolocation)
+
+        qmask = Raster(qmask.astype(np.float32), geometry=subset_geolocation)
+        qmask = qmask.to_geometry(geometry)
         qmask = rt.where(np.isnan(qmask), 0, qmask)
         qmask = qmask.astype(bool)
         
@@ -108,28 +293,52 @@ class EMITL2ARFLGranule:
             geometry: RasterGeometry = None,
             swath_window: Window = None,
             qmask: np.ndarray = None,
-            filter_clouds: bool = True) -> Raster:
-            # If a window is not provided but a geometry is, compute the window from the geometry
-        if swath_window is None and geometry is not None:
-            # read the scene geolocation
-            geolocation = read_geolocation(filename=self.reflectance_filename)
-            # calculate the indices window that covers the target geometry
-            swath_window = geolocation.window(geometry)
+            filter_clouds: bool = True,
+            bands: Optional[Union[int, slice, Sequence[int]]] = None,
+            wavelength_range: Optional[Tuple[float, float]] = None,
+            good_bands_only: bool = False,
+            skip_masked_chunks: bool = True) -> Raster:
+        resampler = None
+        skip_chunks = None
+
+        if swath_window is None and isinstance(geometry, RasterGrid):
+            # repeated reads onto the same grid reuse one precomputed nearest-neighbour gather
+            resampler = self.resampler(geometry)
+            swath_window = resampler.swath_window
+        elif swath_window is None and geometry is not None:
+            # calculate the indices window that covers the target geometry from the cached footprint index
+            swath_window = geometry_swath_window(self.reflectance_filename, geometry)
+
+        if filter_clouds and skip_masked_chunks:
+            # chunks that are clouded all over end up fully masked, so they are filled instead of read;
+            # the summary caches the mask of the chunks around the window, which then serves the window below
+            skip_chunks = self.masked_reflectance_chunks(swath_window=swath_window)
 
         if filter_clouds:
-            qmask: Raster = self.quality_mask(swath_window=swath_window)
+            qmask = self.swath_quality_mask(swath_window=swath_window)
 
         result = read_netcdf_raster(
             filename=self.reflectance_filename,
             variable="reflectance",
             geometry=geometry,
             swath_window=swath_window,
-            qmask=qmask
+            qmask=qmask,
+            bands=bands,
+            wavelength_range=wavelength_range,
+            good_bands_only=good_bands_only,
+            resampler=resampler,
+            skip_chunks=skip_chunks
         )
         
-        if filter_clouds:
-            qmask = rt.where(np.isnan(qmask), 0, qmask)
-            qmask = qmask.astype(int)
+        if filter_clouds and resampler is not None:
+            clear = ~resampler.apply(qmask, fill_value=False)
+            result = result.mask(clear[np.newaxis])
+        elif filter_clouds and geometry is None:
+            # the result is on the swath window of the mask
+            result = result.mask(~qmask[np.newaxis])
+        elif filter_clouds:
+            subset_geolocation = read_geolocation(filename=self.reflectance_filename, window=swath_window)
+            qmask = Raster(qmask.astype(int), geometry=subset_geolocation)
             qmask.nodata = 0
             qmask = qmask.to_geometry(result.geometry)
             qmask = qmask.reshape(1, *qmask.shape)
@@ -138,6 +347,97 @@ class EMITL2ARFLGranule:
             result = result.mask(qmask)
 
         return result
+
+    def sample_points(
+            self,
+            lats: Sequence[float],
+            lons: Sequence[float],
+            bands: Optional[Union[int, slice, Sequence[int]]] = None,
+            wavelength_range: Optional[Tuple[float, float]] = None,
+            good_bands_only: bool = False,
+            quality_bands: List[int] = QUALITY_BANDS) -> PointSamples:
+        """
+        Sample reflectance spectra and quality flags at latitude/longitude points.
+
+        The points are mapped to swath pixels through the GLT and only the hyperslabs around those
+        pixels are read, so the cost scales with the number of points rather than the area they span.
+        """
+        swath_rows, swath_cols = swath_pixels_from_points(self.reflectance_filename, lats, lons)
+        mapped = swath_rows >= 0
+
+        band_indices = select_bands(
+            self.reflectance_filename,
+            bands=bands,
+            wavelength_range=wavelength_range,
+            good_bands_only=good_bands_only
+        )
+
+        if band_indices is None:
+            band_indices = np.arange(read_netcdf_metadata(self.reflectance_filename)["dimensions"]["bands"])
+
+        spectra = np.full((swath_rows.size, len(band_indices)), np.nan, dtype=np.float32)
+        quality_flags = np.full((swath_rows.size, len(quality_bands)), np.nan, dtype=np.float32)
+
+        if np.any(mapped):
+            spectra[mapped] = read_netcdf_pixels(
+                self.reflectance_filename,
+                "reflectance",
+                rows=swath_rows[mapped],
+                cols=swath_cols[mapped],
+                band_indices=band_indices,
+                dtype=np.float32
+            )
+
+            quality_flags[mapped] = read_netcdf_pixels(
+                self.mask_filename,
+                "mask",
+                rows=swath_rows[mapped],
+                cols=swath_cols[mapped],
+                band_indices=sorted(quality_bands),
+                dtype=np.float32
+            )[:, np.argsort(np.argsort(quality_bands))]
+
+        return PointSamples(spectra=spectra, quality_flags=quality_flags, rows=swath_rows, cols=swath_cols)
+
+    def reflectance_dask(
+            self,
+            swath_window: Window = None,
+            filter_clouds: bool = True,
+            quality_bands: List[int] = QUALITY_BANDS,
+            bands: Optional[Union[int, slice, Sequence[int]]] = None,
+            wavelength_range: Optional[Tuple[float, float]] = None,
+            good_bands_only: bool = False) -> da.Array:
+        """
+        Lazily read the swath reflectance cube as a (bands, rows, cols) dask array.
+
+        The quality mask is built lazily from the selected mask bands, so the whole graph only reads
+        the reflectance and mask chunks covering the window when it is computed.
+        """
+        qmask = None
+
+        if filter_clouds:
+            if any(x in quality_bands for x in [5, 6]):
+                raise AttributeError("Selected flags include a data band (5 or 6) not just flag bands")
+
+            mask = read_netcdf_dask_array(
+                filename=self.mask_filename,
+                variable="mask",
+                window=swath_window,
+                bands=quality_bands,
+                fill_to_nan=False
+            )
+
+            qmask = mask.sum(axis=0) >= 1
+
+        return read_netcdf_dask_array(
+            filename=self.reflectance_filename,
+            variable="reflectance",
+            window=swath_window,
+            bands=bands,
+            wavelength_range=wavelength_range,
+            good_bands_only=good_bands_only,
+            qmask=qmask
+        )
     
         # return emit_ortho_raster(
         #     filename=self.reflectance_filename,
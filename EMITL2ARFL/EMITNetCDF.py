@@ -1,23 +1,26 @@
-from typing import List, Dict, Optional, Union
+from typing import List, Dict, Optional, Sequence, Tuple, Union
 from affine import Affine
 from rasterio.windows import Window
 
 from os.path import abspath, expanduser
 import numpy as np
-
-import netCDF4
+import dask.array as da
 
 from rasters import Raster, RasterGeolocation, RasterGrid, RasterGeometry
 
 from .read_netcdf_raster import read_netcdf_raster
 from .read_netcdf_array import read_netcdf_array
+from .read_netcdf_array_into import read_netcdf_array_into
+from .read_netcdf_dask_array import read_netcdf_dask_array
 from .read_latitude_array import read_latitude_array
 from .read_longitude_array import read_longitude_array
 from .read_geolocation import read_geolocation
 from .extract_GLT import extract_GLT
 from .GLT import GeometryLookupTable
 from .show_netcdf_tree import show_netcdf_tree
-from .read_dimensions import read_dimensions
+from .select_bands import select_bands
+from .extract_grid import extract_grid
+from .metadata_sidecar import read_netcdf_metadata
 
 class EMITNetCDF:
     """
@@ -31,7 +34,6 @@ class EMITNetCDF:
             filename (str): Path to the NetCDF file.
         """
         self.filename: str = abspath(expanduser(filename))
-        self._metadata: Dict[str, Union[str, int, float]] = None
 
     def __repr__(self) -> str:
         """
@@ -85,14 +87,20 @@ class EMITNetCDF:
     
     @property
     def affine(self) -> Affine:
-        geotransform = self.metadata["geotransform"]
-        affine = Affine.from_gdal(geotransform)
+        """
+        Return the affine transform of the orthorectified grid from the `geotransform` attribute.
+        """
+        geotransform = self.index["geotransform"]
+        affine = Affine.from_gdal(*geotransform)
 
         return affine
 
     @property
     def grid(self) -> RasterGrid:
-        pass
+        """
+        Return the orthorectified grid (ortho_y, ortho_x) that the GLT maps onto.
+        """
+        return extract_grid(self.filename)
     
     def extract_GLT(
             self, 
@@ -118,7 +126,10 @@ class EMITNetCDF:
         group: str = None,
         geometry: Optional[RasterGeolocation] = None,
         window: Optional[Window] = None,
-        resampling: str = "nearest"
+        resampling: str = "nearest",
+        bands: Optional[Union[int, slice, Sequence[int]]] = None,
+        wavelength_range: Optional[Tuple[float, float]] = None,
+        good_bands_only: bool = False
     ) -> Raster:
         """
         Read a variable as a Raster object from a specified group in the NetCDF file, supporting spatial subsetting.
@@ -130,6 +141,9 @@ class EMITNetCDF:
             geometry (RasterGeolocation, optional): Spatial geometry for subsetting. Ignored if window is provided.
             window (rasterio.windows.Window, optional): Spatial window for subsetting. If provided, only the subset is read. Takes precedence over geometry.
             resampling (str, optional): Resampling method if geometry is provided. Defaults to "nearest".
+            bands (int, slice or sequence of int, optional): Zero-based band indices to read. Defaults to None (all bands).
+            wavelength_range (Tuple[float, float], optional): Inclusive (min, max) wavelength range in nanometers to read.
+            good_bands_only (bool, optional): Skip bands flagged as bad in `good_wavelengths`. Defaults to False.
 
         Returns:
             Raster: Raster object of the requested variable with geolocation, optionally spatially subsetted.
@@ -140,7 +154,10 @@ class EMITNetCDF:
             group=group,
             geometry=geometry,
             swath_window=window,
-            resampling=resampling
+            resampling=resampling,
+            bands=bands,
+            wavelength_range=wavelength_range,
+            good_bands_only=good_bands_only
         )
 
     def read_elevation(
@@ -171,13 +188,26 @@ class EMITNetCDF:
     
     elevation = property(read_elevation)
 
-    def read_array(self, variable: str, group: str = None, window: Window = None) -> np.ndarray:
+    def read_array(
+            self,
+            variable: str,
+            group: str = None,
+            window: Window = None,
+            bands: Optional[Union[int, slice, Sequence[int]]] = None,
+            wavelength_range: Optional[Tuple[float, float]] = None,
+            good_bands_only: bool = False,
+            workers: int = 1) -> np.ndarray:
         """
         Read a variable array from a specified group in the NetCDF file.
 
         Args:
             variable (str): Name of the variable to read.
             group (str): Name of the group in the NetCDF file.
+            window (rasterio.windows.Window, optional): Spatial window for subsetting.
+            bands (int, slice or sequence of int, optional): Zero-based band indices to read. Defaults to None (all bands).
+            wavelength_range (Tuple[float, float], optional): Inclusive (min, max) wavelength range in nanometers to read.
+            good_bands_only (bool, optional): Skip bands flagged as bad in `good_wavelengths`. Defaults to False.
+            workers (int, optional): Number of threads decompressing chunks in parallel. Defaults to 1.
 
         Returns:
             np.ndarray: Array of the requested variable.
@@ -186,22 +216,197 @@ class EMITNetCDF:
             filename=self.filename,
             variable=variable,
             group=group,
-            window=window
+            window=window,
+            bands=bands,
+            wavelength_range=wavelength_range,
+            good_bands_only=good_bands_only,
+            workers=workers
+        )
+
+    def read_into(
+            self,
+            variable: str,
+            out: np.ndarray = None,
+            group: str = None,
+            window: Window = None,
+            bands: Optional[Union[int, slice, Sequence[int]]] = None,
+            wavelength_range: Optional[Tuple[float, float]] = None,
+            good_bands_only: bool = False,
+            layout: str = "BSQ",
+            auto_mask: bool = False,
+            fill_to_nan: bool = True) -> np.ndarray:
+        """
+        Read a variable into a caller-provided C-contiguous buffer in the requested interleave.
+
+        Args:
+            variable (str): Name of the variable to read.
+            out (np.ndarray, optional): Destination buffer. Defaults to None (allocate one).
+            group (str, optional): Name of the group in the NetCDF file. Defaults to None (root group).
+            window (rasterio.windows.Window, optional): Spatial window for subsetting.
+            bands (int, slice or sequence of int, optional): Zero-based band indices to read. Defaults to None (all bands).
+            wavelength_range (Tuple[float, float], optional): Inclusive (min, max) wavelength range in nanometers to read.
+            good_bands_only (bool, optional): Skip bands flagged as bad in `good_wavelengths`. Defaults to False.
+            layout (str, optional): "BSQ" (bands, rows, cols), "BIP" (rows, cols, bands) or "BIL" (rows, bands, cols). Defaults to "BSQ".
+            auto_mask (bool, optional): Use netCDF4 auto-masking. Defaults to False (copy raw values).
+            fill_to_nan (bool, optional): Replace fill values with NaN in place for floating-point buffers. Defaults to True.
+
+        Returns:
+            np.ndarray: The filled buffer.
+        """
+        return read_netcdf_array_into(
+            filename=self.filename,
+            variable=variable,
+            out=out,
+            group=group,
+            window=window,
+            bands=bands,
+            wavelength_range=wavelength_range,
+            good_bands_only=good_bands_only,
+            layout=layout,
+            auto_mask=auto_mask,
+            fill_to_nan=fill_to_nan
+        )
+
+    def read_dask(
+            self,
+            variable: str,
+            group: str = None,
+            window: Window = None,
+            bands: Optional[Union[int, slice, Sequence[int]]] = None,
+            wavelength_range: Optional[Tuple[float, float]] = None,
+            good_bands_only: bool = False,
+            qmask: Optional[Union[np.ndarray, da.Array]] = None) -> da.Array:
+        """
+        Lazily read a variable as a dask array chunked like the on-disk HDF5 chunks.
+
+        Args:
+            variable (str): Name of the variable to read.
+            group (str, optional): Name of the group in the NetCDF file. Defaults to None (root group).
+            window (rasterio.windows.Window, optional): Spatial window for subsetting.
+            bands (int, slice or sequence of int, optional): Zero-based band indices to select. Defaults to None (all bands).
+            wavelength_range (Tuple[float, float], optional): Inclusive (min, max) wavelength range in nanometers to select.
+            good_bands_only (bool, optional): Drop bands flagged as bad in `good_wavelengths`. Defaults to False.
+            qmask (np.ndarray or dask.array.Array, optional): (rows, cols) mask of pixels to set to NaN.
+
+        Returns:
+            dask.array.Array: Lazy array, (bands, rows, cols) for 3-D variables.
+        """
+        return read_netcdf_dask_array(
+            filename=self.filename,
+            variable=variable,
+            group=group,
+            window=window,
+            bands=bands,
+            wavelength_range=wavelength_range,
+            good_bands_only=good_bands_only,
+            qmask=qmask
         )
 
+    def select_bands(
+            self,
+            bands: Optional[Union[int, slice, Sequence[int]]] = None,
+            wavelength_range: Optional[Tuple[float, float]] = None,
+            good_bands_only: bool = False) -> Optional[np.ndarray]:
+        """
+        Resolve a band selection to zero-based band indices.
+
+        Args:
+            bands (int, slice or sequence of int, optional): Zero-based band indices. Defaults to None (all bands).
+            wavelength_range (Tuple[float, float], optional): Inclusive (min, max) wavelength range in nanometers.
+            good_bands_only (bool, optional): Drop bands flagged as bad in `good_wavelengths`. Defaults to False.
+
+        Returns:
+            np.ndarray: Sorted band indices, or None if no selection was requested.
+        """
+        return select_bands(
+            filename=self.filename,
+            bands=bands,
+            wavelength_range=wavelength_range,
+            good_bands_only=good_bands_only
+        )
+
+    @property
+    def wavelengths(self) -> np.ndarray:
+        """
+        Read the band center wavelengths (nm) from the `sensor_band_parameters` group.
+
+        Returns:
+            np.ndarray: Wavelength of each band.
+        """
+        return np.asarray(self.index["sensor_band_parameters"]["wavelengths"], dtype=np.float32)
+
+    @property
+    def good_wavelengths(self) -> np.ndarray:
+        """
+        Read the good-band flags from the `sensor_band_parameters` group.
+
+        Returns:
+            np.ndarray: Boolean array, False for bad (water absorption) bands.
+        """
+        return np.asarray(self.index["sensor_band_parameters"]["good_wavelengths"]) == 1
+
+    @property
+    def index(self) -> Dict:
+        """
+        Return the metadata index of the file, served from the in-process cache or the JSON sidecar
+        next to the file, and only read from the file itself when the sidecar is missing or stale.
+
+        Returns:
+            dict: Dimensions, attributes, geotransform, bounds, band parameters and variable chunk layouts.
+        """
+        return read_netcdf_metadata(self.filename)
+
+    def chunking(self, variable: str, group: str = None) -> Optional[List[int]]:
+        """
+        Return the on-disk chunk shape of a variable.
+
+        Args:
+            variable (str): Name of the variable.
+            group (str, optional): Name of the group containing the variable. Defaults to None (root group).
+
+        Returns:
+            List[int]: Chunk shape, or None if the variable is stored contiguously.
+        """
+        key = variable if group is None else f"{group}/{variable}"
+        return self.index["variables"][key]["chunks"]
+
+    @property
+    def northernmost_latitude(self) -> float:
+        """
+        Return the northern bound of the granule.
+        """
+        return float(self.index["bounds"]["northernmost_latitude"])
+
+    @property
+    def southernmost_latitude(self) -> float:
+        """
+        Return the southern bound of the granule.
+        """
+        return float(self.index["bounds"]["southernmost_latitude"])
+
+    @property
+    def easternmost_longitude(self) -> float:
+        """
+        Return the eastern bound of the granule.
+        """
+        return float(self.index["bounds"]["easternmost_longitude"])
+
+    @property
+    def westernmost_longitude(self) -> float:
+        """
+        Return the western bound of the granule.
+        """
+        return float(self.index["bounds"]["westernmost_longitude"])
+
     @property
     def metadata(self) -> Dict[str, str]:
         """
-        Return a dictionary of global NetCDF file attributes (ncattrs), cached after first read.
+        Return a dictionary of global NetCDF file attributes (ncattrs), served from the metadata index.
 
         Returns:
             dict: Dictionary of attribute names and their values.
         """
-        if self._metadata is None:
-            with netCDF4.Dataset(self.filename, 'r') as ds:
-                self._metadata = {attr: ds.getncattr(attr) for attr in ds.ncattrs()}
-
-        return self._metadata
+        return self.index["attributes"]
     
     @property
     def groups(self) -> List[str]:
@@ -211,8 +416,7 @@ class EMITNetCDF:
         Returns:
             List[str]: List of group names.
         """
-        with netCDF4.Dataset(self.filename, 'r') as ds:
-            return list(ds.groups.keys())
+        return list(self.index["groups"])
         
     def variables(self, group: str = None) -> List[str]:
         """
@@ -224,11 +428,15 @@ class EMITNetCDF:
         Returns:
             List[str]: List of variable names.
         """
-        with netCDF4.Dataset(self.filename, 'r') as ds:
-            if group is None:
-                return list(ds.variables.keys())
-            else:
-                return list(ds.groups[group].variables.keys())
+        variables = self.index["variables"].keys()
+
+        if group is None:
+            return [key for key in variables if "/" not in key]
+        else:
+            if group not in self.groups:
+                raise KeyError(group)
+
+            return [key.split("/", 1)[1] for key in variables if key.startswith(f"{group}/")]
     
     @property
     def dimensions(self) -> dict[str, int]:
@@ -238,7 +446,7 @@ class EMITNetCDF:
         Returns:
             dict[str, int]: Dictionary where keys are dimension names and values are sizes.
         """
-        return read_dimensions(self.filename)
+        return dict(self.index["dimensions"])
 
     @property
     def downtrack(self) -> int:
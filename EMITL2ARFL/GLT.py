@@ -1,9 +1,40 @@
 
+from typing import NamedTuple, Optional, Tuple
+
 from rasters import Raster, RasterGrid
 import numpy as np
 from rasterio.windows import Window
 
 from .constants import GLT_NODATA_VALUE
+from .OrthoPlan import OrthoPlan
+
+class GLTBounds(NamedTuple):
+    """
+    Zero-based swath index bounds of the valid GLT pixels, with the valid mask and count they were computed from.
+    """
+    min_row: int
+    max_row: int
+    min_col: int
+    max_col: int
+    valid_count: int
+    valid_mask: np.ndarray
+
+    def shift(self, row_off: int, col_off: int) -> "GLTBounds":
+        """
+        Return the bounds after subtracting a row and column offset from the valid indices.
+        Bounds without valid pixels have no indices to shift and are returned unchanged.
+        """
+        if self.valid_count == 0:
+            return self
+
+        return GLTBounds(
+            min_row=self.min_row - row_off,
+            max_row=self.max_row - row_off,
+            min_col=self.min_col - col_off,
+            max_col=self.max_col - col_off,
+            valid_count=self.valid_count,
+            valid_mask=self.valid_mask
+        )
 
 class GeometryLookupTable(np.ndarray):
     """
@@ -18,13 +49,15 @@ class GeometryLookupTable(np.ndarray):
             cls, 
             GLT_array: np.ndarray, 
             GLT_nodata_value: int = GLT_NODATA_VALUE,
-            geometry: RasterGrid = None):
+            geometry: RasterGrid = None,
+            bounds: Optional[GLTBounds] = None):
         # Cast input array to GLT subclass
         """
         Create a GeometryLookupTable from a GLT array and geolocation metadata.
         Parameters:
             GLT_array (np.ndarray): A (rows, cols, 2) ndarray of 1-based indices.
             geometry (RasterGrid): Georeferencing metadata describing the grid.
+            bounds (GLTBounds, optional): Precomputed bounds of GLT_array, computed on first use if None.
         Returns:
             GeometryLookupTable: GLT array with attached geometry.
         """
@@ -33,6 +66,8 @@ class GeometryLookupTable(np.ndarray):
         obj = np.asarray(GLT_array).view(cls)
         obj.geometry = geometry
         obj.GLT_nodata_value = GLT_nodata_value
+        obj._bounds = bounds
+        obj._ortho_plans = {}
         return obj
 
     def __array_finalize__(self, obj):
@@ -43,6 +78,9 @@ class GeometryLookupTable(np.ndarray):
             self.GLT_nodata_value = obj.GLT_nodata_value
         else:
             self.GLT_nodata_value = GLT_NODATA_VALUE
+        # views, slices and copies describe different pixels, so they never inherit cached bounds or plans
+        self._bounds = None
+        self._ortho_plans = {}
 
     def __repr__(self):
         return f"GeometryLookupTable(shape={self.shape}, min_row={self.min_row}, max_row={self.max_row}, min_col={self.min_col}, max_col={self.max_col})"
@@ -56,27 +94,75 @@ class GeometryLookupTable(np.ndarray):
         Returns the zero-based row indices (glt_y) as a Raster object with geometry.
         Each value is a row index into the swath/geolocated array.
         """
-        return Raster(self[..., 0] - 1, geometry=self.geometry)
+        # cast before subtracting so that nodata in a compact unsigned GLT becomes -1 instead of wrapping
+        return Raster(self[..., 0].view(np.ndarray).astype(np.int32) - 1, geometry=self.geometry)
+
+    @property
+    def bounds(self) -> GLTBounds:
+        """
+        Returns the bounds, valid mask and valid-pixel count of the GLT, computed in a single pass and cached.
+        The cache assumes that the GLT is not modified in place.
+        """
+        if self._bounds is None:
+            GLT_array = self.view(np.ndarray)
+            valid_mask = (GLT_array[..., 0] != self.GLT_nodata_value) & (GLT_array[..., 1] != self.GLT_nodata_value)
+            valid_count = int(np.count_nonzero(valid_mask))
+
+            if valid_count == 0:
+                min_row = max_row = min_col = max_col = None
+            else:
+                # gather the valid (row, col) pairs once and reduce both axes together
+                valid_pairs = GLT_array[valid_mask]
+                min_row, min_col = (int(value) - 1 for value in valid_pairs.min(axis=0))
+                max_row, max_col = (int(value) - 1 for value in valid_pairs.max(axis=0))
+
+            self._bounds = GLTBounds(
+                min_row=min_row,
+                max_row=max_row,
+                min_col=min_col,
+                max_col=max_col,
+                valid_count=valid_count,
+                valid_mask=valid_mask
+            )
+
+        return self._bounds
+
+    @property
+    def valid_mask(self) -> np.ndarray:
+        """
+        Returns the boolean mask of GLT pixels that map to a swath pixel.
+        """
+        return self.bounds.valid_mask
+
+    @property
+    def valid_count(self) -> int:
+        """
+        Returns the number of GLT pixels that map to a swath pixel.
+        """
+        return self.bounds.valid_count
+
+    def _valid_bounds(self, field: str) -> int:
+        bounds = self.bounds
+
+        if bounds.valid_count == 0:
+            axis = "row" if field.endswith("row") else "column"
+            raise ValueError(f"No valid {axis} indices found in GLT (all are nodata value {self.GLT_nodata_value})")
+
+        return getattr(bounds, field)
 
     @property
     def min_row(self) -> int:
         """
         Returns the minimum row index (glt_y) for the GLT, ignoring nodata values.
         """
-        valid = self[..., 0][self[..., 0] != self.GLT_nodata_value]
-        if valid.size == 0:
-            raise ValueError(f"No valid row indices found in GLT (all are nodata value {self.GLT_nodata_value})")
-        return int(np.nanmin(valid)) - 1
+        return self._valid_bounds("min_row")
 
     @property
     def max_row(self) -> int:
         """
         Returns the maximum row index (glt_y) for the GLT, ignoring nodata values.
         """
-        valid = self[..., 0][self[..., 0] != self.GLT_nodata_value]
-        if valid.size == 0:
-            raise ValueError(f"No valid row indices found in GLT (all are nodata value {self.GLT_nodata_value})")
-        return int(np.nanmax(valid)) - 1
+        return self._valid_bounds("max_row")
 
     @property
     def cols(self) -> Raster:
@@ -84,27 +170,89 @@ class GeometryLookupTable(np.ndarray):
         Returns the zero-based column indices (glt_x) as a Raster object with geometry.
         Each value is a column index into the swath/geolocated array.
         """
-        return Raster(self[..., 1] - 1, geometry=self.geometry)
+        return Raster(self[..., 1].view(np.ndarray).astype(np.int32) - 1, geometry=self.geometry)
 
     @property
     def min_col(self) -> int:
         """
         Returns the minimum column index (glt_x) for the GLT, ignoring nodata values.
         """
-        valid = self[..., 1][self[..., 1] != self.GLT_nodata_value]
-        if valid.size == 0:
-            raise ValueError(f"No valid column indices found in GLT (all are nodata value {self.GLT_nodata_value})")
-        return int(np.nanmin(valid)) - 1
+        return self._valid_bounds("min_col")
 
     @property
     def max_col(self) -> int:
         """
         Returns the maximum column index (glt_x) for the GLT, ignoring nodata values.
         """
-        valid = self[..., 1][self[..., 1] != self.GLT_nodata_value]
-        if valid.size == 0:
-            raise ValueError(f"No valid column indices found in GLT (all are nodata value {self.GLT_nodata_value})")
-        return int(np.nanmax(valid)) - 1
+        return self._valid_bounds("max_col")
+
+    def ortho_plan(self, swath_shape: Tuple[int, int]) -> OrthoPlan:
+        """
+        Returns the gather plan that orthorectifies swath arrays of the given shape onto this GLT, cached per swath shape.
+
+        Parameters:
+            swath_shape (Tuple[int, int]): (rows, cols) of the swath arrays the GLT indexes into.
+
+        Returns:
+            OrthoPlan: Precomputed destination and source indices.
+        """
+        swath_shape = tuple(int(size) for size in swath_shape)
+
+        if swath_shape not in self._ortho_plans:
+            self._ortho_plans[swath_shape] = OrthoPlan.from_GLT(
+                self,
+                swath_shape=swath_shape,
+                GLT_nodata_value=self.GLT_nodata_value
+            )
+
+        return self._ortho_plans[swath_shape]
+
+    def linear_index(self, swath_cols: int) -> np.ndarray:
+        """
+        Returns the GLT as a single int32 array of zero-based linear swath indices (row * swath_cols + col), with -1 as nodata.
+
+        Parameters:
+            swath_cols (int): Number of columns in the swath the GLT indexes into.
+
+        Returns:
+            np.ndarray: (rows, cols) int32 array of linear swath indices.
+        """
+        GLT_array = self.view(np.ndarray)
+        linear_index = np.full(self.shape[:2], -1, dtype=np.int32)
+        mask = self.valid_mask
+        linear_index[mask] = (GLT_array[..., 0][mask].astype(np.int32) - 1) * int(swath_cols) + (GLT_array[..., 1][mask].astype(np.int32) - 1)
+
+        return linear_index
+
+    @classmethod
+    def from_linear_index(
+            cls,
+            linear_index: np.ndarray,
+            swath_cols: int,
+            geometry: RasterGrid,
+            dtype: np.dtype = np.int32,
+            GLT_nodata_value: int = GLT_NODATA_VALUE) -> "GeometryLookupTable":
+        """
+        Creates a GeometryLookupTable from zero-based linear swath indices, with negative values as nodata.
+
+        Parameters:
+            linear_index (np.ndarray): (rows, cols) array of linear swath indices.
+            swath_cols (int): Number of columns in the swath the indices refer to.
+            geometry (RasterGrid): Georeferencing metadata describing the grid.
+            dtype (np.dtype, optional): Integer dtype of the (row, col) pairs.
+            GLT_nodata_value (int, optional): Value for GLT pixels without a swath pixel.
+
+        Returns:
+            GeometryLookupTable: GLT of 1-based (row, col) pairs.
+        """
+        linear_index = np.asarray(linear_index)
+        mask = linear_index >= 0
+        GLT_array = np.full(linear_index.shape + (2,), GLT_nodata_value, dtype=dtype)
+        rows, cols = np.divmod(linear_index[mask], int(swath_cols))
+        GLT_array[..., 0][mask] = rows + 1
+        GLT_array[..., 1][mask] = cols + 1
+
+        return cls(GLT_array=GLT_array, geometry=geometry, GLT_nodata_value=GLT_nodata_value)
 
     @property
     def swath_window(self) -> Window:
@@ -132,24 +280,39 @@ class GeometryLookupTable(np.ndarray):
         if window is None:
             return self
 
-        adjusted_array = self.copy()
-        mask = (adjusted_array[..., 0] != self.GLT_nodata_value) & (adjusted_array[..., 1] != self.GLT_nodata_value)
-        adjusted_array[..., 0][mask] -= int(window.row_off)
-        adjusted_array[..., 1][mask] -= int(window.col_off)
+        row_off = int(window.row_off)
+        col_off = int(window.col_off)
+        bounds = self.bounds
+        mask = bounds.valid_mask
+
+        # the valid pixels are unchanged, so the bounds shift by the window offset without another scan
+        adjusted_bounds = bounds.shift(row_off, col_off)
 
         # Calculate bounds for the swath window
         swath_height = int(window.height)
         swath_width = int(window.width)
-        max_row = int(np.nanmax(adjusted_array[..., 0][mask])) - 1 if np.any(mask) else -1
-        max_col = int(np.nanmax(adjusted_array[..., 1][mask])) - 1 if np.any(mask) else -1
+        max_row = adjusted_bounds.max_row if bounds.valid_count > 0 else -1
+        max_col = adjusted_bounds.max_col if bounds.valid_count > 0 else -1
+        min_row = adjusted_bounds.min_row if bounds.valid_count > 0 else 0
+        min_col = adjusted_bounds.min_col if bounds.valid_count > 0 else 0
 
-        if max_row >= swath_height or max_col >= swath_width:
+        # the range is checked before subtracting, so indices below the window offset
+        # raise instead of wrapping around in an unsigned GLT
+        if min_row < 0 or min_col < 0 or max_row >= swath_height or max_col >= swath_width:
             raise ValueError(
                 f"Adjusted GLT indices are out of bounds for the swath window: "
-                f"max_row={max_row}, max_col={max_col}, "
+                f"min_row={min_row}, min_col={min_col}, max_row={max_row}, max_col={max_col}, "
                 f"swath_height={swath_height}, swath_width={swath_width}, "
                 f"window(row_off={window.row_off}, col_off={window.col_off}, height={window.height}, width={window.width})"
             )
 
-        return GeometryLookupTable(GLT_array=adjusted_array, geometry=self.geometry, GLT_nodata_value=self.GLT_nodata_value)
-    
\ No newline at end of file
+        adjusted_array = self.view(np.ndarray).copy()
+        adjusted_array[..., 0][mask] -= row_off
+        adjusted_array[..., 1][mask] -= col_off
+
+        return GeometryLookupTable(
+            GLT_array=adjusted_array,
+            geometry=self.geometry,
+            GLT_nodata_value=self.GLT_nodata_value,
+            bounds=adjusted_bounds
+        )
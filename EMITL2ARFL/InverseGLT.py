@@ -0,0 +1,271 @@
+import threading
+from os.path import abspath, expanduser
+from typing import Dict, List, Tuple
+
+import numpy as np
+from rasterio.windows import Window
+
+from .constants import *
+from .extract_GLT_array import extract_GLT_array
+from .metadata_sidecar import read_netcdf_metadata
+
+_INVERSE_GLT_CACHE: Dict[str, Tuple[Tuple[int, int], "InverseGLT"]] = {}
+_INVERSE_GLT_CACHE_LOCK = threading.Lock()
+
+def _clip_window(window: Window, shape: Tuple[int, int]) -> Tuple[int, int, int, int]:
+    # (row_start, row_stop, col_start, col_stop) of a window clipped to an array shape
+    row_start = max(0, int(window.row_off))
+    col_start = max(0, int(window.col_off))
+    row_stop = min(shape[0], int(window.row_off) + int(window.height))
+    col_stop = min(shape[1], int(window.col_off) + int(window.width))
+
+    return row_start, row_stop, col_start, col_stop
+
+def _window_from_bounds(min_row: int, max_row: int, min_col: int, max_col: int) -> Window:
+    return Window(col_off=int(min_col), row_off=int(min_row), width=int(max_col - min_col + 1), height=int(max_row - min_row + 1))
+
+class InverseGLT:
+    """
+    Inverse of a Geometry Lookup Table (GLT), mapping each swath pixel to the grid cells that sample it.
+
+    The grid cells are stored in compressed sparse row form, sorted by swath pixel, so the cells of any
+    run of swath pixels are one contiguous slice. The forward direction keeps the zero-based linear swath
+    index of each grid cell together with the swath bounds of each block of grid cells, so a grid window
+    only scans the partial blocks along its edges instead of every cell it covers.
+    """
+    def __init__(
+            self,
+            linear_index: np.ndarray,
+            grid_index: np.ndarray,
+            offsets: np.ndarray,
+            block_bounds: np.ndarray,
+            swath_shape: Tuple[int, int],
+            block_size: int) -> None:
+        """
+        Create an inverse GLT from precomputed indices.
+
+        Parameters:
+            linear_index (np.ndarray): (grid rows, grid cols) int32 linear swath index of each grid cell, -1 as nodata.
+            grid_index (np.ndarray): Linear grid indices of the mapped grid cells, sorted by swath pixel.
+            offsets (np.ndarray): (swath pixels + 1,) offsets of the cells of each swath pixel into grid_index.
+            block_bounds (np.ndarray): (4, block rows, block cols) min row, max row, min col and max col
+                of the swath pixels of each block of grid cells.
+            swath_shape (Tuple[int, int]): Shape of the swath the GLT indexes into.
+            block_size (int): Height and width of the blocks of grid cells.
+        """
+        self.linear_index = linear_index
+        self.grid_index = grid_index
+        self.offsets = offsets
+        self.block_bounds = block_bounds
+        self.swath_shape = tuple(int(size) for size in swath_shape)
+        self.block_size = int(block_size)
+
+    def __repr__(self) -> str:
+        return f"InverseGLT(grid_shape={self.grid_shape}, swath_shape={self.swath_shape}, mapped_cells={self.grid_index.size})"
+
+    @property
+    def grid_shape(self) -> Tuple[int, int]:
+        """
+        Returns the shape of the grid of the GLT.
+        """
+        return self.linear_index.shape
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Returns the memory held by the index in bytes.
+        """
+        return self.linear_index.nbytes + self.grid_index.nbytes + self.offsets.nbytes + self.block_bounds.nbytes
+
+    @classmethod
+    def from_GLT(
+            cls,
+            GLT: np.ndarray,
+            swath_shape: Tuple[int, int],
+            GLT_nodata_value: int = GLT_NODATA_VALUE,
+            block_size: int = INVERSE_GLT_BLOCK_SIZE) -> "InverseGLT":
+        """
+        Build the inverse of a GLT of 1-based (row, col) swath indices.
+
+        Parameters:
+            GLT (np.ndarray): (rows, cols, 2) GLT, either a GeometryLookupTable or a plain array.
+            swath_shape (Tuple[int, int]): Shape of the swath the GLT indexes into.
+            GLT_nodata_value (int, optional): Value in GLT indicating invalid mapping. Defaults to GLT_NODATA_VALUE.
+            block_size (int, optional): Height and width of the blocks of grid cells. Defaults to INVERSE_GLT_BLOCK_SIZE.
+
+        Returns:
+            InverseGLT: The inverse lookup.
+        """
+        GLT_array = np.asarray(GLT)
+
+        if GLT_array.ndim != 3 or GLT_array.shape[-1] != 2:
+            raise ValueError("GLT must be 3D with the last dimension of size 2.")
+
+        swath_rows, swath_cols = (int(size) for size in swath_shape)
+        grid_rows, grid_cols = GLT_array.shape[:2]
+
+        valid = (GLT_array[..., 0] != GLT_nodata_value) & (GLT_array[..., 1] != GLT_nodata_value)
+        swath_row = np.where(valid, GLT_array[..., 0].astype(np.int32) - 1, -1)
+        swath_col = np.where(valid, GLT_array[..., 1].astype(np.int32) - 1, -1)
+        linear_index = np.where(valid, swath_row * swath_cols + swath_col, -1).astype(np.int32)
+
+        # group the mapped grid cells by swath pixel
+        destination_index = np.flatnonzero(valid)
+        source_index = linear_index.ravel()[destination_index]
+        grid_index = destination_index[np.argsort(source_index, kind="stable")].astype(np.int32)
+        offsets = np.zeros(swath_rows * swath_cols + 1, dtype=np.int64)
+        np.cumsum(np.bincount(source_index, minlength=swath_rows * swath_cols), out=offsets[1:])
+
+        # swath bounds of each block of grid cells, with empty blocks holding bounds that never win a comparison
+        block_rows = -(-grid_rows // block_size)
+        block_cols = -(-grid_cols // block_size)
+        padded_shape = (block_rows * block_size, block_cols * block_size)
+        empty = np.iinfo(np.int32).max
+        block_bounds = np.empty((4, block_rows, block_cols), dtype=np.int32)
+
+        for position, (values, reduce, padding) in enumerate((
+                (swath_row, np.min, empty),
+                (swath_row, np.max, -1),
+                (swath_col, np.min, empty),
+                (swath_col, np.max, -1))):
+            padded = np.full(padded_shape, padding, dtype=np.int32)
+            padded[:grid_rows, :grid_cols] = np.where(valid, values, padding)
+            block_bounds[position] = reduce(padded.reshape(block_rows, block_size, block_cols, block_size), axis=(1, 3))
+
+        return cls(
+            linear_index=linear_index,
+            grid_index=grid_index,
+            offsets=offsets,
+            block_bounds=block_bounds,
+            swath_shape=(swath_rows, swath_cols),
+            block_size=block_size
+        )
+
+    def grid_cells(self, row: int, col: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the grid cells that sample a swath pixel.
+
+        Parameters:
+            row (int): Zero-based swath row.
+            col (int): Zero-based swath column.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Zero-based grid rows and columns of the cells, empty if the pixel is not on the grid.
+        """
+        pixel = int(row) * self.swath_shape[1] + int(col)
+        cells = self.grid_index[self.offsets[pixel]:self.offsets[pixel + 1]]
+
+        return np.divmod(cells, self.grid_shape[1])
+
+    def grid_to_swath_window(self, grid_window: Window) -> Window:
+        """
+        Returns the swath window covering every swath pixel sampled by a window of the grid.
+
+        Parameters:
+            grid_window (Window): Window of the grid, clipped to the grid.
+
+        Returns:
+            Window: Smallest swath window holding the swath pixels of the grid window.
+
+        Raises:
+            ValueError: If no grid cell of the window maps to a swath pixel.
+        """
+        row_start, row_stop, col_start, col_stop = _clip_window(grid_window, self.grid_shape)
+        size = self.block_size
+        # blocks entirely inside the window
+        block_row_start, block_row_stop = -(-row_start // size), row_stop // size
+        block_col_start, block_col_stop = -(-col_start // size), col_stop // size
+        row_bounds: List[int] = []
+        col_bounds: List[int] = []
+
+        if block_row_start < block_row_stop and block_col_start < block_col_stop:
+            blocks = self.block_bounds[:, block_row_start:block_row_stop, block_col_start:block_col_stop]
+            # empty blocks hold (int32 max, -1) placeholders, so only blocks with a swath pixel contribute
+            non_empty = blocks[1] >= 0
+
+            if non_empty.any():
+                row_bounds += [int(blocks[0][non_empty].min()), int(blocks[1][non_empty].max())]
+                col_bounds += [int(blocks[2][non_empty].min()), int(blocks[3][non_empty].max())]
+
+            inner_rows = slice(block_row_start * size, block_row_stop * size)
+            # the frame of partial blocks around the full blocks
+            strips = [
+                self.linear_index[row_start:inner_rows.start, col_start:col_stop],
+                self.linear_index[inner_rows.stop:row_stop, col_start:col_stop],
+                self.linear_index[inner_rows, col_start:block_col_start * size],
+                self.linear_index[inner_rows, block_col_stop * size:col_stop]
+            ]
+        else:
+            strips = [self.linear_index[row_start:row_stop, col_start:col_stop]]
+
+        for strip in strips:
+            pixels = strip[strip >= 0]
+
+            if pixels.size > 0:
+                rows, cols = np.divmod(pixels, self.swath_shape[1])
+                row_bounds += [rows.min(), rows.max()]
+                col_bounds += [cols.min(), cols.max()]
+
+        if not row_bounds:
+            raise ValueError(f"no swath pixels map into grid window {grid_window}")
+
+        return _window_from_bounds(min(row_bounds), max(row_bounds), min(col_bounds), max(col_bounds))
+
+    def swath_to_grid_window(self, swath_window: Window) -> Window:
+        """
+        Returns the grid window covering every grid cell that samples a window of the swath.
+
+        Parameters:
+            swath_window (Window): Window of the swath, clipped to the swath.
+
+        Returns:
+            Window: Smallest grid window holding the grid cells of the swath window.
+
+        Raises:
+            ValueError: If no swath pixel of the window is sampled by the grid.
+        """
+        row_start, row_stop, col_start, col_stop = _clip_window(swath_window, self.swath_shape)
+        row_pixels = np.arange(row_start, row_stop) * self.swath_shape[1]
+        # each swath row of the window is one contiguous run of the sorted grid cells
+        starts = self.offsets[row_pixels + col_start]
+        stops = self.offsets[row_pixels + col_stop]
+        lengths = stops - starts
+        total = int(lengths.sum())
+
+        if total == 0:
+            raise ValueError(f"no grid cells sample swath window {swath_window}")
+
+        positions = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(total)
+        rows, cols = np.divmod(self.grid_index[positions], self.grid_shape[1])
+
+        return _window_from_bounds(rows.min(), rows.max(), cols.min(), cols.max())
+
+def read_inverse_GLT(filename: str) -> InverseGLT:
+    """
+    Return the inverse GLT of an EMIT NetCDF file, building it on first use and caching it for the process.
+
+    Parameters:
+        filename (str): EMIT NetCDF file with 'glt_x' and 'glt_y' in the 'location' group.
+
+    Returns:
+        InverseGLT: Cached inverse GLT, rebuilt if the file has changed.
+    """
+    filename = abspath(expanduser(filename))
+    metadata = read_netcdf_metadata(filename)
+    signature = (metadata["size"], metadata["mtime_ns"])
+
+    with _INVERSE_GLT_CACHE_LOCK:
+        cached = _INVERSE_GLT_CACHE.get(filename)
+
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    inverse_GLT = InverseGLT.from_GLT(
+        extract_GLT_array(filename),
+        swath_shape=(metadata["dimensions"]["downtrack"], metadata["dimensions"]["crosstrack"])
+    )
+
+    with _INVERSE_GLT_CACHE_LOCK:
+        _INVERSE_GLT_CACHE[filename] = (signature, inverse_GLT)
+
+    return inverse_GLT
@@ -0,0 +1,222 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .constants import *
+from .ortho_fill_value import ortho_fill_value
+
+class OrthoPlan:
+    """
+    Precomputed gather from a swath onto the grid of a Geometry Lookup Table (GLT).
+
+    The plan holds the flat indices of the grid pixels that have a swath pixel and the flat indices of
+    those swath pixels, so orthorectifying any number of 2-D or 3-D swath arrays of the same shape
+    costs one gather each instead of re-deriving the GLT masks and index arrays every time.
+    """
+    def __init__(
+            self,
+            destination_index: np.ndarray,
+            source_index: np.ndarray,
+            grid_shape: Tuple[int, int],
+            swath_shape: Tuple[int, int]) -> None:
+        """
+        Create a plan from flat indices.
+
+        Parameters:
+            destination_index (np.ndarray): Flat indices into the (rows, cols) grid of the mapped pixels.
+            source_index (np.ndarray): Flat indices into the (rows, cols) swath, aligned with destination_index.
+            grid_shape (Tuple[int, int]): Shape of the orthorectified grid.
+            swath_shape (Tuple[int, int]): Shape of the swath arrays the plan applies to.
+        """
+        self.destination_index = destination_index
+        self.source_index = source_index
+        self.grid_shape = tuple(int(size) for size in grid_shape)
+        self.swath_shape = tuple(int(size) for size in swath_shape)
+
+    def __repr__(self) -> str:
+        return f"OrthoPlan(grid_shape={self.grid_shape}, swath_shape={self.swath_shape}, mapped_pixels={self.size})"
+
+    @property
+    def size(self) -> int:
+        """
+        Returns the number of grid pixels mapped to a swath pixel.
+        """
+        return int(self.destination_index.size)
+
+    @classmethod
+    def from_GLT(
+            cls,
+            GLT: np.ndarray,
+            swath_shape: Tuple[int, int],
+            GLT_nodata_value: int = GLT_NODATA_VALUE) -> "OrthoPlan":
+        """
+        Build a plan from a GLT of 1-based (row, col) swath indices.
+
+        Parameters:
+            GLT (np.ndarray): (rows, cols, 2) GLT, either a GeometryLookupTable or a plain array.
+            swath_shape (Tuple[int, int]): Shape of the swath arrays the plan will be applied to.
+            GLT_nodata_value (int, optional): Value in GLT indicating invalid mapping. Defaults to GLT_NODATA_VALUE.
+
+        Returns:
+            OrthoPlan: The gather plan.
+
+        Raises:
+            IndexError: If a GLT index points outside `swath_shape`.
+        """
+        GLT_array = np.asarray(GLT)
+
+        if GLT_array.ndim != 3 or GLT_array.shape[-1] != 2:
+            raise ValueError("GLT must be 3D with the last dimension of size 2.")
+
+        swath_rows, swath_cols = (int(size) for size in swath_shape)
+        cached_bounds = getattr(GLT, "GLT_nodata_value", None) == GLT_nodata_value
+
+        if cached_bounds:
+            # reuse the valid mask and zero-based bounds cached on a GeometryLookupTable
+            bounds = GLT.bounds
+            valid_GLT = bounds.valid_mask
+        else:
+            valid_GLT = (GLT_array[..., 0] != GLT_nodata_value) & (GLT_array[..., 1] != GLT_nodata_value)
+
+        destination_index = np.flatnonzero(valid_GLT)
+        valid_pairs = GLT_array.reshape(-1, 2)[destination_index].astype(np.intp)
+
+        if cached_bounds:
+            min_row, max_row, min_col, max_col = bounds[:4] if bounds.valid_count > 0 else (0, -1, 0, -1)
+        elif valid_pairs.size > 0:
+            min_row, min_col = (int(index) - 1 for index in valid_pairs.min(axis=0))
+            max_row, max_col = (int(index) - 1 for index in valid_pairs.max(axis=0))
+        else:
+            min_row, max_row, min_col, max_col = 0, -1, 0, -1
+
+        # an index outside the swath would gather from the wrong row, or wrap around to the far end
+        # of the swath array for negative indices
+        if min_row < 0 or min_col < 0 or max_row >= swath_rows or max_col >= swath_cols:
+            raise IndexError(
+                f"GLT indices out of bounds for swath shape {(swath_rows, swath_cols)}: "
+                f"min_row={min_row}, max_row={max_row}, min_col={min_col}, max_col={max_col}"
+            )
+
+        source_index = (valid_pairs[:, 0] - 1) * swath_cols + (valid_pairs[:, 1] - 1)
+
+        return cls(
+            destination_index=destination_index,
+            source_index=source_index,
+            grid_shape=GLT_array.shape[:2],
+            swath_shape=swath_shape
+        )
+
+    def apply(
+            self,
+            swath_array: np.ndarray,
+            fill_value: Optional[Union[int, float]] = None,
+            dtype: Optional[np.dtype] = None,
+            workers: Optional[int] = 1) -> np.ndarray:
+        """
+        Orthorectify a swath array with a single gather.
+
+        With more than one worker the grid is split into row strips that are filled and gathered on a
+        thread pool. The destination indices are sorted, so each strip owns a contiguous run of the plan
+        and a contiguous block of the output, and the result is identical to the serial gather.
+
+        Parameters:
+            swath_array (np.ndarray): (rows, cols) or (rows, cols, bands) swath array of `swath_shape`.
+            fill_value (int or float, optional): Value for grid pixels without a swath pixel.
+                Defaults to `ortho_fill_value` of the output dtype, NaN for floating-point outputs.
+            dtype (np.dtype, optional): Output dtype. Defaults to the dtype of swath_array.
+            workers (int, optional): Number of gather threads, one per CPU if None. Defaults to 1.
+
+        Returns:
+            np.ndarray: (grid rows, grid cols) or (grid rows, grid cols, bands) orthorectified array.
+        """
+        swath_array = np.asarray(swath_array)
+
+        if swath_array.ndim not in (2, 3):
+            raise ValueError(f"swath array must be 2D or 3D, got {swath_array.ndim} dimensions")
+
+        ortho_array = self.apply_stacked([swath_array], fill_value=fill_value, dtype=dtype, workers=workers)
+
+        return ortho_array.reshape(self.grid_shape + swath_array.shape[2:])
+
+    def apply_stacked(
+            self,
+            swath_arrays: Sequence[np.ndarray],
+            fill_value: Optional[Union[int, float]] = None,
+            dtype: Optional[np.dtype] = None,
+            workers: Optional[int] = 1) -> np.ndarray:
+        """
+        Orthorectify several swath arrays into one (grid rows, grid cols, bands) array in a single pass over the plan.
+
+        The arrays are stacked along the band axis of the output in order, 2-D arrays taking one band each,
+        so the output is allocated and filled once and every row strip gathers all arrays together.
+
+        Parameters:
+            swath_arrays (Sequence[np.ndarray]): (rows, cols) or (rows, cols, bands) swath arrays of `swath_shape`.
+            fill_value (int or float, optional): Value for grid pixels without a swath pixel.
+                Defaults to `ortho_fill_value` of the output dtype, NaN for floating-point outputs.
+            dtype (np.dtype, optional): Output dtype. Defaults to the dtype of the first array.
+            workers (int, optional): Number of gather threads, one per CPU if None. Defaults to 1.
+
+        Returns:
+            np.ndarray: (grid rows, grid cols, total bands) orthorectified array.
+        """
+        flat_arrays = []
+        band_bounds = [0]
+
+        for swath_array in swath_arrays:
+            swath_array = np.asarray(swath_array)
+
+            if swath_array.ndim not in (2, 3):
+                raise ValueError(f"swath array must be 2D or 3D, got {swath_array.ndim} dimensions")
+
+            if swath_array.shape[:2] != self.swath_shape:
+                raise ValueError(f"swath array shape {swath_array.shape[:2]} does not match plan swath shape {self.swath_shape}")
+
+            flat_arrays.append(swath_array.reshape(self.swath_shape[0] * self.swath_shape[1], -1))
+            band_bounds.append(band_bounds[-1] + flat_arrays[-1].shape[1])
+
+        if not flat_arrays:
+            raise ValueError("no swath arrays to orthorectify")
+
+        if dtype is None:
+            dtype = flat_arrays[0].dtype
+
+        if fill_value is None:
+            # NaN only fits floating-point outputs, so other dtypes get a fill value they can hold
+            fill_value = ortho_fill_value(dtype)
+
+        if workers is None:
+            workers = os.cpu_count() or 1
+
+        grid_rows, grid_cols = self.grid_shape
+        ortho_array = np.empty((grid_rows * grid_cols, band_bounds[-1]), dtype=dtype)
+
+        def gather_strip(pixel_start: int, pixel_stop: int, plan_strip: slice) -> None:
+            ortho_array[pixel_start:pixel_stop] = fill_value
+            destination_index = self.destination_index[plan_strip]
+            source_index = self.source_index[plan_strip]
+
+            for band_start, band_stop, flat_swath in zip(band_bounds[:-1], band_bounds[1:], flat_arrays):
+                # numpy releases the GIL for the take and the scatter, so the strips gather concurrently
+                ortho_array[destination_index, band_start:band_stop] = np.take(flat_swath, source_index, axis=0)
+
+        if workers <= 1 or grid_rows < 2:
+            gather_strip(0, grid_rows * grid_cols, slice(None))
+
+            return ortho_array.reshape(self.grid_shape + (band_bounds[-1],))
+
+        # a few strips per worker to even out strips that map more swath pixels than others
+        row_bounds = np.linspace(0, grid_rows, min(grid_rows, workers * 4) + 1).astype(int)
+        pixel_bounds = row_bounds * grid_cols
+        plan_bounds = np.searchsorted(self.destination_index, pixel_bounds)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # list() propagates the first exception raised by a worker
+            list(executor.map(
+                lambda strip: gather_strip(pixel_bounds[strip], pixel_bounds[strip + 1], slice(plan_bounds[strip], plan_bounds[strip + 1])),
+                range(len(row_bounds) - 1)
+            ))
+
+        return ortho_array.reshape(self.grid_shape + (band_bounds[-1],))
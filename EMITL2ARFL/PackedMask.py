@@ -0,0 +1,74 @@
+from typing import Tuple
+
+import numpy as np
+from rasterio.windows import Window
+
+class PackedMask:
+    """
+    Boolean (rows, cols) mask stored as bits, one byte-aligned run of bits per row.
+
+    Packing each row separately keeps a window of rows a contiguous view of the packed bytes,
+    so a window is unpacked without touching the rest of the mask.
+    """
+    def __init__(self, bits: np.ndarray, shape: Tuple[int, int]) -> None:
+        """
+        Create a packed mask from bits packed along the rows.
+
+        Parameters:
+            bits (np.ndarray): (rows, ceil(cols / 8)) uint8 bits from `np.packbits(mask, axis=-1)`.
+            shape (Tuple[int, int]): Shape of the unpacked mask.
+        """
+        self.bits = bits
+        self.shape = tuple(int(size) for size in shape)
+
+    def __repr__(self) -> str:
+        return f"PackedMask(shape={self.shape}, nbytes={self.nbytes})"
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Returns the memory held by the packed bits in bytes.
+        """
+        return self.bits.nbytes
+
+    @classmethod
+    def from_array(cls, mask: np.ndarray) -> "PackedMask":
+        """
+        Pack a 2-D mask, treating every non-zero value as True.
+
+        Parameters:
+            mask (np.ndarray): (rows, cols) mask.
+
+        Returns:
+            PackedMask: The packed mask.
+        """
+        mask = np.asarray(mask)
+
+        if mask.ndim != 2:
+            raise ValueError(f"mask must be 2D, got {mask.ndim} dimensions")
+
+        return cls(bits=np.packbits(mask.astype(bool, copy=False), axis=-1), shape=mask.shape)
+
+    def unpack(self, window: Window = None) -> np.ndarray:
+        """
+        Unpack the mask or a window of it.
+
+        Parameters:
+            window (Window, optional): Window of the mask to unpack. Defaults to the whole mask.
+
+        Returns:
+            np.ndarray: (rows, cols) boolean view of the unpacked bits.
+        """
+        if window is None:
+            bits = self.bits
+            col_start, cols = 0, self.shape[1]
+        else:
+            row_start, col_start = int(window.row_off), int(window.col_off)
+            bits = self.bits[row_start:row_start + int(window.height)]
+            cols = int(window.width)
+
+        # only unpack the rows of the window and as many columns as it needs
+        unpacked = np.unpackbits(bits, axis=-1, count=col_start + cols)
+
+        # unpackbits yields 0 and 1 as uint8, which reinterpret as bool without a copy
+        return unpacked[:, col_start:].view(bool)
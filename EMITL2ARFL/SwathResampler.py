@@ -0,0 +1,356 @@
+import logging
+import os
+import threading
+from collections import OrderedDict
+from os.path import abspath, basename, dirname, exists, expanduser, join, splitext
+from typing import Optional, Tuple, Union
+
+import numpy as np
+from rasterio.windows import Window
+from rasters import KDTree, MultiRaster, Raster, RasterGeolocation, RasterGrid
+
+from .constants import *
+from .metadata_sidecar import read_netcdf_metadata
+from .read_geolocation import read_geolocation
+from .swath_footprint_index import geometry_swath_window
+from .target_grid_hash import target_grid_hash
+
+logger = logging.getLogger(__name__)
+
+_SWATH_RESAMPLER_CACHE: "OrderedDict[Tuple[str, Tuple[int, int], str, str, Optional[float]], SwathResampler]" = OrderedDict()
+_SWATH_RESAMPLER_CACHE_LOCK = threading.Lock()
+
+class SwathResampler:
+    """
+    Precomputed nearest-neighbour resampling from a window of the swath onto a target RasterGrid.
+
+    The neighbour search is run once, and its result is kept as the flat index of the swath pixel
+    nearest to each target cell. Resampling any variable of the granule onto the same grid is
+    then a single gather, with no geolocation read and no new neighbour search.
+    """
+    def __init__(
+            self,
+            source_index: np.ndarray,
+            geometry: RasterGrid,
+            swath_window: Optional[Window],
+            swath_shape: Tuple[int, int]) -> None:
+        """
+        Create a resampler from a precomputed source index.
+
+        Parameters:
+            source_index (np.ndarray): (grid rows, grid cols) flat index into the swath window of the
+                swath pixel nearest to each target cell, -1 for cells without a neighbour in range.
+            geometry (RasterGrid): Target grid.
+            swath_window (Window, optional): Window of the swath that the index refers to, the full swath if None.
+            swath_shape (Tuple[int, int]): (rows, cols) of the swath window.
+        """
+        self.source_index = source_index
+        self.geometry = geometry
+        self.swath_window = swath_window
+        self.swath_shape = tuple(int(size) for size in swath_shape)
+
+    def __repr__(self) -> str:
+        return f"SwathResampler(grid_shape={self.source_index.shape}, swath_window={self.swath_window}, swath_shape={self.swath_shape})"
+
+    @property
+    def valid_mask(self) -> np.ndarray:
+        """
+        Returns the boolean mask of target cells with a swath pixel in range.
+        """
+        return self.source_index >= 0
+
+    @classmethod
+    def from_geolocation(
+            cls,
+            geolocation: RasterGeolocation,
+            geometry: RasterGrid,
+            swath_window: Optional[Window] = None,
+            search_radius_meters: Optional[float] = None) -> "SwathResampler":
+        """
+        Build a resampler by running the nearest-neighbour search once.
+
+        Parameters:
+            geolocation (RasterGeolocation): Geolocation of the swath window.
+            geometry (RasterGrid): Target grid.
+            swath_window (Window, optional): Window of the swath that the geolocation covers.
+            search_radius_meters (float, optional): Neighbour search radius, as in `Raster.resample`.
+
+        Returns:
+            SwathResampler: The precomputed resampler.
+        """
+        kd_tree = KDTree(
+            source_geometry=geolocation,
+            target_geometry=geometry,
+            radius_of_influence=search_radius_meters
+        )
+
+        # resampling the flat index of every swath pixel yields the source of every target cell
+        swath_pixels = np.arange(geolocation.rows * geolocation.cols, dtype=np.int64).reshape(geolocation.shape)
+        source_index = np.asarray(kd_tree.resample(swath_pixels, fill_value=-1).array)
+        index_dtype = np.int32 if swath_pixels.size <= np.iinfo(np.int32).max else np.int64
+
+        return cls(
+            source_index=source_index.astype(index_dtype),
+            geometry=geometry,
+            swath_window=swath_window,
+            swath_shape=geolocation.shape
+        )
+
+    def save(self, filename: str, software_build_version: str = None, search_radius_meters: Optional[float] = None) -> None:
+        """
+        Write the resampler to a compressed `.npz` file, replacing any existing file atomically.
+
+        Parameters:
+            filename (str): Output filename.
+            software_build_version (str, optional): `software_build_version` of the granule the resampler was built from.
+            search_radius_meters (float, optional): Neighbour search radius the resampler was built with.
+        """
+        if self.swath_window is None:
+            swath_window = np.array([], dtype=np.int64)
+        else:
+            swath_window = np.array([
+                self.swath_window.col_off,
+                self.swath_window.row_off,
+                self.swath_window.width,
+                self.swath_window.height
+            ], dtype=np.int64)
+
+        temporary_filename = f"{filename}.{os.getpid()}.tmp.npz"
+
+        np.savez_compressed(
+            temporary_filename,
+            version=SWATH_RESAMPLER_VERSION,
+            source_index=self.source_index,
+            swath_window=swath_window,
+            swath_shape=np.array(self.swath_shape, dtype=np.int64),
+            grid_hash=target_grid_hash(self.geometry),
+            software_build_version="" if software_build_version is None else str(software_build_version),
+            search_radius_meters=np.nan if search_radius_meters is None else float(search_radius_meters)
+        )
+
+        # rename so that concurrent readers never see a partial file
+        os.replace(temporary_filename, filename)
+
+    @classmethod
+    def load(
+            cls,
+            filename: str,
+            geometry: RasterGrid,
+            software_build_version: str = None,
+            search_radius_meters: Optional[float] = None,
+            swath_dimensions: Optional[Tuple[int, int]] = None) -> Optional["SwathResampler"]:
+        """
+        Read a resampler written by `save` if it matches the target grid, granule build, search radius and swath.
+
+        Parameters:
+            filename (str): Input filename.
+            geometry (RasterGrid): Target grid the resampler must have been built for.
+            software_build_version (str, optional): Current `software_build_version` of the granule.
+            search_radius_meters (float, optional): Neighbour search radius the resampler must have been built with.
+            swath_dimensions (Tuple[int, int], optional): (downtrack, crosstrack) size of the granule swath
+                that the stored swath window and shape must fit. Not checked if None.
+
+        Returns:
+            SwathResampler: The resampler, or None if the file is missing, unreadable or stale.
+        """
+        if not exists(filename):
+            return None
+
+        try:
+            with np.load(filename) as file:
+                stored = {key: file[key] for key in file.files}
+        except (OSError, ValueError) as e:
+            logger.warning(f"unable to read swath resampler {filename}: {e}")
+            return None
+
+        stored_radius = float(stored["search_radius_meters"])
+        expected_radius = np.nan if search_radius_meters is None else float(search_radius_meters)
+
+        if (int(stored["version"]) != SWATH_RESAMPLER_VERSION
+                or str(stored["grid_hash"]) != target_grid_hash(geometry)
+                or str(stored["software_build_version"]) != ("" if software_build_version is None else str(software_build_version))
+                or not (stored_radius == expected_radius or (np.isnan(stored_radius) and np.isnan(expected_radius)))):
+            return None
+
+        swath_window = stored["swath_window"]
+        swath_window = Window(*(int(value) for value in swath_window)) if swath_window.size == 4 else None
+        swath_shape = tuple(int(size) for size in stored["swath_shape"])
+        source_index = stored["source_index"]
+
+        if swath_dimensions is not None:
+            rows, cols = (int(size) for size in swath_dimensions)
+
+            if swath_window is None:
+                fits = swath_shape == (rows, cols)
+            else:
+                fits = (
+                    swath_shape == (int(swath_window.height), int(swath_window.width))
+                    and swath_window.row_off >= 0 and swath_window.row_off + swath_window.height <= rows
+                    and swath_window.col_off >= 0 and swath_window.col_off + swath_window.width <= cols
+                )
+
+            # a plan for another swath would only fail later, inside `apply`, so it is rebuilt instead
+            if not fits or (source_index.size > 0 and source_index.max() >= swath_shape[0] * swath_shape[1]):
+                logger.warning(f"swath resampler {filename} does not fit the {rows} x {cols} swath of the granule")
+                return None
+
+        return cls(
+            source_index=source_index,
+            geometry=geometry,
+            swath_window=swath_window,
+            swath_shape=swath_shape
+        )
+
+    def apply(self, array: np.ndarray, fill_value: Union[int, float] = np.nan) -> np.ndarray:
+        """
+        Resample a swath array onto the target grid with a single gather.
+
+        Parameters:
+            array (np.ndarray): (rows, cols) or (bands, rows, cols) array over the swath window.
+            fill_value (int or float, optional): Value of target cells without a swath pixel. Defaults to NaN.
+
+        Returns:
+            np.ndarray: (grid rows, grid cols) or (bands, grid rows, grid cols) resampled array.
+        """
+        array = np.asarray(array)
+
+        if array.shape[-2:] != self.swath_shape:
+            raise ValueError(f"array shape {array.shape[-2:]} does not match resampler swath shape {self.swath_shape}")
+
+        valid_mask = self.valid_mask
+        flat_array = array.reshape(array.shape[:-2] + (-1,))
+        # promote only when the fill value does not fit, such as NaN for an integer array
+        resampled = np.full(array.shape[:-2] + self.source_index.shape, fill_value, dtype=np.result_type(array, fill_value))
+        resampled[..., valid_mask] = np.take(flat_array, self.source_index[valid_mask], axis=-1)
+
+        return resampled
+
+    def resample(self, raster: Union[Raster, np.ndarray], nodata: Union[int, float] = None) -> Raster:
+        """
+        Resample a swath Raster or array onto the target grid.
+
+        Parameters:
+            raster (Raster or np.ndarray): Raster or array over the swath window.
+            nodata (int or float, optional): Value of target cells without a swath pixel.
+                Defaults to the nodata value of the raster, or NaN for arrays.
+
+        Returns:
+            Raster: Raster, or MultiRaster for 3-D input, on the target grid.
+        """
+        if nodata is None:
+            nodata = getattr(raster, "nodata", None)
+
+        if nodata is None:
+            nodata = np.nan
+
+        array = raster.array if isinstance(raster, Raster) else raster
+        resampled = self.apply(array, fill_value=nodata)
+
+        if resampled.ndim == 3:
+            return MultiRaster(resampled, geometry=self.geometry, nodata=nodata)
+
+        return Raster(resampled, geometry=self.geometry, nodata=nodata)
+
+def swath_resampler_filename(filename: str, geometry: RasterGrid, resampling: str = "nearest") -> str:
+    """
+    Return the path of the persisted resampler of an EMIT NetCDF file onto a target grid.
+
+    Resamplers are written next to the granule in the download directory, named after the granule ID,
+    the hash of the target grid and the resampling method.
+
+    Parameters:
+        filename (str): EMIT NetCDF file the resampler is built from.
+        geometry (RasterGrid): Target grid.
+        resampling (str, optional): Resampling method. Defaults to "nearest".
+
+    Returns:
+        str: Path of the `.npz` file.
+    """
+    filename = abspath(expanduser(filename))
+    granule_ID = splitext(basename(filename))[0]
+
+    return join(dirname(filename), f"{granule_ID}.{target_grid_hash(geometry)}.{resampling}{SWATH_RESAMPLER_SUFFIX}")
+
+def read_swath_resampler(
+        filename: str,
+        geometry: RasterGrid,
+        search_radius_meters: Optional[float] = None,
+        resampling: str = "nearest",
+        persist: bool = True) -> SwathResampler:
+    """
+    Return the resampler from the swath of an EMIT NetCDF file onto a target grid, cached per (granule ID, file signature, target grid).
+
+    The reflectance, mask and uncertainty files of a granule share one geolocation, so the resampler
+    built from the reflectance file applies to the variables of all three. Resamplers are served from
+    memory, then from the `.npz` file next to the granule, and are only rebuilt from the geolocation when
+    neither exists or the file was written for a different `software_build_version` or swath of the granule.
+
+    Parameters:
+        filename (str): EMIT NetCDF file with `lat` and `lon` in the `location` group.
+        geometry (RasterGrid): Target grid.
+        search_radius_meters (float, optional): Neighbour search radius, as in `Raster.resample`.
+        resampling (str, optional): Resampling method, only "nearest" is supported. Defaults to "nearest".
+        persist (bool, optional): Read and write the resampler next to the granule. Defaults to True.
+
+    Returns:
+        SwathResampler: Cached resampler, covering the swath window of the grid.
+    """
+    if resampling != "nearest":
+        raise ValueError(f"unsupported swath resampling method: {resampling}")
+
+    filename = abspath(expanduser(filename))
+    granule_ID = splitext(basename(filename))[0]
+    # the metadata sidecar carries the file signature, so a granule re-downloaded to the same name gets a new key
+    metadata = read_netcdf_metadata(filename)
+    signature = (metadata["size"], metadata["mtime_ns"])
+    key = (granule_ID, signature, target_grid_hash(geometry), resampling, search_radius_meters)
+
+    with _SWATH_RESAMPLER_CACHE_LOCK:
+        resampler = _SWATH_RESAMPLER_CACHE.get(key)
+
+        if resampler is not None:
+            _SWATH_RESAMPLER_CACHE.move_to_end(key)
+            return resampler
+
+    resampler = None
+
+    if persist:
+        # the build version comes from the metadata sidecar, so a persisted resampler is used without opening the granule
+        software_build_version = metadata["attributes"].get("software_build_version")
+        resampler_filename = swath_resampler_filename(filename, geometry, resampling)
+        resampler = SwathResampler.load(
+            resampler_filename,
+            geometry=geometry,
+            software_build_version=software_build_version,
+            search_radius_meters=search_radius_meters,
+            swath_dimensions=(metadata["dimensions"]["downtrack"], metadata["dimensions"]["crosstrack"])
+        )
+
+    if resampler is None:
+        swath_window = geometry_swath_window(filename, geometry)
+
+        resampler = SwathResampler.from_geolocation(
+            geolocation=read_geolocation(filename, window=swath_window),
+            geometry=geometry,
+            swath_window=swath_window,
+            search_radius_meters=search_radius_meters
+        )
+
+        if persist:
+            try:
+                resampler.save(
+                    resampler_filename,
+                    software_build_version=software_build_version,
+                    search_radius_meters=search_radius_meters
+                )
+            except OSError as e:
+                logger.warning(f"unable to write swath resampler {resampler_filename}: {e}")
+
+    with _SWATH_RESAMPLER_CACHE_LOCK:
+        _SWATH_RESAMPLER_CACHE[key] = resampler
+
+        # evict the least recently used resamplers, which hold one index per target cell
+        while len(_SWATH_RESAMPLER_CACHE) > MAX_CACHED_SWATH_RESAMPLERS:
+            _SWATH_RESAMPLER_CACHE.popitem(last=False)
+
+    return resampler
@@ -0,0 +1,248 @@
+from typing import Optional, Tuple, Union
+
+import numpy as np
+from rasters import CRS, WGS84, RasterGeolocation, RasterGeometry
+
+from .constants import *
+
+def _tie_point_indices(size: int, step: int) -> np.ndarray:
+    # every step-th pixel, always including the last so that interpolation never extrapolates
+    indices = np.arange(0, size, step)
+
+    if indices[-1] != size - 1:
+        indices = np.append(indices, size - 1)
+
+    return indices
+
+def _interpolation_weights(tie_indices: np.ndarray, pixel_indices: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # lower tie point, upper tie point and weight of the upper tie point for each pixel
+    if len(tie_indices) == 1:
+        zeros = np.zeros(len(pixel_indices), dtype=int)
+        return zeros, zeros, np.zeros(len(pixel_indices))
+
+    upper = np.clip(np.searchsorted(tie_indices, pixel_indices, side="right"), 1, len(tie_indices) - 1)
+    lower = upper - 1
+    weight = (pixel_indices - tie_indices[lower]) / (tie_indices[upper] - tie_indices[lower])
+
+    return lower, upper, weight
+
+class TiePointGeolocation(RasterGeolocation):
+    """
+    Compact swath geolocation that stores the coordinates at a grid of tie points and interpolates the
+    full-resolution coordinate arrays bilinearly on demand.
+
+    With a tie point every 16 pixels the geolocation takes roughly 1/256 of the memory of the full
+    float64 arrays. `max_error` records the largest deviation from the full arrays measured when the
+    tie points were extracted, in units of the CRS.
+    """
+    def __init__(
+            self,
+            tie_x: np.ndarray,
+            tie_y: np.ndarray,
+            tie_rows: np.ndarray,
+            tie_cols: np.ndarray,
+            shape: Tuple[int, int],
+            crs: Union[CRS, str] = WGS84,
+            wrap_longitude: bool = False,
+            max_error: Optional[float] = None,
+            **kwargs):
+        """
+        Initialize a tie-point geolocation.
+
+        Args:
+            tie_x (np.ndarray): x coordinates at the tie points, shape (len(tie_rows), len(tie_cols)).
+            tie_y (np.ndarray): y coordinates at the tie points, shape (len(tie_rows), len(tie_cols)).
+            tie_rows (np.ndarray): Increasing pixel rows of the tie points, starting at 0 and ending at the last row.
+            tie_cols (np.ndarray): Increasing pixel columns of the tie points, starting at 0 and ending at the last column.
+            shape (Tuple[int, int]): Full-resolution (rows, cols) of the geolocation.
+            crs (optional): CRS of the coordinates. Defaults to WGS84.
+            wrap_longitude (bool, optional): The tie x coordinates are stored in [0, 360) to interpolate across the antimeridian.
+            max_error (float, optional): Maximum interpolation error measured against the full arrays.
+        """
+        # the full coordinate arrays are never stored, so the RasterGeolocation constructor is skipped
+        RasterGeometry.__init__(self, crs=crs, **kwargs)
+
+        self.tie_x = np.asarray(tie_x)
+        self.tie_y = np.asarray(tie_y)
+        self.tie_rows = np.asarray(tie_rows)
+        self.tie_cols = np.asarray(tie_cols)
+        self._shape = tuple(int(size) for size in shape)
+        self.wrap_longitude = wrap_longitude
+        self.max_error = max_error
+
+    def __repr__(self) -> str:
+        return (f"TiePointGeolocation(shape={self._shape}, tie_points={self.tie_x.shape}, "
+                f"max_error={self.max_error})")
+
+    @classmethod
+    def from_arrays(
+            cls,
+            x: np.ndarray,
+            y: np.ndarray,
+            step: int = TIE_POINT_STEP,
+            crs: Union[CRS, str] = WGS84) -> "TiePointGeolocation":
+        """
+        Extract tie points from full-resolution coordinate arrays and measure the interpolation error.
+
+        Args:
+            x (np.ndarray): Two-dimensional x (longitude) array.
+            y (np.ndarray): Two-dimensional y (latitude) array.
+            step (int, optional): Spacing of the tie points in pixels. Defaults to TIE_POINT_STEP.
+            crs (optional): CRS of the coordinates. Defaults to WGS84.
+
+        Returns:
+            TiePointGeolocation: Compact geolocation with `max_error` measured against `x` and `y`.
+        """
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        is_geographic = CRS(crs).is_geographic
+
+        if is_geographic:
+            # clip like RasterGeolocation so that both representations agree
+            x = np.clip(x, -180, 179.9999)
+            y = np.clip(y, -90, 90)
+
+        # interpolate longitudes in [0, 360) when the swath straddles the antimeridian
+        wrap_longitude = bool(is_geographic and np.nanmax(x) - np.nanmin(x) > 180)
+        stored_x = np.mod(x, 360) if wrap_longitude else x
+
+        tie_rows = _tie_point_indices(x.shape[0], step)
+        tie_cols = _tie_point_indices(x.shape[1], step)
+
+        geolocation = cls(
+            tie_x=stored_x[np.ix_(tie_rows, tie_cols)],
+            tie_y=y[np.ix_(tie_rows, tie_cols)],
+            tie_rows=tie_rows,
+            tie_cols=tie_cols,
+            shape=x.shape,
+            crs=crs,
+            wrap_longitude=wrap_longitude
+        )
+
+        x_error = np.abs(geolocation.x - x)
+
+        if wrap_longitude:
+            x_error = np.minimum(x_error, 360 - x_error)
+
+        geolocation.max_error = float(max(np.nanmax(x_error), np.nanmax(np.abs(geolocation.y - y))))
+
+        return geolocation
+
+    @classmethod
+    def from_geolocation(cls, geolocation: RasterGeolocation, step: int = TIE_POINT_STEP) -> "TiePointGeolocation":
+        """
+        Compress an existing RasterGeolocation into tie points.
+
+        Args:
+            geolocation (RasterGeolocation): Full-resolution geolocation.
+            step (int, optional): Spacing of the tie points in pixels. Defaults to TIE_POINT_STEP.
+
+        Returns:
+            TiePointGeolocation: Compact geolocation with `max_error` measured against the full arrays.
+        """
+        return cls.from_arrays(geolocation.x, geolocation.y, step=step, crs=geolocation.crs)
+
+    def interpolate(self, tie_values: np.ndarray, row_slice: slice = slice(None), col_slice: slice = slice(None)) -> np.ndarray:
+        """
+        Bilinearly interpolate tie-point values to the full-resolution pixels of a slice.
+
+        Args:
+            tie_values (np.ndarray): Values at the tie points.
+            row_slice (slice, optional): Rows to interpolate. Defaults to all rows.
+            col_slice (slice, optional): Columns to interpolate. Defaults to all columns.
+
+        Returns:
+            np.ndarray: Interpolated values for the slice.
+        """
+        rows = np.arange(self._shape[0])[row_slice]
+        cols = np.arange(self._shape[1])[col_slice]
+        row_lower, row_upper, row_weight = _interpolation_weights(self.tie_rows, rows)
+        col_lower, col_upper, col_weight = _interpolation_weights(self.tie_cols, cols)
+
+        # interpolate along the rows of the tie grid, then along the columns
+        along_rows = tie_values[row_lower] * (1 - row_weight)[:, np.newaxis] + tie_values[row_upper] * row_weight[:, np.newaxis]
+
+        return along_rows[:, col_lower] * (1 - col_weight) + along_rows[:, col_upper] * col_weight
+
+    def _x_slice(self, row_slice: slice = slice(None), col_slice: slice = slice(None)) -> np.ndarray:
+        x = self.interpolate(self.tie_x, row_slice, col_slice)
+
+        if self.wrap_longitude:
+            x = np.mod(x + 180, 360) - 180
+
+        if self.is_geographic:
+            x = np.clip(x, -180, 179.9999)
+
+        return x
+
+    def _y_slice(self, row_slice: slice = slice(None), col_slice: slice = slice(None)) -> np.ndarray:
+        y = self.interpolate(self.tie_y, row_slice, col_slice)
+
+        if self.is_geographic:
+            y = np.clip(y, -90, 90)
+
+        return y
+
+    @property
+    def x(self) -> np.ndarray:
+        """np.ndarray: The two-dimensional x-coordinate array, interpolated on every access."""
+        return self._x_slice()
+
+    @property
+    def y(self) -> np.ndarray:
+        """np.ndarray: The two-dimensional y-coordinate array, interpolated on every access."""
+        return self._y_slice()
+
+    @property
+    def rows(self) -> int:
+        """int: The number of rows in the full-resolution geolocation."""
+        return self._shape[0]
+
+    @property
+    def cols(self) -> int:
+        """int: The number of columns in the full-resolution geolocation."""
+        return self._shape[1]
+
+    @property
+    def latlon_matrices(self) -> Tuple[np.ndarray, np.ndarray]:
+        # computed on demand rather than cached on the instance, which would hold the full arrays
+        x, y = self.x, self.y
+
+        if self.is_geographic:
+            return y, x
+
+        return RasterGeolocation(x=x, y=y, crs=self.crs).latlon_matrices
+
+    @property
+    def nbytes(self) -> int:
+        """int: Memory held by the tie points in bytes."""
+        return self.tie_x.nbytes + self.tie_y.nbytes + self.tie_rows.nbytes + self.tie_cols.nbytes
+
+    def to_geolocation(self) -> RasterGeolocation:
+        """
+        Expand to a full-resolution RasterGeolocation.
+
+        Returns:
+            RasterGeolocation: Geolocation holding the interpolated coordinate arrays.
+        """
+        return RasterGeolocation(x=self.x, y=self.y, crs=self.crs)
+
+    def resize(self, dimensions: Tuple[int, int], order: int = 2) -> RasterGeolocation:
+        """
+        Resize the geolocation to new dimensions.
+
+        The inherited resize zooms the stored full-resolution arrays, which a tie-point geolocation does
+        not keep, so the coordinates are expanded for the duration of the call and resized the same way.
+
+        Args:
+            dimensions (Tuple[int, int]): Target dimensions as (rows, cols).
+            order (int, optional): The order of the spline interpolation. Defaults to 2.
+
+        Returns:
+            RasterGeolocation: A new full-resolution geolocation with the resized dimensions.
+        """
+        return self.to_geolocation().resize(dimensions, order=order)
+
+    def _slice(self, y_slice: slice, x_slice: slice) -> RasterGeolocation:
+        # subsets are interpolated only over the sliced pixels
+        return RasterGeolocation(x=self._x_slice(y_slice, x_slice), y=self._y_slice(y_slice, x_slice), crs=self.crs)
@@ -1,15 +1,23 @@
+import logging
 from typing import Union
 
 import numpy as np
 
 from .constants import *
 from .GLT import GeometryLookupTable
+from .OrthoPlan import OrthoPlan
+from .ortho_fill_value import ortho_fill_value
+
+logger = logging.getLogger(__name__)
 
 def apply_GLT(
             swath_array: np.ndarray, 
             GLT: np.ndarray, 
             fill_value: int = FILL_VALUE, 
-            GLT_nodata_value: int = GLT_NODATA_VALUE) -> np.ndarray:
+            GLT_nodata_value: int = GLT_NODATA_VALUE,
+            plan: OrthoPlan = None,
+            preserve_dtype: bool = False,
+            workers: int = 1) -> np.ndarray:
     """
     Orthorectifies satellite swath data using a Geometry Lookup Table (GLT).
 
@@ -30,9 +38,16 @@ def apply_GLT(
             GLT_array (np.ndarray): Geometry Lookup Table. Shape: (latitude, longitude, 2), with (row, col) indices.
             fill_value (int, optional): Value to use for unmapped output pixels. Defaults to FILL_VALUE.
             GLT_nodata_value (int, optional): Value in GLT indicating invalid mapping. Defaults to GLT_NODATA_VALUE.
+            plan (OrthoPlan, optional): Precomputed gather plan for this GLT and swath shape, reused across arrays.
+                Built from the GLT if not given (and cached on a GeometryLookupTable).
+            preserve_dtype (bool, optional): Keep the dtype of swath_array instead of converting to float32.
+                Unmapped pixels of float outputs are NaN, other dtypes use fill_value if it fits or a sentinel
+                from `ortho_fill_value` (False for booleans, the maximum of unsigned integers). Defaults to False.
+            workers (int, optional): Number of threads gathering row strips of the output grid, one per CPU if None.
+                The result is identical for any number of workers. Defaults to 1.
 
     Returns:
-            np.ndarray: Orthorectified data array, shape (latitude, longitude, bands).
+            np.ndarray: Orthorectified data array, shape (latitude, longitude, bands), float32 unless preserve_dtype is set.
 
     Raises:
             ValueError: If input array dimensions are incompatible or GLT last dimension is not size 2.
@@ -46,36 +61,33 @@ def apply_GLT(
         # Convert single-band data to shape (rows, cols, 1)
         swath_array = swath_array[:, :, np.newaxis]
 
-    # 3. Prepare output array shape: (latitude, longitude, bands)
-    latitude_length, longitude_length = GLT.shape[:2]
-    band_length = swath_array.shape[-1]
-    ortho_array_shape = (latitude_length, longitude_length, band_length)
-
-    # 4. Initialize output with fill_value (for unmapped pixels)
-    ortho_array = np.full(ortho_array_shape, fill_value, dtype=np.float32)
+    # 3. Resolve the gather plan: the flat indices of the valid output pixels and of the swath pixels they map to
+    #    Valid GLT entries are those where both row and col indices are not nodata, converted from 1-based to 0-based
+    if plan is None:
+        swath_shape = swath_array.shape[:2]
 
-    # 5. Identify valid GLT entries (where both row and col indices are not nodata)
-    #    valid_GLT is a 2D boolean mask of shape (latitude, longitude)
-    valid_GLT = np.all(GLT != GLT_nodata_value, axis=-1)
+        if isinstance(GLT, GeometryLookupTable) and GLT.GLT_nodata_value == GLT_nodata_value:
+            plan = GLT.ortho_plan(swath_shape)
+        else:
+            plan = OrthoPlan.from_GLT(GLT, swath_shape=swath_shape, GLT_nodata_value=GLT_nodata_value)
 
-    # 6. Convert GLT indices from 1-based to 0-based (Python convention)
-    zero_based_indices = GLT - 1
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"gathering {plan.size} pixels from swath array {swath_array.shape} onto grid {plan.grid_shape}")
 
-    # 7. For each valid output pixel, copy the corresponding swath data using GLT indices
-    #    This remaps swath_array values to their georeferenced locations in ortho_array
-    #    - zero_based_indices[..., 1] gives swath column indices
-    #    - zero_based_indices[..., 0] gives swath row indices
-    #    - valid_GLT mask selects only valid mappings
-    col_indices = zero_based_indices[valid_GLT, 1]
-    print(f"col indices shape: {col_indices.shape} min: {np.nanmin(col_indices)} max: {np.nanmax(col_indices)}")
-    row_indices = zero_based_indices[valid_GLT, 0]
-    print(f"row indices shape: {row_indices.shape} min: {np.nanmin(row_indices)} max: {np.nanmax(row_indices)}")
-    print(f"swath_array shape: {swath_array.shape}")
+    # 4. Initialize output with fill_value (for unmapped pixels) and copy the swath data of each valid
+    #    output pixel with a single gather, remapping swath_array values to their georeferenced locations
+    if preserve_dtype:
+        dtype = swath_array.dtype
+        output_fill_value = ortho_fill_value(dtype, fill_value)
+    else:
+        dtype = np.float32
+        output_fill_value = fill_value
 
-    ortho_array[valid_GLT, :] = swath_array[row_indices, col_indices, :]
+    ortho_array = plan.apply(swath_array, fill_value=output_fill_value, dtype=dtype, workers=workers)
 
-    # 8. Replace any fill value of -9999 with np.nan for easier downstream analysis
-    ortho_array = np.where(ortho_array == -9999, np.nan, ortho_array)
+    # 5. Replace any fill value of -9999 with np.nan in place for easier downstream analysis (float outputs only)
+    if np.issubdtype(ortho_array.dtype, np.floating):
+        ortho_array[ortho_array == FILL_VALUE] = np.nan
 
-    # 9. Return the orthorectified, geospatially aligned output array
+    # 6. Return the orthorectified, geospatially aligned output array
     return ortho_array
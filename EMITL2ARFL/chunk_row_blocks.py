@@ -0,0 +1,36 @@
+from typing import Iterator, Tuple
+
+import netCDF4
+
+from .constants import *
+
+def chunk_row_blocks(var: netCDF4.Variable, row_off: int, height: int) -> Iterator[Tuple[int, int]]:
+    """
+    Split a range of rows of a NetCDF variable into blocks aligned to its on-disk chunks.
+
+    Reading one block at a time decompresses every chunk once and bounds the temporary memory to one
+    row of chunks. Contiguous variables are split into blocks of NETCDF_READ_BLOCK_ROWS rows.
+
+    Parameters
+    ----------
+    var : netCDF4.Variable
+        Variable whose first dimension is the row dimension.
+    row_off : int
+        First row of the range.
+    height : int
+        Number of rows in the range.
+
+    Yields
+    ------
+    Tuple[int, int]
+        Start (inclusive) and stop (exclusive) row of each block, in absolute rows of the variable.
+    """
+    chunking = var.chunking()
+    block_rows = chunking[0] if isinstance(chunking, list) else NETCDF_READ_BLOCK_ROWS
+    row = int(row_off)
+    row_end = row + int(height)
+
+    while row < row_end:
+        block_end = min(row_end, (row // block_rows + 1) * block_rows)
+        yield row, block_end
+        row = block_end
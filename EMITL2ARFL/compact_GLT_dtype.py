@@ -0,0 +1,25 @@
+import numpy as np
+
+def compact_GLT_dtype(swath_rows: int, swath_cols: int) -> np.dtype:
+    """
+    Return the smallest integer dtype that can hold the 1-based GLT indices of a swath.
+
+    EMIT swaths are about 1280 x 1242 pixels, so their GLT indices fit in uint16 with 0 as nodata.
+    Larger swaths fall back to int32, which is also the on-disk type of `glt_x` and `glt_y`.
+
+    Parameters
+    ----------
+    swath_rows : int
+        Number of downtrack rows in the swath.
+    swath_cols : int
+        Number of crosstrack columns in the swath.
+
+    Returns
+    -------
+    np.dtype
+        uint16 if every 1-based index fits, otherwise int32.
+    """
+    if max(int(swath_rows), int(swath_cols)) <= np.iinfo(np.uint16).max:
+        return np.dtype(np.uint16)
+
+    return np.dtype(np.int32)
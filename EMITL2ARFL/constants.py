@@ -7,4 +7,18 @@ EMIT_L2A_REFLECTANCE_DOI = "10.5067/EMIT/EMITL2ARFL.001"
 EMIT_L2A_REFLECTANCE_CONCEPT_ID = "C2408750690-LPCLOUD"
 
 DOWNLOAD_DIRECTORY = "~/data/EMIT_L2A_RFL"
-QUALITY_BANDS = [0, 1, 2, 3, 4]
\ No newline at end of file
+QUALITY_BANDS = [0, 1, 2, 3, 4]
+MAX_OPEN_NETCDF_FILES = 32
+ARRAY_LAYOUTS = ("BSQ", "BIP", "BIL")
+NETCDF_READ_BLOCK_ROWS = 64
+METADATA_SIDECAR_SUFFIX = ".metadata.json"
+METADATA_SIDECAR_VERSION = 1
+GEOLOCATION_FOOTPRINT_BLOCK_SIZE = 64
+TIE_POINT_STEP = 16
+ORTHO_BLOCK_BANDS = 32
+INVERSE_GLT_BLOCK_SIZE = 32
+MAX_CACHED_SWATH_RESAMPLERS = 16
+MAX_CACHED_QUALITY_MASKS = 32
+SWATH_RESAMPLER_SUFFIX = ".resampler.npz"
+SWATH_RESAMPLER_VERSION = 1
+PIXEL_READ_MAX_GAP = 8
@@ -0,0 +1,150 @@
+import logging
+from typing import Any, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from rasterio.io import BufferedDatasetWriter, DatasetWriter
+from rasterio.windows import Window
+
+from .constants import *
+from .extract_GLT_array import extract_GLT_array
+from .extract_grid import extract_grid
+from .GLT import GeometryLookupTable
+from .metadata_sidecar import read_netcdf_metadata
+from .read_netcdf_array_into import read_netcdf_array_into
+from .select_bands import select_bands
+
+logger = logging.getLogger(__name__)
+
+def _write_block(destination: Any, block: np.ndarray, band_start: int, band_stop: int) -> None:
+    # block is (bands, rows, cols) for cubes or (rows, cols) for 2-D variables
+    if isinstance(destination, (DatasetWriter, BufferedDatasetWriter)):
+        if block.ndim == 2:
+            destination.write(block, 1)
+        else:
+            destination.write(block, indexes=list(range(band_start + 1, band_stop + 1)))
+    elif block.ndim == 2:
+        destination[...] = block
+    else:
+        # ndarray, np.memmap or any array store that supports slice assignment, such as a zarr array
+        destination[band_start:band_stop] = block
+
+def emit_ortho_blocks(
+        filename: str,
+        variable: str,
+        destination: Any = None,
+        GLT: Optional[GeometryLookupTable] = None,
+        swath_window: Optional[Window] = None,
+        group: Optional[str] = None,
+        bands: Optional[Union[int, slice, Sequence[int]]] = None,
+        wavelength_range: Optional[Tuple[float, float]] = None,
+        good_bands_only: bool = False,
+        qmask: Optional[np.ndarray] = None,
+        unpacked_bmask: Optional[np.ndarray] = None,
+        block_bands: int = ORTHO_BLOCK_BANDS,
+        fill_value: Union[int, float] = np.nan,
+        dtype: np.dtype = np.float32,
+        workers: int = 1) -> Any:
+    """
+    Orthorectify an EMIT NetCDF variable a block of bands at a time, writing each block straight into a destination.
+
+    Only one block of swath bands and one block of orthorectified bands are held in memory at once, so peak
+    memory is bounded by `block_bands` instead of the size of the cube.
+
+    Parameters:
+    filename: an EMIT NetCDF file
+    variable: the name of the variable to orthorectify, 2-D (rows, cols) or 3-D (rows, cols, bands)
+    destination: a (bands, latitude, longitude) ndarray, np.memmap or zarr array, or a rasterio dataset opened
+        for writing with one band per selected band. For 2-D variables a (latitude, longitude) array or a single-band dataset.
+        If None, an ndarray is allocated.
+    GLT: the GeometryLookupTable indexing into the swath window, the full scene GLT if None
+    swath_window: the window of the swath that the GLT indexes into, the full swath if None
+    group: the group containing the variable, the root group if None
+    bands, wavelength_range, good_bands_only: the band selection, as in `read_netcdf_array`
+    qmask: a (rows, cols) swath quality mask for the swath window, pixels equal to 1 are set to NaN
+    unpacked_bmask: a (rows, cols, bands) swath band mask for the swath window over all bands, pixels equal to 1 are set to NaN
+    block_bands: the number of bands orthorectified per block
+    fill_value: the value of grid pixels without a swath pixel
+    dtype: the dtype of the orthorectified blocks
+    workers: the number of threads gathering each block, one per CPU if None
+
+    Returns:
+    the destination, filled with the orthorectified variable
+    """
+    if block_bands < 1:
+        raise ValueError(f"block_bands must be positive, got {block_bands}")
+
+    if GLT is None:
+        if swath_window is not None:
+            raise ValueError("a GLT indexing into the swath window is required when a swath window is given")
+
+        GLT = GeometryLookupTable(GLT_array=extract_GLT_array(filename), geometry=extract_grid(filename))
+
+    key = variable if group is None else f"{group}/{variable}"
+    variable_shape = read_netcdf_metadata(filename)["variables"][key]["shape"]
+
+    if swath_window is None:
+        swath_shape = tuple(variable_shape[:2])
+    else:
+        swath_shape = (int(swath_window.height), int(swath_window.width))
+
+    plan = GLT.ortho_plan(swath_shape)
+    grid_shape = plan.grid_shape
+
+    if len(variable_shape) == 2:
+        if destination is None:
+            destination = np.empty(grid_shape, dtype=dtype)
+
+        swath_array = read_netcdf_array_into(filename=filename, variable=variable, group=group, window=swath_window)
+
+        if qmask is not None:
+            swath_array = swath_array.astype(dtype, copy=False)
+            swath_array[qmask == 1] = np.nan
+
+        _write_block(destination, plan.apply(swath_array, fill_value=fill_value, dtype=dtype, workers=workers), 0, 1)
+
+        return destination
+
+    band_indices = select_bands(
+        filename=filename,
+        bands=bands,
+        wavelength_range=wavelength_range,
+        good_bands_only=good_bands_only
+    )
+
+    if band_indices is None:
+        band_indices = np.arange(variable_shape[2])
+
+    if destination is None:
+        destination = np.empty((len(band_indices),) + grid_shape, dtype=dtype)
+
+    swath_block = None
+
+    for band_start in range(0, len(band_indices), block_bands):
+        band_stop = min(band_start + block_bands, len(band_indices))
+        block_indices = band_indices[band_start:band_stop]
+
+        # reuse the swath buffer for every full block
+        if swath_block is None or swath_block.shape[2] != len(block_indices):
+            swath_block = np.empty(swath_shape + (len(block_indices),), dtype=dtype)
+
+        read_netcdf_array_into(
+            filename=filename,
+            variable=variable,
+            out=swath_block,
+            group=group,
+            window=swath_window,
+            bands=block_indices,
+            layout="BIP"
+        )
+
+        if qmask is not None:
+            swath_block[qmask == 1] = np.nan
+
+        if unpacked_bmask is not None:
+            swath_block[unpacked_bmask[..., block_indices] == 1] = np.nan
+
+        logger.debug(f"orthorectifying bands {band_start}-{band_stop - 1} of {variable} from {filename}")
+        ortho_block = plan.apply(swath_block, fill_value=fill_value, dtype=dtype, workers=workers)
+        _write_block(destination, np.moveaxis(ortho_block, -1, 0), band_start, band_stop)
+
+    return destination
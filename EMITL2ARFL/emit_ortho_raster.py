@@ -1,3 +1,5 @@
+import logging
+
 import numpy as np
 from affine import Affine
 import rasters as rt
@@ -9,6 +11,9 @@ from .emit_xarray import emit_xarray
 from .extract_grid import extract_grid
 from .GLT import GeometryLookupTable
 from .extract_GLT import extract_GLT
+from .emit_ortho_blocks import emit_ortho_blocks
+
+logger = logging.getLogger(__name__)
 
 def emit_ortho_raster(
         filename: str, 
@@ -22,7 +27,10 @@ def emit_ortho_raster(
         unpacked_bmask: np.ndarray = None, 
         fill_value: int = FILL_VALUE,
         engine: str = ENGINE,
-        GLT_nodata_value: int = GLT_NODATA_VALUE) -> rt.Raster:
+        GLT_nodata_value: int = GLT_NODATA_VALUE,
+        good_bands_only: bool = False,
+        block_bands: int = None,
+        workers: int = 1) -> rt.Raster:
     """
     Load an EMIT NetCDF data layer and orthorectify it as `rasters.Raster` object.
 
@@ -31,6 +39,10 @@ def emit_ortho_raster(
     layer_name: the name of the data layer to be orthorectified
     qmask: a numpy array output from the quality_mask function used to mask pixels based on quality flags selected in that function. Any non-orthorectified array with the proper crosstrack and downtrack dimensions can also be used.
     unpacked_bmask: a numpy array from  the band_mask function that can be used to mask band-specific pixels that have been interpolated.
+    good_bands_only: drop the bands flagged as bad in `good_wavelengths` (water absorption bands) at read time
+    block_bands: if given, orthorectify this many bands at a time straight into the (bands, rows, cols) raster array,
+        bounding peak memory by the block size instead of building the orthorectified dataset
+    workers: the number of threads gathering row strips of the output grid, one per CPU if None
 
     Returns:
     raster.Raster object containing the orthorectified EMIT data layer
@@ -46,7 +58,7 @@ def emit_ortho_raster(
         if geometry is None:
             geometry = scene_grid.subset(grid_window)
 
-        # FIXME need to generate swath window from grid window based on GLT
+        # the swath window of the grid window is looked up in the inverse GLT of the scene
         if GLT is None or adjusted_GLT is None or swath_window is None:
             GLT, adjusted_GLT, swath_window = extract_GLT(
                 filename=filename,
@@ -54,13 +66,26 @@ def emit_ortho_raster(
                 GLT_nodata_value=GLT_nodata_value
             )
 
-            print("scene_grid.shape:", scene_grid.shape)
-            print("GLT", GLT)
-            print("Adjusted GLT:", adjusted_GLT)
+            logger.debug(f"scene grid shape: {scene_grid.shape} GLT: {GLT} adjusted GLT: {adjusted_GLT}")
 
     else:
         geometry = scene_grid
 
+    if block_bands is not None:
+        ortho_array = emit_ortho_blocks(
+            filename=filename,
+            variable=layer_name,
+            GLT=adjusted_GLT if processing_subset else None,
+            swath_window=swath_window if processing_subset else None,
+            good_bands_only=good_bands_only,
+            qmask=qmask,
+            unpacked_bmask=unpacked_bmask,
+            block_bands=block_bands,
+            workers=workers
+        )
+
+        return rt.MultiRaster(ortho_array, geometry=geometry)
+
     ortho_ds = emit_xarray(
         filename=filename,
         ortho=True,
@@ -71,7 +96,9 @@ def emit_ortho_raster(
         qmask=qmask,
         unpacked_bmask=unpacked_bmask,
         fill_value=fill_value,
-        engine=engine
+        engine=engine,
+        good_bands_only=good_bands_only,
+        workers=workers
     )
 
     # latitude_length, longitude_length, bands = ortho_ds.reflectance.shape
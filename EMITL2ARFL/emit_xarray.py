@@ -1,23 +1,41 @@
-import netCDF4 as nc
 import os
-from spectral.io import envi
 import numpy as np
-import math
-from skimage import io
-import pandas as pd
-import geopandas as gpd
 import xarray as xr
-import rasterio as rio
-import rioxarray as rxr
-import s3fs
-from rioxarray.merge import merge_arrays
-from fsspec.implementations.http import HTTPFile
 from rasterio.windows import Window
-from os.path import join, expanduser
 
 from .constants import *
 from .ortho_xr import ortho_xr
-from .extract_GLT_array import extract_GLT_array
+from .read_GLT import read_GLT
+from .read_emit_window import read_emit_window
+
+def _open_emit_groups(filename, swath_window: Window, wvl_group: str, engine: str, good_bands_only: bool, granule_id: str):
+    wvl = None
+
+    if wvl_group:
+        wvl = xr.open_dataset(filename, engine=engine, group=wvl_group)
+
+    # load swath dataset to xarray with lazy loading
+    ds = xr.open_dataset(filename, engine=engine, chunks={})
+    if good_bands_only:
+        if wvl is None or "good_wavelengths" not in wvl:
+            raise ValueError(f"good_bands_only requires sensor_band_parameters/good_wavelengths: {granule_id}")
+        # drop the bad-wavelength bands from the lazy indexers so they are never read from disk
+        good_band_indices = np.flatnonzero(wvl["good_wavelengths"].values == 1)
+        ds = ds.isel(bands=good_band_indices)
+        wvl = wvl.isel(bands=good_band_indices)
+    if swath_window is not None:
+        # Slicing assumes dimensions are [downtrack, crosstrack]
+        row_start = int(swath_window.row_off)
+        row_end = row_start + int(swath_window.height)
+        col_start = int(swath_window.col_off)
+        col_end = col_start + int(swath_window.width)
+        ds = ds.isel(downtrack=slice(row_start, row_end), crosstrack=slice(col_start, col_end)).load()
+    # load location dataset to xarray with lazy loading
+    loc = xr.open_dataset(filename, engine=engine, group="location", chunks={})
+    if swath_window is not None:
+        loc = loc.isel(downtrack=slice(row_start, row_end), crosstrack=slice(col_start, col_end)).load()
+
+    return ds, loc, wvl
 
 def emit_xarray(
     filename: str, 
@@ -29,7 +47,9 @@ def emit_xarray(
     qmask: np.ndarray = None, 
     unpacked_bmask: np.ndarray = None, 
     fill_value: int = FILL_VALUE,
-    engine: str = ENGINE
+    engine: str = ENGINE,
+    good_bands_only: bool = False,
+    workers: int = 1
 ) -> xr.Dataset:
     """
     Load an EMIT NetCDF dataset as an xarray.Dataset.
@@ -39,6 +59,8 @@ def emit_xarray(
     ortho: hyperspectral cube is left is swath spatial dimensions if `ortho` is False and orthorectified to a grid using the included GLT if True
     qmask: a numpy array output from the quality_mask function used to mask pixels based on quality flags selected in that function. Any non-orthorectified array with the proper crosstrack and downtrack dimensions can also be used.
     unpacked_bmask: a numpy array from  the band_mask function that can be used to mask band-specific pixels that have been interpolated.
+    good_bands_only: drop the bands flagged as bad in `good_wavelengths` (water absorption bands) before reading the cube
+    workers: the number of threads orthorectifying each variable when `ortho` is True, one per CPU if None
 
     Returns:
     out_xr: an xarray.Dataset constructed based on the parameters provided.
@@ -46,30 +68,25 @@ def emit_xarray(
     """
     # Grab granule filename to check product
 
-    if type(filename) == s3fs.core.S3File:
-        granule_id = filename.info()["name"].split("/", -1)[-1].split(".", -1)[0]
-    elif type(filename) == HTTPFile:
-        granule_id = filename.path.split("/", -1)[-1].split(".", -1)[0]
-    else:
+    local_file = isinstance(filename, (str, os.PathLike))
+
+    if local_file:
         granule_id = os.path.splitext(os.path.basename(filename))[0]
+    else:
+        # remote file objects are rare, so their filesystem modules are only imported when needed
+        import s3fs
+        from fsspec.implementations.http import HTTPFile
+
+        if type(filename) == s3fs.core.S3File:
+            granule_id = filename.info()["name"].split("/", -1)[-1].split(".", -1)[0]
+        elif type(filename) == HTTPFile:
+            granule_id = filename.path.split("/", -1)[-1].split(".", -1)[0]
+        else:
+            granule_id = os.path.splitext(os.path.basename(filename))[0]
 
     # Read in Data as Xarray Datasets
     wvl_group = None
 
-    # load swath dataset to xarray with lazy loading
-    ds = xr.open_dataset(filename, engine=engine, chunks={})
-    if swath_window is not None:
-        # Slicing assumes dimensions are [downtrack, crosstrack]
-        row_start = int(swath_window.row_off)
-        row_end = row_start + int(swath_window.height)
-        col_start = int(swath_window.col_off)
-        col_end = col_start + int(swath_window.width)
-        ds = ds.isel(downtrack=slice(row_start, row_end), crosstrack=slice(col_start, col_end)).load()
-    # load location dataset to xarray with lazy loading
-    loc = xr.open_dataset(filename, engine=engine, group="location", chunks={})
-    if swath_window is not None:
-        loc = loc.isel(downtrack=slice(row_start, row_end), crosstrack=slice(col_start, col_end)).load()
-
     # Check if mineral dataset and read in groups (only ds/loc for minunc)
 
     if "L2B_MIN_" in granule_id:
@@ -77,10 +94,23 @@ def emit_xarray(
     elif "L2B_MINUNC" not in granule_id:
         wvl_group = "sensor_band_parameters"
 
-    wvl = None
-
-    if wvl_group:
-        wvl = xr.open_dataset(filename, engine=engine, group=wvl_group)
+    if local_file and swath_window is not None and engine == "netcdf4":
+        # read the window of every group through one pooled handle without building a dask graph
+        ds, loc, wvl = read_emit_window(
+            os.fspath(filename),
+            swath_window=swath_window,
+            wavelength_group=wvl_group,
+            good_bands_only=good_bands_only
+        )
+    else:
+        ds, loc, wvl = _open_emit_groups(
+            filename,
+            swath_window=swath_window,
+            wvl_group=wvl_group,
+            engine=engine,
+            good_bands_only=good_bands_only,
+            granule_id=granule_id
+        )
 
     # Building Flat Dataset from Components
     data_vars = {**ds.variables}
@@ -130,18 +160,18 @@ def emit_xarray(
 
     # orthorectify the swath cube if the ortho flag is set
     if ortho is True:
-        # If GLT_array is not provided, extract and slice it from the NetCDF file
+        # If GLT_array is not provided, read the grid window of it from the NetCDF file
+        # and make its indices relative to the swath window that was read
         if GLT_array is None:
-            GLT_array, adjusted_GLT, swath_window = extract_GLT_array(
-                filename=filename, 
-                window=grid_window,
-                adjust_indices=True
-            )
+            GLT_array = read_GLT(filename, window=grid_window)
+            adjusted_GLT = GLT_array.adjust_indices(swath_window)
         # orthorectify the swath cube to a grid cube
         out_xr = ortho_xr(
             out_xr,
             GLT_array=adjusted_GLT,
-            fill_value=fill_value
+            fill_value=fill_value,
+            workers=workers,
+            grid_window=grid_window
         )
         # set `Orthorectified` attribute to True
         out_xr.attrs["Orthorectified"] = "True"
@@ -5,8 +5,8 @@ from rasters import RasterGeometry
 
 from .extract_grid import extract_grid
 
-from .extract_GLT_array import extract_GLT_array
-from .GLT import GeometryLookupTable
+from .InverseGLT import read_inverse_GLT
+from .read_GLT import read_GLT
 from .emit_xarray import emit_xarray
 from .constants import GLT_NODATA_VALUE
 
@@ -20,34 +20,22 @@ def extract_GLT(
     """
     processing_subset = geometry is not None or window is not None
 
-    scene_grid = extract_grid(filename=filename)
+    if window is None and geometry is not None:
+        # the scene grid comes from the metadata index, so this does not open the file
+        window = extract_grid(filename=filename).window(geometry)
 
-    if processing_subset:
-        if geometry is None:
-            geometry = extract_grid(
-                filename, 
-                window=window
-            )
-
-        if window is None:
-            window = scene_grid.window(geometry)
-            subset_grid = scene_grid.subset(window)
-    else:
-        geometry = scene_grid
-
-    GLT_array = extract_GLT_array(
-        filename, 
+    # a GLT is a grid of swath indices that needs to be georeferenced as a grid,
+    # and both are read through a single file handle
+    GLT = read_GLT(
+        filename,
         window=window,
         GLT_nodata_value=GLT_nodata_value
     )
 
-    # a GLT is a grid of swath indices that needs to be georeferenced as a grid
-
-    GLT = GeometryLookupTable(GLT_array=GLT_array, geometry=geometry)
-
     if processing_subset:
-        adjusted_GLT = GLT.adjust_indices(window)
-        swath_window: Window = GLT.swath_window
+        # the swath window comes from the cached inverse GLT, and the subset indices are made relative to it
+        swath_window: Window = read_inverse_GLT(filename).grid_to_swath_window(window)
+        adjusted_GLT = GLT.adjust_indices(swath_window)
 
         # calculate the row/col shape of the subset defined by the swath_window Window object
         swath_shape = (swath_window.height, swath_window.width)
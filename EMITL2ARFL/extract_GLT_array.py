@@ -1,15 +1,17 @@
+from typing import Optional
+
 import numpy as np
 import xarray as xr
 from rasterio.windows import Window
 
 from .constants import *
-from .read_netcdf_array import read_netcdf_array
+from .read_GLT import read_GLT
 
 def extract_GLT_array(
         filename: str,
         window: Window = None,
-        adjust_indices: bool = False,
-        GLT_nodata_value: int = GLT_NODATA_VALUE) -> np.ndarray:
+        GLT_nodata_value: int = GLT_NODATA_VALUE,
+        dtype: Optional[np.dtype] = None) -> np.ndarray:
     """
     Extracts the EMIT Geometry Lookup Table (GLT) index pairs from an xarray.Dataset or NetCDF file.
 
@@ -22,20 +24,27 @@ def extract_GLT_array(
     - Loads the swath dataset (if a filename is provided).
     - Extracts the 'glt_x' and 'glt_y' arrays, which contain the swath column and row indices for each output pixel.
     - Stacks these into a single array of shape (latitude, longitude, 2), where the last dimension holds (row, column) pairs: (row, column) = (glt_y, glt_x).
-    - Replaces any missing values (NaN) with the specified GLT_nodata_value, ensuring all output indices are valid integers.
+    - Keeps missing indices at the on-disk GLT nodata value of 0.
+
+    The indices are read straight into the compact integer dtype, without masked, float or NaN intermediates,
+    through a single file handle (see `read_GLT`).
 
     Parameters
     ----------
-    swath_ds : xr.Dataset | str
-        EMIT swath xarray Dataset containing 'glt_x' and 'glt_y' arrays, or a filename to load.
+    filename : str
+        EMIT NetCDF file containing 'glt_x' and 'glt_y' arrays in the 'location' group.
+    window : Window, optional
+        Grid window of the GLT to read.
     GLT_nodata_value : int, optional
-        Value to use for missing GLT indices (default: GLT_NODATA_VALUE).
+        Value marking missing GLT indices (default: GLT_NODATA_VALUE).
+    dtype : np.dtype, optional
+        Integer dtype of the GLT. Defaults to `compact_GLT_dtype` of the swath, uint16 for EMIT scenes.
 
     Returns
     -------
     np.ndarray
-        Array of shape (latitude, longitude, 2) with GLT index pairs (row, column), dtype=int.
-        Missing values are set to GLT_nodata_value.
+        Array of shape (latitude, longitude, 2) with GLT index pairs (row, column).
+        Missing values are 0.
     """
     # # Step 1: If input is a filename, load the xarray.Dataset
     # if isinstance(swath_dataset, str):
@@ -49,34 +58,12 @@ def extract_GLT_array(
     # # These arrays map each output pixel to its location in the original swath
     # GLT_x: np.ndarray = ds["glt_x"].data  # swath column indices
     # GLT_y: np.ndarray = ds["glt_y"].data  # swath row indices
-    GLT_x = read_netcdf_array(
-        filename=filename,
-        variable="glt_x", 
-        group="location",
-        window=window
-    )
-
-    GLT_y = read_netcdf_array(
-        filename=filename,
-        variable="glt_y", 
-        group="location",
-        window=window
-    )
-
-    # Step 3: Stack row and column indices into a single array of shape (latitude, longitude, 2)
-    # The last dimension holds (row, column) pairs for each output pixel: (row, column) = (glt_y, glt_x)
-    GLT_array: np.ndarray = np.nan_to_num(
-        np.stack([GLT_y, GLT_x], axis=-1),
-        nan=GLT_nodata_value
-    ).astype(int)
+    # Step 3: Read the row and column indices directly into the compact dtype and interleave them
+    # into a single array of shape (latitude, longitude, 2) holding (row, column) = (glt_y, glt_x)
+    GLT_array = np.asarray(read_GLT(filename, window=window, GLT_nodata_value=GLT_nodata_value, dtype=dtype))
 
-    # Step 4: Optionally adjust indices if requested
-    if adjust_indices and window is not None:
-        # window.col_off and window.row_off are the offsets for the subset
-        # Only adjust non-nodata values
-        mask = (GLT_array[..., 0] != GLT_nodata_value) & (GLT_array[..., 1] != GLT_nodata_value)
-        GLT_array[..., 0][mask] -= int(window.row_off)
-        GLT_array[..., 1][mask] -= int(window.col_off)
+    # The indices are 1-based swath indices of the whole scene. Making them relative to a swath subset
+    # is done with `GeometryLookupTable.adjust_indices`, which range-checks against the swath window.
 
-    # Step 5: Return the GLT array, ready for use in geospatial orthorectification
+    # Step 4: Return the GLT array, ready for use in geospatial orthorectification
     return GLT_array
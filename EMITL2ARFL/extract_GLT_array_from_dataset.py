@@ -1,13 +1,17 @@
+from typing import Optional
+
 import numpy as np
 import xarray as xr
 from rasterio.windows import Window
 
 from .constants import *
+from .compact_GLT_dtype import compact_GLT_dtype
 
 def extract_GLT_array_from_dataset(
         swath_dataset: xr.Dataset, 
         swath_window: Window = None,
-        GLT_nodata_value: int = GLT_NODATA_VALUE) -> np.ndarray:
+        GLT_nodata_value: int = GLT_NODATA_VALUE,
+        dtype: Optional[np.dtype] = None) -> np.ndarray:
     """
     Extracts the EMIT Geometry Lookup Table (GLT) index pairs from an xarray.Dataset or NetCDF file.
 
@@ -28,11 +32,13 @@ def extract_GLT_array_from_dataset(
         EMIT swath xarray Dataset containing 'glt_x' and 'glt_y' arrays, or a filename to load.
     GLT_nodata_value : int, optional
         Value to use for missing GLT indices (default: GLT_NODATA_VALUE).
+    dtype : np.dtype, optional
+        Integer dtype of the GLT. Defaults to `compact_GLT_dtype` of the swath, uint16 for EMIT scenes.
 
     Returns
     -------
     np.ndarray
-        Array of shape (latitude, longitude, 2) with GLT index pairs (row, column), dtype=int.
+        Array of shape (latitude, longitude, 2) with GLT index pairs (row, column) in the compact dtype.
         Missing values are set to GLT_nodata_value.
     """
     # Step 1: If input is a filename, load the xarray.Dataset
@@ -52,12 +58,19 @@ def extract_GLT_array_from_dataset(
     GLT_x: np.ndarray = ds["glt_x"].data  # swath column indices
     GLT_y: np.ndarray = ds["glt_y"].data  # swath row indices
 
-    # Step 3: Stack row and column indices into a single array of shape (latitude, longitude, 2)
+    if dtype is None:
+        dtype = compact_GLT_dtype(ds.sizes.get("downtrack", np.iinfo(np.int32).max), ds.sizes.get("crosstrack", np.iinfo(np.int32).max))
+
+    # Step 3: Write row and column indices into a single array of shape (latitude, longitude, 2)
     # The last dimension holds (row, column) pairs for each output pixel: (row, column) = (glt_y, glt_x)
-    GLT_array: np.ndarray = np.nan_to_num(
-        np.stack([GLT_y, GLT_x], axis=-1),
-        nan=GLT_nodata_value
-    ).astype(int)
+    GLT_array = np.empty(GLT_y.shape + (2,), dtype=dtype)
+
+    for index, component in enumerate((GLT_y, GLT_x)):
+        if np.issubdtype(component.dtype, np.floating):
+            # decoded datasets carry missing indices as NaN
+            GLT_array[..., index] = np.where(np.isnan(component), GLT_nodata_value, component)
+        else:
+            GLT_array[..., index] = component
 
     # Step 4: Return the GLT array, ready for use in geospatial orthorectification
     return GLT_array
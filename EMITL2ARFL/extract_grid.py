@@ -1,19 +1,18 @@
-import netCDF4
 from affine import Affine
 from rasterio.windows import Window
 
 from rasters import RasterGrid
 
-from .read_dimensions import read_dimensions
+from .metadata_sidecar import read_netcdf_metadata
 
 def extract_grid(
         filename: str,
         window: Window = None
         ) -> RasterGrid:
-    with netCDF4.Dataset(filename, 'r') as ds:
-        geotransform = ds.getncattr("geotransform")
-    
-    dimensions = read_dimensions(filename=filename)
+    # geotransform and dimensions are served from the metadata index instead of reopening the file
+    metadata = read_netcdf_metadata(filename)
+    geotransform = metadata["geotransform"]
+    dimensions = metadata["dimensions"]
     rows = int(dimensions["ortho_y"])
     cols = int(dimensions["ortho_x"])
     affine = Affine.from_gdal(*geotransform)
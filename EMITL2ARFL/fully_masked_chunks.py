@@ -0,0 +1,25 @@
+from typing import Tuple
+
+import numpy as np
+
+def fully_masked_chunks(mask: np.ndarray, chunk_shape: Tuple[int, int]) -> np.ndarray:
+    """
+    Summarize a (rows, cols) boolean mask over a grid of chunks.
+
+    Parameters:
+        mask (np.ndarray): (rows, cols) mask, True for masked pixels.
+        chunk_shape (Tuple[int, int]): (rows, cols) of each chunk, partial chunks along the far edges included.
+
+    Returns:
+        np.ndarray: (chunk rows, chunk cols) boolean array, True where every pixel of the chunk is masked.
+    """
+    mask = np.asarray(mask, dtype=bool)
+    rows, cols = mask.shape
+    chunk_rows, chunk_cols = (int(size) for size in chunk_shape)
+    grid_rows, grid_cols = -(-rows // chunk_rows), -(-cols // chunk_cols)
+
+    # pad the partial edge chunks with masked pixels so that they only depend on the pixels they hold
+    padded = np.ones((grid_rows * chunk_rows, grid_cols * chunk_cols), dtype=bool)
+    padded[:rows, :cols] = mask
+
+    return padded.reshape(grid_rows, chunk_rows, grid_cols, chunk_cols).all(axis=(1, 3))
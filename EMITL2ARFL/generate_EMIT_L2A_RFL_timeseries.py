@@ -17,7 +17,8 @@ def generate_EMIT_L2A_RFL_timeseries(
         end_date_UTC: Union[date, str],
         geometry: RasterGeometry,
         output_directory: str,
-        download_directory: str = DOWNLOAD_DIRECTORY) -> List[str]:
+        download_directory: str = DOWNLOAD_DIRECTORY,
+        good_bands_only: bool = False) -> List[str]:
     logger.info(f"generating EMIT L2A RFL timeseries from {start_date_UTC} to {end_date_UTC}")
     
     filenames = []
@@ -42,7 +43,8 @@ def generate_EMIT_L2A_RFL_timeseries(
             merged_cube = retrieve_EMIT_L2A_RFL(
                 date_UTC=date_UTC,
                 geometry=geometry,
-                download_directory=download_directory
+                download_directory=download_directory,
+                good_bands_only=good_bands_only
             )
             
             logger.info(f"saving merged cube: {output_filename}")
@@ -1,7 +1,31 @@
+from functools import lru_cache
+from typing import Optional, Tuple
+
 import numpy as np
 import xarray as xr
 from rasterio.windows import Window
 
+@lru_cache(maxsize=32)
+def _pixel_center_coords(
+        GT: Tuple[float, ...],
+        dim_x: int,
+        dim_y: int,
+        window_key: Optional[Tuple[int, int, int, int]] = None) -> Tuple[np.ndarray, np.ndarray]:
+    # the coordinates only depend on the geotransform, GLT shape and grid window, so every variable and
+    # every call on the same granule and window shares one read-only pair of vectors
+    x_geo = (GT[0] + 0.5 * GT[1]) + np.arange(dim_x) * GT[1]
+    y_geo = (GT[3] + 0.5 * GT[5]) + np.arange(dim_y) * GT[5]
+
+    if window_key is not None:
+        row_off, col_off, height, width = window_key
+        x_geo = x_geo[col_off:col_off + width].copy()
+        y_geo = y_geo[row_off:row_off + height].copy()
+
+    x_geo.flags.writeable = False
+    y_geo.flags.writeable = False
+
+    return x_geo, y_geo
+
 # Function to Calculate the center of pixel Lat and Lon Coordinates of the GLT grid
 def get_pixel_center_coords(
         ds: xr.Dataset,
@@ -11,24 +35,26 @@ def get_pixel_center_coords(
 
     Parameters:
     ds: an emit dataset opened with emit_xarray function
+    grid_window: window of the GLT grid to return the pixel centers of, the whole grid if None
 
     Returns:
     x_geo, y_geo: longitude and latitude pixel centers of glt (gridded data)
 
     """
     # Retrieve GLT
-    GT = ds.geotransform
+    GT = tuple(float(value) for value in ds.geotransform)
     # Get Shape of GLT
     dim_x = ds.glt_x.shape[1]
     dim_y = ds.glt_y.shape[0]
-    
-    # Build Arrays containing pixel centers
-    x_geo = (GT[0] + 0.5 * GT[1]) + np.arange(dim_x) * GT[1]
-    y_geo = (GT[3] + 0.5 * GT[5]) + np.arange(dim_y) * GT[5]
+    window_key = None if grid_window is None else (
+        int(grid_window.row_off),
+        int(grid_window.col_off),
+        int(grid_window.height),
+        int(grid_window.width)
+    )
 
-    # Subset arrays if grid_window is provided
-    if grid_window is not None:
-        x_geo = x_geo[grid_window.col_off : grid_window.col_off + grid_window.width]
-        y_geo = y_geo[grid_window.row_off : grid_window.row_off + grid_window.height]
+    # Build Arrays containing pixel centers, cached per geotransform, GLT shape and grid window
+    x_geo, y_geo = _pixel_center_coords(GT, int(dim_x), int(dim_y), window_key)
 
-    return x_geo, y_geo
+    # return copies so callers can modify the vectors without touching the cached pair
+    return x_geo.copy(), y_geo.copy()
@@ -0,0 +1,215 @@
+import json
+import logging
+import os
+import threading
+from glob import glob
+from os.path import abspath, expanduser, exists, join
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from .constants import *
+from .netcdf_handle_pool import open_netcdf
+
+logger = logging.getLogger(__name__)
+
+_METADATA_CACHE: Dict[str, Dict[str, Any]] = {}
+_METADATA_CACHE_LOCK = threading.Lock()
+
+def _to_json(value: Any) -> Any:
+    # convert NetCDF attribute and variable values to JSON-serializable types
+    if isinstance(value, np.ndarray):
+        return [_to_json(item) for item in value.tolist()]
+    elif isinstance(value, np.generic):
+        return value.item()
+    elif isinstance(value, bytes):
+        return value.decode()
+    elif isinstance(value, (list, tuple)):
+        return [_to_json(item) for item in value]
+    else:
+        return value
+
+def _file_signature(filename: str) -> Dict[str, int]:
+    stat = os.stat(filename)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+def sidecar_filename(filename: str) -> str:
+    """
+    Return the path of the metadata sidecar for a NetCDF file.
+
+    Args:
+        filename (str): Path to the NetCDF file.
+
+    Returns:
+        str: Path of the JSON sidecar next to the NetCDF file.
+    """
+    return f"{abspath(expanduser(filename))}{METADATA_SIDECAR_SUFFIX}"
+
+def build_netcdf_metadata(filename: str) -> Dict[str, Any]:
+    """
+    Read the metadata that the EMIT accessors need from a NetCDF file in a single pass.
+
+    The result holds the file size and modification time used to invalidate the sidecar, the dimensions,
+    the global attributes, the geotransform and bounding coordinates, the `sensor_band_parameters`
+    vectors (wavelengths, fwhm, good_wavelengths or mask band names) and the shape, dtype and chunk
+    layout of every variable.
+
+    Args:
+        filename (str): Path to the NetCDF file.
+
+    Returns:
+        dict: JSON-serializable metadata.
+    """
+    filename = abspath(expanduser(filename))
+    metadata = {
+        "version": METADATA_SIDECAR_VERSION,
+        **_file_signature(filename)
+    }
+
+    with open_netcdf(filename) as ds:
+        metadata["dimensions"] = {dim_name: len(dim) for dim_name, dim in ds.dimensions.items()}
+        metadata["attributes"] = {attr: _to_json(ds.getncattr(attr)) for attr in ds.ncattrs()}
+        metadata["geotransform"] = metadata["attributes"].get("geotransform")
+        metadata["bounds"] = {
+            key: metadata["attributes"][key]
+            for key in ("northernmost_latitude", "southernmost_latitude", "easternmost_longitude", "westernmost_longitude")
+            if key in metadata["attributes"]
+        }
+
+        variables = {}
+        groups = [(None, ds)] + list(ds.groups.items())
+
+        for group_name, group in groups:
+            for var_name, var in group.variables.items():
+                key = var_name if group_name is None else f"{group_name}/{var_name}"
+                chunking = var.chunking()
+                variables[key] = {
+                    "shape": list(var.shape),
+                    "dtype": str(var.dtype),
+                    "chunks": list(chunking) if isinstance(chunking, list) else None
+                }
+
+        metadata["variables"] = variables
+        metadata["groups"] = list(ds.groups.keys())
+
+        if "sensor_band_parameters" in ds.groups:
+            metadata["sensor_band_parameters"] = {
+                var_name: _to_json(np.asarray(var[:]))
+                for var_name, var in ds.groups["sensor_band_parameters"].variables.items()
+            }
+        else:
+            metadata["sensor_band_parameters"] = {}
+
+    return metadata
+
+def write_metadata_sidecar(filename: str, metadata: Dict[str, Any] = None) -> Dict[str, Any]:
+    """
+    Write the metadata sidecar for a NetCDF file.
+
+    Args:
+        filename (str): Path to the NetCDF file.
+        metadata (dict, optional): Metadata to write. Defaults to None (read it from the file).
+
+    Returns:
+        dict: The metadata that was written.
+    """
+    if metadata is None:
+        metadata = build_netcdf_metadata(filename)
+
+    output_filename = sidecar_filename(filename)
+    temporary_filename = f"{output_filename}.{os.getpid()}.tmp"
+
+    # write to a temporary file and rename so that concurrent readers never see a partial sidecar
+    with open(temporary_filename, "w") as file:
+        json.dump(metadata, file)
+
+    os.replace(temporary_filename, output_filename)
+
+    return metadata
+
+def read_metadata_sidecar(filename: str) -> Optional[Dict[str, Any]]:
+    """
+    Read the metadata sidecar for a NetCDF file if it is present and current.
+
+    Args:
+        filename (str): Path to the NetCDF file.
+
+    Returns:
+        dict: Metadata, or None if the sidecar is missing, unreadable, or stale (file size or mtime changed).
+    """
+    input_filename = sidecar_filename(filename)
+
+    if not exists(input_filename):
+        return None
+
+    try:
+        with open(input_filename, "r") as file:
+            metadata = json.load(file)
+    except (OSError, ValueError) as e:
+        logger.warning(f"unable to read metadata sidecar {input_filename}: {e}")
+        return None
+
+    signature = _file_signature(abspath(expanduser(filename)))
+
+    if metadata.get("version") != METADATA_SIDECAR_VERSION or any(metadata.get(key) != value for key, value in signature.items()):
+        return None
+
+    return metadata
+
+def read_netcdf_metadata(filename: str, write_sidecar: bool = True) -> Dict[str, Any]:
+    """
+    Return the metadata for a NetCDF file, served from memory, the sidecar, or the file itself in that order.
+
+    Args:
+        filename (str): Path to the NetCDF file.
+        write_sidecar (bool, optional): Write a sidecar when the metadata had to be read from the file. Defaults to True.
+
+    Returns:
+        dict: Metadata as produced by `build_netcdf_metadata`.
+    """
+    filename = abspath(expanduser(filename))
+    signature = _file_signature(filename)
+
+    with _METADATA_CACHE_LOCK:
+        metadata = _METADATA_CACHE.get(filename)
+
+    if metadata is not None and all(metadata.get(key) == value for key, value in signature.items()):
+        return metadata
+
+    metadata = read_metadata_sidecar(filename)
+
+    if metadata is None:
+        metadata = build_netcdf_metadata(filename)
+
+        if write_sidecar:
+            try:
+                write_metadata_sidecar(filename, metadata)
+            except OSError as e:
+                logger.warning(f"unable to write metadata sidecar for {filename}: {e}")
+
+    with _METADATA_CACHE_LOCK:
+        _METADATA_CACHE[filename] = metadata
+
+    return metadata
+
+def ingest_EMIT_metadata(directory: str = DOWNLOAD_DIRECTORY, pattern: str = "**/EMIT_*.nc") -> Dict[str, Dict[str, Any]]:
+    """
+    Scan a directory of downloaded EMIT granules, writing sidecars for new or changed files.
+
+    Files with a current sidecar are not opened, so re-scanning a large download directory only costs a
+    `stat` and a small JSON read per file.
+
+    Args:
+        directory (str, optional): Directory to scan. Defaults to DOWNLOAD_DIRECTORY.
+        pattern (str, optional): Glob pattern of NetCDF files relative to the directory. Defaults to "**/EMIT_*.nc".
+
+    Returns:
+        dict: Metadata for each NetCDF file, keyed by absolute filename.
+    """
+    directory = abspath(expanduser(directory))
+
+    return {
+        filename: read_netcdf_metadata(filename)
+        for filename
+        in sorted(glob(join(directory, pattern), recursive=True))
+    }
@@ -0,0 +1,32 @@
+from contextlib import contextmanager
+from typing import Iterator
+
+import netCDF4
+
+@contextmanager
+def netcdf_auto_mask(var: netCDF4.Variable, enabled: bool) -> Iterator[netCDF4.Variable]:
+    """
+    Set the automatic masking of a NetCDF variable for the duration of a read and restore it afterwards.
+
+    Pooled handles are shared between readers, so a reader that changes the masking of a variable
+    has to put it back even when the read fails.
+
+    Parameters
+    ----------
+    var : netCDF4.Variable
+        Variable to read.
+    enabled : bool
+        Whether netCDF4 returns masked arrays inside the block.
+
+    Yields
+    ------
+    netCDF4.Variable
+        The same variable, with automatic masking set to `enabled`.
+    """
+    previous_auto_mask = var.mask
+    var.set_auto_mask(enabled)
+
+    try:
+        yield var
+    finally:
+        var.set_auto_mask(previous_auto_mask)
@@ -0,0 +1,160 @@
+import atexit
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from os.path import abspath, expanduser
+from typing import Dict, Iterator, Tuple
+
+import netCDF4
+
+from .constants import MAX_OPEN_NETCDF_FILES
+
+class NetCDFHandlePool:
+    """
+    Process-wide pool of read-only `netCDF4.Dataset` handles with least-recently-used eviction.
+
+    Reusing a handle keeps the HDF5 metadata and chunk cache of a granule warm between reads,
+    so repeated subset reads of the same file do not pay the file-open and metadata-parse cost again.
+    Handles are keyed by absolute filename and reopened if the file size or modification time changes.
+    Handles that are currently checked out are never closed by eviction.
+
+    HDF5 handles are not safe to read from several threads at once, so each handle carries a re-entrant
+    lock that is held for as long as it is checked out: threads reading the same file take turns, while
+    reads of different files and nested checkouts within one thread proceed without blocking.
+    """
+    def __init__(self, max_open_files: int = MAX_OPEN_NETCDF_FILES) -> None:
+        """
+        Initialize an empty handle pool.
+
+        Args:
+            max_open_files (int, optional): Maximum number of idle handles kept open. Defaults to MAX_OPEN_NETCDF_FILES.
+        """
+        if max_open_files < 1:
+            raise ValueError(f"max_open_files must be at least 1, got {max_open_files}")
+
+        self.max_open_files: int = max_open_files
+        self._handles: "OrderedDict[str, Tuple[netCDF4.Dataset, Tuple[int, int], threading.RLock]]" = OrderedDict()
+        self._in_use: Dict[str, int] = {}
+        self._lock = threading.RLock()
+
+    def __repr__(self) -> str:
+        return f"NetCDFHandlePool(max_open_files={self.max_open_files}, open_files={len(self)})"
+
+    def __len__(self) -> int:
+        return len(self._handles)
+
+    def __contains__(self, filename: str) -> bool:
+        return abspath(expanduser(filename)) in self._handles
+
+    @contextmanager
+    def open(self, filename: str) -> Iterator[netCDF4.Dataset]:
+        """
+        Check out an open read-only handle for a NetCDF file.
+
+        The handle stays open after the `with` block exits so that later reads can reuse it.
+        The calling thread holds the lock of the handle until the `with` block exits, so temporary
+        state changes such as `set_auto_mask` are not seen by other threads, but callers must not close
+        the handle or leave persistent state changes on it.
+
+        Args:
+            filename (str): Path to the NetCDF file.
+
+        Yields:
+            netCDF4.Dataset: Open dataset handle.
+        """
+        filename = abspath(expanduser(filename))
+        stat = os.stat(filename)
+        signature = (stat.st_size, stat.st_mtime_ns)
+
+        with self._lock:
+            entry = self._handles.get(filename)
+
+            if entry is not None:
+                ds, cached_signature, _ = entry
+
+                # reopen the file if it was replaced on disk, unless another caller is still reading it
+                if (cached_signature != signature or not ds.isopen()) and not self._in_use.get(filename):
+                    self._close(filename)
+                    entry = None
+
+            if entry is None:
+                entry = (netCDF4.Dataset(filename, "r"), signature, threading.RLock())
+                self._handles[filename] = entry
+
+            ds, _, handle_lock = entry
+
+            self._handles.move_to_end(filename)
+            self._in_use[filename] = self._in_use.get(filename, 0) + 1
+
+        try:
+            # wait for the handle outside the pool lock, the checkout count keeps it from being closed meanwhile
+            with handle_lock:
+                yield ds
+        finally:
+            with self._lock:
+                self._in_use[filename] -= 1
+
+                if self._in_use[filename] == 0:
+                    del self._in_use[filename]
+
+                self._evict()
+
+    def _close(self, filename: str) -> None:
+        ds, _, _ = self._handles.pop(filename)
+
+        if ds.isopen():
+            ds.close()
+
+    def _evict(self) -> None:
+        # close least-recently-used idle handles until the pool is within its limit
+        for filename in list(self._handles.keys()):
+            if len(self._handles) <= self.max_open_files:
+                break
+
+            if self._in_use.get(filename):
+                continue
+
+            self._close(filename)
+
+    def close(self, filename: str = None) -> None:
+        """
+        Close pooled handles that are not currently checked out.
+
+        Args:
+            filename (str, optional): Close only the handle for this file. Defaults to None (all idle handles).
+        """
+        with self._lock:
+            if filename is None:
+                filenames = list(self._handles.keys())
+            else:
+                filenames = [abspath(expanduser(filename))]
+
+            for filename in filenames:
+                if filename in self._handles and not self._in_use.get(filename):
+                    self._close(filename)
+
+NETCDF_HANDLE_POOL = NetCDFHandlePool()
+
+def open_netcdf(filename: str):
+    """
+    Check out a pooled read-only `netCDF4.Dataset` handle for use in a `with` statement.
+
+    Args:
+        filename (str): Path to the NetCDF file.
+
+    Returns:
+        contextmanager: Context manager yielding the open dataset.
+    """
+    return NETCDF_HANDLE_POOL.open(filename)
+
+def close_netcdf_handles(filename: str = None) -> None:
+    """
+    Close idle pooled NetCDF handles, for example before deleting or replacing downloaded files.
+
+    Args:
+        filename (str, optional): Close only the handle for this file. Defaults to None (all idle handles).
+    """
+    NETCDF_HANDLE_POOL.close(filename)
+
+atexit.register(close_netcdf_handles)
@@ -0,0 +1,38 @@
+from typing import Union
+
+import numpy as np
+
+from .constants import *
+
+def ortho_fill_value(dtype: np.dtype, fill_value: Union[int, float] = FILL_VALUE) -> Union[int, float, bool]:
+    """
+    Return the fill value for unmapped orthorectified pixels of a given dtype.
+
+    Floating-point outputs use NaN. Other dtypes use `fill_value` when it fits, otherwise a sentinel
+    the dtype can represent: False for booleans, the maximum for unsigned integers and the minimum for
+    signed integers.
+
+    Parameters:
+        dtype (np.dtype): Output dtype.
+        fill_value (int or float, optional): Preferred fill value. Defaults to FILL_VALUE.
+
+    Returns:
+        The fill value to use for the dtype.
+    """
+    dtype = np.dtype(dtype)
+
+    if np.issubdtype(dtype, np.floating):
+        return np.nan
+
+    if dtype == np.bool_:
+        return False
+
+    if np.issubdtype(dtype, np.integer):
+        info = np.iinfo(dtype)
+
+        if float(fill_value).is_integer() and info.min <= fill_value <= info.max:
+            return int(fill_value)
+
+        return int(info.max) if info.min == 0 else int(info.min)
+
+    raise ValueError(f"unsupported dtype for orthorectification: {dtype}")
@@ -1,24 +1,36 @@
 import numpy as np
 import xarray as xr
+# registers the .rio accessor used to write the CRS
+import rioxarray
 from rasterio.windows import Window
 
 from .constants import *
 from .extract_GLT_array_from_dataset import extract_GLT_array_from_dataset
-from .apply_geometry_lookup_table import apply_GLT
+from .ortho_fill_value import ortho_fill_value
+from .OrthoPlan import OrthoPlan
 from .get_pixel_center_coords import get_pixel_center_coords
 
 def ortho_xr(
     swath_ds: xr.Dataset,
     GLT_array: np.ndarray = None,
     GLT_nodata_value: int = GLT_NODATA_VALUE,
-    fill_value: int = FILL_VALUE) -> xr.Dataset:
+    fill_value: int = FILL_VALUE,
+    plan: OrthoPlan = None,
+    preserve_dtype: bool = False,
+    workers: int = 1,
+    grid_window: Window = None) -> xr.Dataset:
     """
-    This function uses `apply_GLT` to create an orthorectified xarray dataset.
+    This function uses an `OrthoPlan` to create an orthorectified xarray dataset, gathering the variables
+    and the elevation that share an output dtype together in one stacked gather.
 
     Parameters:
     swath_ds: an xarray dataset produced by emit_xarray
     GLT_nodata_value: no data value for the GLT tables, 0 by default
     fill_value: the fill value for EMIT datasets, -9999 by default
+    preserve_dtype: keep the dtype of each variable (e.g. uint8 masks) instead of converting to float32
+    plan: a precomputed OrthoPlan for the GLT and swath shape, built once here and shared by every variable if not given
+    workers: the number of threads gathering the variables, one per CPU if None
+    grid_window: window of the grid covered by GLT_array, the whole grid if None
 
     Returns:
     ortho_ds: an orthocorrected xarray dataset.
@@ -27,6 +39,15 @@ def ortho_xr(
         # extract GLT
         GLT_array = extract_GLT_array_from_dataset(swath_dataset=swath_ds)
 
+    # Build the gather indices once for every variable and the elevation
+    if plan is None:
+        swath_shape = (swath_ds.sizes["downtrack"], swath_ds.sizes["crosstrack"])
+
+        if hasattr(GLT_array, "ortho_plan") and GLT_array.GLT_nodata_value == GLT_nodata_value:
+            plan = GLT_array.ortho_plan(swath_shape)
+        else:
+            plan = OrthoPlan.from_GLT(GLT_array, swath_shape=swath_shape, GLT_nodata_value=GLT_nodata_value)
+
     # List Variables
     var_list = list(swath_ds.data_vars)
 
@@ -34,37 +55,50 @@ def ortho_xr(
     if "flat_field_update" in var_list:
         var_list.remove("flat_field_update")
 
-    # Create empty dictionary for orthocorrected data vars
-    data_vars = {}
-
-    # Extract Rawspace Dataset Variable Values (Typically Reflectance)
-    for var in var_list:
-        swath_array = swath_ds[var].data
-        swath_dimensions = swath_ds[var].dims
-
-        # Apply GLT to dataset
-        out_ds = apply_GLT(
-            swath_array, 
-            GLT_array, 
-            GLT_nodata_value=GLT_nodata_value
+    # Stack every variable and the elevation that share an output dtype and fill value, so each group
+    # is orthorectified with one allocation and one pass over the plan instead of one gather per variable
+    arrays = {var: (swath_ds[var].data, FILL_VALUE) for var in var_list}
+    arrays["elev"] = (swath_ds["elev"].data, fill_value)
+    groups = {}
+
+    for name, (swath_array, group_fill_value) in arrays.items():
+        dtype = np.dtype(swath_array.dtype if preserve_dtype else np.float32)
+        key = (dtype, ortho_fill_value(dtype, group_fill_value) if preserve_dtype else group_fill_value)
+        groups.setdefault(key, []).append(name)
+
+    ortho_arrays = {}
+
+    for (dtype, group_fill_value), names in groups.items():
+        stacked = plan.apply_stacked(
+            [arrays[name][0] for name in names],
+            fill_value=group_fill_value,
+            dtype=dtype,
+            workers=workers
         )
 
-        # Update variables - Only works for 2 or 3 dimensional arrays
-        if swath_array.ndim == 2:
-            out_ds = out_ds.squeeze()
-            data_vars[var] = (["latitude", "longitude"], out_ds)
-        else:
-            data_vars[var] = (["latitude", "longitude", swath_dimensions[-1]], out_ds)
+        # Replace any fill value of -9999 with np.nan once for the whole group (float outputs only)
+        if np.issubdtype(dtype, np.floating):
+            stacked[stacked == FILL_VALUE] = np.nan
 
-        del swath_array
+        band_start = 0
 
-    # Calculate Lat and Lon Vectors
-    lon, lat = get_pixel_center_coords(swath_ds)
+        for name in names:
+            swath_array = arrays[name][0]
+            band_count = swath_array.shape[2] if swath_array.ndim == 3 else 1
+            ortho_arrays[name] = stacked[..., band_start:band_start + band_count]
+            band_start += band_count
 
-    # Apply GLT to elevation
-    elev_array = swath_ds["elev"].data
+    # Create dictionary for orthocorrected data vars - Only works for 2 or 3 dimensional arrays
+    data_vars = {}
 
-    elev_ds = apply_GLT(elev_array, GLT_array, fill_value=fill_value)
+    for var in var_list:
+        if swath_ds[var].ndim == 2:
+            data_vars[var] = (["latitude", "longitude"], ortho_arrays[var][..., 0])
+        else:
+            data_vars[var] = (["latitude", "longitude", swath_ds[var].dims[-1]], ortho_arrays[var])
+
+    # Calculate Lat and Lon Vectors
+    lon, lat = get_pixel_center_coords(swath_ds, grid_window=grid_window)
 
     # Delete glt_ds - no longer needed
     del GLT_array
@@ -81,13 +115,11 @@ def ortho_xr(
         del coords[key]
 
     # Add Orthocorrected Elevation
-    coords["elev"] = (["latitude", "longitude"], np.squeeze(elev_ds))
+    coords["elev"] = (["latitude", "longitude"], ortho_arrays["elev"][..., 0])
 
     # Build Output xarray Dataset and assign data_vars array attributes
     ortho_ds = xr.Dataset(data_vars=data_vars, coords=coords, attrs=swath_ds.attrs)
 
-    del out_ds
-
     # Assign Attributes from Original Datasets
     for var in var_list:
         ortho_ds[var].attrs = swath_ds[var].attrs
@@ -0,0 +1,72 @@
+from typing import Optional
+
+import numpy as np
+from affine import Affine
+from rasterio.windows import Window
+from rasters import RasterGrid
+
+from .chunk_row_blocks import chunk_row_blocks
+from .constants import *
+from .compact_GLT_dtype import compact_GLT_dtype
+from .GLT import GeometryLookupTable
+from .netcdf_auto_mask import netcdf_auto_mask
+from .netcdf_handle_pool import open_netcdf
+
+def read_GLT(
+        filename: str,
+        window: Window = None,
+        GLT_nodata_value: int = GLT_NODATA_VALUE,
+        dtype: Optional[np.dtype] = None) -> GeometryLookupTable:
+    """
+    Read the Geometry Lookup Table (GLT) of an EMIT NetCDF file and its grid through a single file handle.
+
+    Both index variables are read for the window straight into one preallocated (rows, cols, 2) buffer,
+    one block of rows at a time, and the grid is derived from the `geotransform` attribute and the
+    dimensions of the same handle, so the file is opened once instead of once per variable and per grid lookup.
+
+    Parameters
+    ----------
+    filename : str
+        EMIT NetCDF file containing 'glt_x' and 'glt_y' arrays in the 'location' group.
+    window : Window, optional
+        Grid window of the GLT to read.
+    GLT_nodata_value : int, optional
+        Value marking missing GLT indices (default: GLT_NODATA_VALUE).
+    dtype : np.dtype, optional
+        Integer dtype of the GLT. Defaults to `compact_GLT_dtype` of the swath, uint16 for EMIT scenes.
+
+    Returns
+    -------
+    GeometryLookupTable
+        GLT of 1-based (row, column) = (glt_y, glt_x) pairs on the grid of the window, missing values 0.
+    """
+    with open_netcdf(filename) as ds:
+        location = ds.groups["location"]
+        variables = (location.variables["glt_y"], location.variables["glt_x"])
+
+        if dtype is None:
+            dtype = compact_GLT_dtype(len(ds.dimensions["downtrack"]), len(ds.dimensions["crosstrack"]))
+
+        grid_rows, grid_cols = variables[0].shape
+        geotransform = ds.getncattr("geotransform")
+
+        if window is None:
+            window = Window(col_off=0, row_off=0, width=grid_cols, height=grid_rows)
+
+        row_off, col_off = int(window.row_off), int(window.col_off)
+        height, width = int(window.height), int(window.width)
+        GLT_array = np.empty((height, width, 2), dtype=dtype)
+
+        for index, variable in enumerate(variables):
+            # the nodata value is stored as-is, so no masked intermediate is needed
+            with netcdf_auto_mask(variable, False):
+                # align the row blocks to the on-disk chunks so that every chunk is decompressed once
+                for row, block_end in chunk_row_blocks(variable, row_off, height):
+                    GLT_array[row - row_off:block_end - row_off, :, index] = variable[row:block_end, col_off:col_off + width]
+
+    grid = RasterGrid.from_affine(affine=Affine.from_gdal(*geotransform), rows=grid_rows, cols=grid_cols)
+
+    if (row_off, col_off, height, width) != (0, 0, grid_rows, grid_cols):
+        grid = grid.subset(window)
+
+    return GeometryLookupTable(GLT_array=GLT_array, geometry=grid, GLT_nodata_value=GLT_nodata_value)
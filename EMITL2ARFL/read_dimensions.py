@@ -1,4 +1,4 @@
-import netCDF4
+from .netcdf_handle_pool import open_netcdf
 
 def read_dimensions(filename: str) -> dict[str, int]:
     """
@@ -11,5 +11,5 @@ def read_dimensions(filename: str) -> dict[str, int]:
     Returns:
         dict[str, int]: Dictionary where keys are dimension names and values are sizes.
     """
-    with netCDF4.Dataset(filename, 'r') as ds:
+    with open_netcdf(filename) as ds:
         return {dim_name: len(dim) for dim_name, dim in ds.dimensions.items()}
@@ -0,0 +1,100 @@
+from typing import Dict, Optional, Sequence, Tuple
+
+import netCDF4
+import numpy as np
+import xarray as xr
+from rasterio.windows import Window
+
+from .netcdf_handle_pool import open_netcdf
+from .select_bands import band_index_slices
+
+def _read_group(
+        group: netCDF4.Group,
+        indexers: Dict[str, slice],
+        band_indices: Optional[Sequence[int]] = None) -> xr.Dataset:
+    # read every variable of a group as raw values and leave the CF decoding to xarray,
+    # so the result matches what xr.open_dataset produces for the same selection
+    variables = {}
+
+    for name, variable in group.variables.items():
+        previous_mask, previous_scale = variable.mask, variable.scale
+        variable.set_auto_maskandscale(False)
+
+        try:
+            index = tuple(indexers.get(dimension, slice(None)) for dimension in variable.dimensions)
+
+            if band_indices is not None and "bands" in variable.dimensions:
+                axis = variable.dimensions.index("bands")
+                blocks = []
+
+                # read the selected bands as contiguous hyperslabs instead of the whole band range
+                for band_slice in band_index_slices(band_indices):
+                    blocks.append(variable[index[:axis] + (band_slice,) + index[axis + 1:]])
+
+                data = np.concatenate(blocks, axis=axis)
+            else:
+                data = variable[index]
+        finally:
+            variable.set_auto_mask(previous_mask)
+            variable.set_auto_scale(previous_scale)
+
+        data = np.asarray(data)
+
+        if variable.dtype is str:
+            # variable-length strings come back as objects, which xarray loads as fixed-width unicode
+            data = data.astype(str)
+
+        attrs = {key: variable.getncattr(key) for key in variable.ncattrs()}
+        variables[name] = xr.Variable(variable.dimensions, data, attrs=attrs)
+
+    dataset = xr.Dataset(variables, attrs={key: group.getncattr(key) for key in group.ncattrs()})
+
+    # the decoded values are already in memory, so loading only materializes the decoding
+    return xr.decode_cf(dataset).load()
+
+def read_emit_window(
+        filename: str,
+        swath_window: Window,
+        wavelength_group: Optional[str] = None,
+        good_bands_only: bool = False) -> Tuple[xr.Dataset, xr.Dataset, Optional[xr.Dataset]]:
+    """
+    Read the root, 'location' and wavelength groups of an EMIT NetCDF file for a swath window through one file handle.
+
+    This is the in-memory counterpart of opening each group with `xr.open_dataset` and loading a windowed
+    subset: every variable is read as one hyperslab per contiguous run of bands and decoded by xarray,
+    without building a dask graph or reopening the file for each group.
+
+    Parameters:
+    filename: path to an EMIT NetCDF file
+    swath_window: window of the swath to read, in (downtrack, crosstrack) pixels
+    wavelength_group: group holding the band coordinates, e.g. 'sensor_band_parameters', or None to skip it
+    good_bands_only: drop the bands flagged as bad in `good_wavelengths` (water absorption bands) before reading the cube
+
+    Returns:
+    (dataset, location, wavelengths): the windowed root and location groups and the wavelength group, None if not requested
+    """
+    row_start = int(swath_window.row_off)
+    col_start = int(swath_window.col_off)
+    indexers = {
+        "downtrack": slice(row_start, row_start + int(swath_window.height)),
+        "crosstrack": slice(col_start, col_start + int(swath_window.width))
+    }
+
+    with open_netcdf(filename) as ds:
+        wavelengths = None
+        good_band_indices = None
+
+        if wavelength_group:
+            wavelengths = _read_group(ds.groups[wavelength_group], {})
+
+        if good_bands_only:
+            if wavelengths is None or "good_wavelengths" not in wavelengths:
+                raise ValueError(f"good_bands_only requires sensor_band_parameters/good_wavelengths: {filename}")
+
+            good_band_indices = np.flatnonzero(wavelengths["good_wavelengths"].values == 1)
+            wavelengths = wavelengths.isel(bands=good_band_indices)
+
+        dataset = _read_group(ds, indexers, band_indices=good_band_indices)
+        location = _read_group(ds.groups["location"], indexers)
+
+    return dataset, location, wavelengths
@@ -1,11 +1,12 @@
 from rasters import RasterGeolocation
 from .read_latitude_array import read_latitude_array
 from .read_longitude_array import read_longitude_array
+from .TiePointGeolocation import TiePointGeolocation
 
 from typing import Optional
 from rasterio.windows import Window
 
-def read_geolocation(filename: str, window: Optional[Window] = None) -> RasterGeolocation:
+def read_geolocation(filename: str, window: Optional[Window] = None, tie_point_step: Optional[int] = None) -> RasterGeolocation:
     """
     Reads the latitude and longitude arrays from a NetCDF reflectance file and constructs a RasterGeolocation object.
 
@@ -18,6 +19,8 @@ def read_geolocation(filename: str, window: Optional[Window] = None) -> RasterGe
         window (Optional[rasterio.windows.Window], optional):
             If provided, a rasterio Window object specifying the subset (window) of the latitude and longitude arrays to read.
             The window must have attributes row_off, col_off, height, and width. If None, the entire arrays are read.
+        tie_point_step (Optional[int], optional):
+            If provided, compress the arrays into a TiePointGeolocation with a tie point every `tie_point_step` pixels.
 
     Returns:
         RasterGeolocation: An object containing the longitude (x) and latitude (y) arrays for georeferencing.
@@ -29,5 +32,9 @@ def read_geolocation(filename: str, window: Optional[Window] = None) -> RasterGe
     # Create a RasterGeolocation object using the longitude and latitude arrays
     geolocation = RasterGeolocation(x=lon, y=lat)
 
+    if tie_point_step is not None:
+        # keep only the tie points, letting the full-resolution arrays be released
+        geolocation = TiePointGeolocation.from_geolocation(geolocation, step=tie_point_step)
+
     # Return the RasterGeolocation object for use in geospatial operations
     return geolocation
@@ -1,14 +1,23 @@
-
-from typing import Optional
-import netCDF4
+import logging
+from typing import Optional, Sequence, Tuple, Union
 import numpy as np
 from rasterio.windows import Window
 
+from .netcdf_handle_pool import open_netcdf
+from .read_netcdf_array_parallel import UnsupportedChunkLayout, read_netcdf_array_parallel
+from .select_bands import select_bands, band_index_slices
+
+logger = logging.getLogger(__name__)
+
 def read_netcdf_array(
     filename: str,
     variable: str,
     group: Optional[str] = None,
-    window: Optional[Window] = None
+    window: Optional[Window] = None,
+    bands: Optional[Union[int, slice, Sequence[int]]] = None,
+    wavelength_range: Optional[Tuple[float, float]] = None,
+    good_bands_only: bool = False,
+    workers: int = 1
 ) -> np.ndarray:
     """
     Read a variable array from a specified group or the root in a NetCDF file.
@@ -24,11 +33,22 @@ def read_netcdf_array(
     window : Optional[rasterio.windows.Window], default None
         If provided, must be a rasterio Window object specifying the subset (window) to read.
         The window must have attributes row_off, col_off, height, and width.
+    bands : Optional[Union[int, slice, Sequence[int]]], default None
+        Zero-based band indices to read from a 3-D (rows, cols, bands) variable. If None, all bands are read.
+    wavelength_range : Optional[Tuple[float, float]], default None
+        Inclusive (min, max) wavelength range in nanometers, resolved against `sensor_band_parameters/wavelengths`.
+    good_bands_only : bool, default False
+        If True, skip bands flagged as bad in `sensor_band_parameters/good_wavelengths`.
+    workers : int, default 1
+        Number of threads used to decompress the chunks of the selection. With more than one worker the
+        raw HDF5 chunks are decompressed in parallel straight into the output buffer; variables whose chunks
+        cannot be decoded that way fall back to the single-threaded netCDF4 read.
 
     Returns
     -------
     np.ndarray
         The requested array, or the specified subset if window is provided.
+        3-D arrays are returned as (bands, rows, cols) containing only the selected bands.
 
     Raises
     ------
@@ -36,26 +56,74 @@ def read_netcdf_array(
         If the group or variable does not exist in the NetCDF file.
     AttributeError
         If the window object does not have the required attributes.
+    ValueError
+        If a band selection is requested for a variable without a band dimension.
     """
-    # Open the NetCDF file for reading
-    with netCDF4.Dataset(filename, "r") as ds:
-        # Access the specified group and variable, or root if group is None
-        if group is None:
-            var = ds.variables[variable]
-        else:
-            var = ds.groups[group].variables[variable]
-        if window is not None:
-            # Ensure the window object has the required attributes
-            # (row_off, col_off, height, width)
-            row_off = int(window.row_off)
-            col_off = int(window.col_off)
-            height = int(window.height)
-            width = int(window.width)
-            # Read the specified window (subset) from the variable
-            arr = var[row_off:row_off+height, col_off:col_off+width]
-        else:
-            # Read the entire variable array
-            arr = var[:]
+    # Resolve the band selection to zero-based indices (None reads all bands)
+    band_indices = select_bands(
+        filename=filename,
+        bands=bands,
+        wavelength_range=wavelength_range,
+        good_bands_only=good_bands_only
+    )
+
+    arr = None
+
+    if workers > 1:
+        try:
+            # Decompress the raw chunks of the selection on a thread pool
+            arr = read_netcdf_array_parallel(
+                filename=filename,
+                variable=variable,
+                group=group,
+                window=window,
+                band_indices=band_indices,
+                workers=workers
+            )
+        except UnsupportedChunkLayout as e:
+            logger.debug(f"falling back to single-threaded read: {e}")
+
+    if arr is None:
+        # Check out a pooled handle for the NetCDF file
+        with open_netcdf(filename) as ds:
+            # Access the specified group and variable, or root if group is None
+            if group is None:
+                var = ds.variables[variable]
+            else:
+                var = ds.groups[group].variables[variable]
+            if window is not None:
+                # Ensure the window object has the required attributes
+                # (row_off, col_off, height, width)
+                row_off = int(window.row_off)
+                col_off = int(window.col_off)
+                height = int(window.height)
+                width = int(window.width)
+                row_slice = slice(row_off, row_off + height)
+                col_slice = slice(col_off, col_off + width)
+            else:
+                row_slice = slice(None)
+                col_slice = slice(None)
+
+            if band_indices is None and window is None:
+                # Read the entire variable array
+                arr = var[:]
+            elif band_indices is None:
+                # Read the specified window (subset) from the variable
+                arr = var[row_slice, col_slice]
+            else:
+                if var.ndim != 3:
+                    raise ValueError(f"variable {variable} has no band dimension to select from")
+
+                # Read each contiguous run of bands as its own hyperslab so only the selected bands are decompressed
+                band_slices = band_index_slices(band_indices)
+
+                if len(band_slices) == 1:
+                    arr = var[row_slice, col_slice, band_slices[0]]
+                else:
+                    arr = np.ma.concatenate(
+                        [var[row_slice, col_slice, band_slice] for band_slice in band_slices],
+                        axis=-1
+                    )
     # If the array has 3 dimensions, transpose from (rows, cols, bands) to (bands, rows, cols)
     if arr.ndim == 3:
         arr = np.transpose(arr, (2, 0, 1))
@@ -0,0 +1,231 @@
+from typing import List, Optional, Sequence, Tuple, Union
+import numpy as np
+from rasterio.windows import Window
+
+from .chunk_row_blocks import chunk_row_blocks
+from .constants import *
+from .netcdf_auto_mask import netcdf_auto_mask
+from .netcdf_handle_pool import open_netcdf
+from .select_bands import select_bands, band_index_slices
+
+def layout_shape(layout: str, rows: int, cols: int, bands: int) -> Tuple[int, int, int]:
+    """
+    Return the array shape of a (rows, cols, bands) cube in the given interleave layout.
+
+    Parameters
+    ----------
+    layout : str
+        "BSQ" for (bands, rows, cols), "BIP" for (rows, cols, bands) or "BIL" for (rows, bands, cols).
+    rows, cols, bands : int
+        Size of each dimension.
+
+    Returns
+    -------
+    Tuple[int, int, int]
+        Shape of the cube in the requested layout.
+    """
+    if layout == "BSQ":
+        return (bands, rows, cols)
+    elif layout == "BIP":
+        return (rows, cols, bands)
+    elif layout == "BIL":
+        return (rows, bands, cols)
+    else:
+        raise ValueError(f"unrecognized layout {layout}, must be one of {ARRAY_LAYOUTS}")
+
+def _column_runs(skip_row: np.ndarray, col_off: int, width: int, chunk_cols: int) -> List[Tuple[int, int, bool]]:
+    # (start, stop, skip) runs of the window columns, merging neighbouring chunks that are all read or all skipped
+    runs: List[Tuple[int, int, bool]] = []
+
+    for chunk in range(col_off // chunk_cols, (col_off + width - 1) // chunk_cols + 1):
+        start = max(col_off, chunk * chunk_cols)
+        stop = min(col_off + width, (chunk + 1) * chunk_cols)
+        skip = bool(skip_row[chunk])
+
+        if runs and runs[-1][2] == skip:
+            runs[-1] = (runs[-1][0], stop, skip)
+        else:
+            runs.append((start, stop, skip))
+
+    return runs
+
+def read_netcdf_array_into(
+    filename: str,
+    variable: str,
+    out: Optional[np.ndarray] = None,
+    group: Optional[str] = None,
+    window: Optional[Window] = None,
+    bands: Optional[Union[int, slice, Sequence[int]]] = None,
+    wavelength_range: Optional[Tuple[float, float]] = None,
+    good_bands_only: bool = False,
+    layout: str = "BSQ",
+    auto_mask: bool = False,
+    fill_to_nan: bool = True,
+    skip_chunks: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Read a variable from a NetCDF file into a caller-provided, C-contiguous buffer.
+
+    The variable is read in row blocks aligned to its on-disk chunks, so the only temporary
+    allocation is one block of rows, regardless of the size of the window or the output layout.
+
+    Parameters
+    ----------
+    filename : str
+        Path to the NetCDF file to read from.
+    variable : str
+        Name of the variable to read.
+    out : Optional[np.ndarray], default None
+        C-contiguous destination buffer. 2-D variables fill a (rows, cols) buffer and
+        3-D variables fill a buffer shaped by `layout`. If None, a buffer of the variable dtype is allocated.
+    group : Optional[str], default None
+        Name of the group containing the variable. If None, reads from the root group.
+    window : Optional[rasterio.windows.Window], default None
+        Spatial window (row_off, col_off, height, width) to read. If None, the whole variable is read.
+    bands : Optional[Union[int, slice, Sequence[int]]], default None
+        Zero-based band indices to read. If None, all bands are read.
+    wavelength_range : Optional[Tuple[float, float]], default None
+        Inclusive (min, max) wavelength range in nanometers to read.
+    good_bands_only : bool, default False
+        If True, skip bands flagged as bad in `sensor_band_parameters/good_wavelengths`.
+    layout : str, default "BSQ"
+        Interleave of the output for 3-D variables: "BSQ" (bands, rows, cols), "BIP" (rows, cols, bands)
+        or "BIL" (rows, bands, cols).
+    auto_mask : bool, default False
+        If True, let netCDF4 build masked arrays and write masked elements as NaN (floating-point outputs)
+        or the variable fill value (integer outputs). If False, raw values are copied without masking.
+    fill_to_nan : bool, default True
+        If True, replace the variable `_FillValue` with NaN in place. Only applies to floating-point outputs.
+    skip_chunks : Optional[np.ndarray], default None
+        (chunk rows, chunk cols) boolean array over the on-disk chunk grid of the whole variable, True for
+        chunks that are not needed. Their pixels are written as NaN (floating-point outputs) or the variable
+        fill value without being read or decompressed. Ignored for contiguous variables.
+
+    Returns
+    -------
+    np.ndarray
+        The filled output buffer.
+
+    Raises
+    ------
+    ValueError
+        If the buffer is not C-contiguous or its shape or layout does not match the selection,
+        or if `skip_chunks` does not match the chunk grid of the variable.
+    """
+    if layout not in ARRAY_LAYOUTS:
+        raise ValueError(f"unrecognized layout {layout}, must be one of {ARRAY_LAYOUTS}")
+
+    band_indices = select_bands(
+        filename=filename,
+        bands=bands,
+        wavelength_range=wavelength_range,
+        good_bands_only=good_bands_only
+    )
+
+    with open_netcdf(filename) as ds:
+        if group is None:
+            var = ds.variables[variable]
+        else:
+            var = ds.groups[group].variables[variable]
+
+        if var.ndim not in (2, 3):
+            raise ValueError(f"variable {variable} must be 2-D or 3-D, got {var.ndim} dimensions")
+
+        if window is not None:
+            row_off, col_off = int(window.row_off), int(window.col_off)
+            height, width = int(window.height), int(window.width)
+        else:
+            row_off, col_off = 0, 0
+            height, width = var.shape[:2]
+
+        if var.ndim == 3:
+            if band_indices is None:
+                band_indices = np.arange(var.shape[2])
+
+            band_slices = band_index_slices(band_indices)
+            shape = layout_shape(layout, height, width, len(band_indices))
+        elif band_indices is not None:
+            raise ValueError(f"variable {variable} has no band dimension to select from")
+        else:
+            band_slices = [None]
+            shape = (height, width)
+
+        if out is None:
+            out = np.empty(shape, dtype=var.dtype)
+
+        if out.shape != shape:
+            raise ValueError(f"output buffer shape {out.shape} does not match {layout if var.ndim == 3 else '2-D'} selection shape {shape}")
+
+        if not out.flags["C_CONTIGUOUS"]:
+            raise ValueError("output buffer must be C-contiguous")
+
+        floating = np.issubdtype(out.dtype, np.floating)
+        fill_value = getattr(var, "_FillValue", None)
+
+        chunking = var.chunking()
+        skipped_value = np.nan if floating else (fill_value if fill_value is not None else 0)
+
+        if skip_chunks is not None and isinstance(chunking, list):
+            chunk_grid = (-(-var.shape[0] // chunking[0]), -(-var.shape[1] // chunking[1]))
+
+            if skip_chunks.shape != chunk_grid:
+                raise ValueError(f"skip_chunks shape {skip_chunks.shape} does not match chunk grid {chunk_grid} of {variable}")
+        else:
+            skip_chunks = None
+
+        with netcdf_auto_mask(var, auto_mask):
+            # align the row blocks to the on-disk chunks so that every chunk is decompressed once
+            for row, block_end in chunk_row_blocks(var, row_off, height):
+                out_rows = slice(row - row_off, block_end - row_off)
+
+                if skip_chunks is None:
+                    column_runs = [(col_off, col_off + width, False)]
+                else:
+                    column_runs = _column_runs(skip_chunks[row // chunking[0]], col_off, width, chunking[1])
+
+                for col_start, col_stop, skip in column_runs:
+                    out_cols = slice(col_start - col_off, col_stop - col_off)
+                    band_offset = 0
+
+                    for band_slice in band_slices:
+                        if band_slice is None:
+                            if skip:
+                                out[out_rows, out_cols] = skipped_value
+                                continue
+
+                            block = var[row:block_end, col_start:col_stop]
+                        else:
+                            band_count = band_slice.stop - band_slice.start
+                            out_bands = slice(band_offset, band_offset + band_count)
+                            band_offset += band_count
+
+                            if skip:
+                                if layout == "BIP":
+                                    out[out_rows, out_cols, out_bands] = skipped_value
+                                elif layout == "BSQ":
+                                    out[out_bands, out_rows, out_cols] = skipped_value
+                                else:
+                                    out[out_rows, out_bands, out_cols] = skipped_value
+
+                                continue
+
+                            block = var[row:block_end, col_start:col_stop, band_slice]
+
+                        if np.ma.isMaskedArray(block):
+                            block = block.filled(np.nan if floating else fill_value)
+
+                        if fill_to_nan and floating and fill_value is not None:
+                            # the block is a private temporary, so the fill can be replaced in place
+                            block = block.astype(out.dtype, copy=False)
+                            block[block == fill_value] = np.nan
+
+                        if band_slice is None:
+                            out[out_rows, out_cols] = block
+                        elif layout == "BIP":
+                            out[out_rows, out_cols, out_bands] = block
+                        elif layout == "BSQ":
+                            out[out_bands, out_rows, out_cols] = np.transpose(block, (2, 0, 1))
+                        else:
+                            out[out_rows, out_bands, out_cols] = np.transpose(block, (0, 2, 1))
+
+    return out
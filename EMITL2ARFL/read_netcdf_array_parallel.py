@@ -0,0 +1,195 @@
+import logging
+import os
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from itertools import product
+from typing import Optional, Sequence
+
+import h5py
+import numpy as np
+from rasterio.windows import Window
+
+logger = logging.getLogger(__name__)
+
+# HDF5 filter identifiers that the parallel reader can decode itself
+H5Z_FILTER_DEFLATE = 1
+H5Z_FILTER_SHUFFLE = 2
+
+class UnsupportedChunkLayout(ValueError):
+    """
+    Raised when a variable cannot be decoded chunk by chunk outside of HDF5
+    (contiguous storage, unsupported filters or packed values).
+    """
+    pass
+
+def _decode_filters(dataset: h5py.Dataset) -> Sequence[int]:
+    plist = dataset.id.get_create_plist()
+    filters = [plist.get_filter(index)[0] for index in range(plist.get_nfilters())]
+    unsupported = [code for code in filters if code not in (H5Z_FILTER_DEFLATE, H5Z_FILTER_SHUFFLE)]
+
+    if unsupported:
+        raise UnsupportedChunkLayout(f"unsupported HDF5 filters {unsupported} on {dataset.name}")
+
+    # filters are applied in order on write, so they are undone in reverse order on read
+    return filters[::-1]
+
+def _decode_chunk(raw: bytes, filter_mask: int, filters: Sequence[int], dtype: np.dtype, chunk_shape: Sequence[int]) -> np.ndarray:
+    data = raw
+    pipeline_length = len(filters)
+
+    for position, code in enumerate(filters):
+        # bit i of the filter mask is set when the i-th filter of the write pipeline was skipped for this chunk
+        if filter_mask & (1 << (pipeline_length - 1 - position)):
+            continue
+
+        if code == H5Z_FILTER_DEFLATE:
+            # zlib releases the GIL while inflating, which is what makes the thread pool scale
+            data = zlib.decompress(data)
+        elif code == H5Z_FILTER_SHUFFLE:
+            data = np.frombuffer(data, dtype=np.uint8).reshape(dtype.itemsize, -1).T.tobytes()
+
+    return np.frombuffer(data, dtype=dtype).reshape(chunk_shape)
+
+def read_netcdf_array_parallel(
+    filename: str,
+    variable: str,
+    group: Optional[str] = None,
+    window: Optional[Window] = None,
+    band_indices: Optional[Sequence[int]] = None,
+    workers: Optional[int] = None
+) -> np.ma.MaskedArray:
+    """
+    Read a chunked, deflate-compressed variable by decompressing its raw HDF5 chunks on a thread pool.
+
+    Each worker reads the raw bytes of one chunk that intersects the window, decompresses and unshuffles
+    it, and copies the selected part straight into the output buffer. HDF5 itself only serves the raw
+    chunk reads, so decompression scales with the number of workers instead of running on one core.
+
+    Parameters
+    ----------
+    filename : str
+        Path to the NetCDF file to read from.
+    variable : str
+        Name of the variable to read.
+    group : Optional[str], default None
+        Name of the group containing the variable. If None, reads from the root group.
+    window : Optional[rasterio.windows.Window], default None
+        Spatial window (row_off, col_off, height, width) to read. If None, the whole variable is read.
+    band_indices : Optional[Sequence[int]], default None
+        Sorted, unique zero-based band indices of a 3-D variable to read. If None, all bands are read.
+    workers : Optional[int], default None
+        Number of decompression threads. If None, one per CPU.
+
+    Returns
+    -------
+    np.ma.MaskedArray
+        The selection in file order, (rows, cols) or (rows, cols, bands), with fill values masked.
+
+    Raises
+    ------
+    UnsupportedChunkLayout
+        If the variable is not chunked, uses filters other than deflate and shuffle, or is packed with
+        `scale_factor` or `add_offset`.
+    ValueError
+        If band indices are given for a variable without a band dimension.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    path = variable if group is None else f"{group}/{variable}"
+
+    with h5py.File(filename, "r") as file:
+        dataset = file[path]
+
+        if dataset.chunks is None:
+            raise UnsupportedChunkLayout(f"variable {path} is not chunked")
+
+        if "scale_factor" in dataset.attrs or "add_offset" in dataset.attrs:
+            raise UnsupportedChunkLayout(f"variable {path} is packed")
+
+        filters = _decode_filters(dataset)
+        dtype = dataset.dtype
+        chunk_shape = dataset.chunks
+        fill_value = dataset.attrs["_FillValue"][0] if "_FillValue" in dataset.attrs else None
+
+        if window is not None:
+            row_off, col_off = int(window.row_off), int(window.col_off)
+            height, width = int(window.height), int(window.width)
+        else:
+            row_off, col_off = 0, 0
+            height, width = dataset.shape[:2]
+
+        selection = [(row_off, row_off + height), (col_off, col_off + width)]
+
+        if dataset.ndim == 3:
+            if band_indices is None:
+                band_indices = np.arange(dataset.shape[2])
+
+            band_indices = np.asarray(band_indices, dtype=int)
+            selection.append((int(band_indices[0]), int(band_indices[-1]) + 1))
+            out_shape = (height, width, len(band_indices))
+        elif band_indices is not None:
+            raise ValueError(f"variable {variable} has no band dimension to select from")
+        else:
+            out_shape = (height, width)
+
+        out = np.empty(out_shape, dtype=dtype)
+
+        # enumerate the chunk origins that intersect the selection along every axis
+        chunk_origins = list(product(*[
+            range(start // size * size, stop, size)
+            for (start, stop), size
+            in zip(selection, chunk_shape)
+        ]))
+
+        if dataset.ndim == 3:
+            # skip band chunks that contain none of the selected bands
+            band_size = chunk_shape[2]
+            chunk_origins = [
+                origin for origin in chunk_origins
+                if np.any((band_indices >= origin[2]) & (band_indices < origin[2] + band_size))
+            ]
+
+        dataset_id = dataset.id
+
+        def read_chunk(origin) -> None:
+            chunk_info = dataset_id.get_chunk_info_by_coord(origin)
+
+            if chunk_info.byte_offset is None:
+                # the chunk was never written, so it holds the fill value
+                chunk = np.full(chunk_shape, fill_value if fill_value is not None else 0, dtype=dtype)
+            else:
+                filter_mask, raw = dataset_id.read_direct_chunk(origin)
+                chunk = _decode_chunk(raw, filter_mask, filters, dtype, chunk_shape)
+
+            row_start = max(origin[0], row_off)
+            row_stop = min(origin[0] + chunk_shape[0], row_off + height)
+            col_start = max(origin[1], col_off)
+            col_stop = min(origin[1] + chunk_shape[1], col_off + width)
+            chunk_rows = slice(row_start - origin[0], row_stop - origin[0])
+            chunk_cols = slice(col_start - origin[1], col_stop - origin[1])
+            out_rows = slice(row_start - row_off, row_stop - row_off)
+            out_cols = slice(col_start - col_off, col_stop - col_off)
+
+            if dataset.ndim == 2:
+                out[out_rows, out_cols] = chunk[chunk_rows, chunk_cols]
+            else:
+                # output positions of the selected bands that fall in this chunk
+                out_bands = np.flatnonzero((band_indices >= origin[2]) & (band_indices < origin[2] + chunk_shape[2]))
+                chunk_bands = band_indices[out_bands] - origin[2]
+                out[out_rows, out_cols, out_bands[0]:out_bands[-1] + 1] = chunk[chunk_rows, chunk_cols][..., chunk_bands]
+
+        logger.debug(f"decompressing {len(chunk_origins)} chunks of {path} on {workers} threads")
+
+        if workers > 1 and len(chunk_origins) > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                # list() propagates the first exception raised by a worker
+                list(executor.map(read_chunk, chunk_origins))
+        else:
+            for origin in chunk_origins:
+                read_chunk(origin)
+
+    if fill_value is None:
+        return np.ma.masked_array(out)
+
+    return np.ma.masked_equal(out, fill_value, copy=False)
@@ -0,0 +1,165 @@
+from typing import Optional, Sequence, Tuple, Union
+
+import numpy as np
+import dask.array as da
+from dask.base import tokenize
+from dask.utils import SerializableLock
+from rasterio.windows import Window
+
+from .netcdf_auto_mask import netcdf_auto_mask
+from .netcdf_handle_pool import open_netcdf
+from .metadata_sidecar import read_netcdf_metadata
+from .select_bands import select_bands
+
+# HDF5 is not thread-safe, so reads issued by dask worker threads are serialized
+NETCDF_READ_LOCK = SerializableLock()
+
+class NetCDFVariableProxy:
+    """
+    Array-like view of a NetCDF variable that reads hyperslabs on demand through the pooled handles.
+
+    Only the filename and variable location are held, so the proxy is cheap to pickle and can be
+    handed to `dask.array.from_array` without opening or reading anything.
+    """
+    def __init__(
+            self,
+            filename: str,
+            variable: str,
+            group: Optional[str] = None,
+            fill_to_nan: bool = True) -> None:
+        """
+        Initialize a proxy for a NetCDF variable.
+
+        Args:
+            filename (str): Path to the NetCDF file.
+            variable (str): Name of the variable.
+            group (str, optional): Name of the group containing the variable. Defaults to None (root group).
+            fill_to_nan (bool, optional): Replace fill values with NaN for floating-point variables. Defaults to True.
+        """
+        self.filename = filename
+        self.variable = variable
+        self.group = group
+        self.fill_to_nan = fill_to_nan
+
+        key = variable if group is None else f"{group}/{variable}"
+        variable_metadata = read_netcdf_metadata(filename)["variables"][key]
+        self.shape = tuple(variable_metadata["shape"])
+        self.dtype = np.dtype(variable_metadata["dtype"])
+        self.chunks = variable_metadata["chunks"]
+        self.ndim = len(self.shape)
+
+    def __repr__(self) -> str:
+        return f"NetCDFVariableProxy(filename=\"{self.filename}\", variable=\"{self.variable}\", group={self.group!r}, shape={self.shape})"
+
+    def __getitem__(self, key) -> np.ndarray:
+        with open_netcdf(self.filename) as ds:
+            if self.group is None:
+                var = ds.variables[self.variable]
+            else:
+                var = ds.groups[self.group].variables[self.variable]
+
+            with netcdf_auto_mask(var, False):
+                block = np.asarray(var[key])
+
+            fill_value = getattr(var, "_FillValue", None)
+
+        if self.fill_to_nan and np.issubdtype(block.dtype, np.floating) and fill_value is not None:
+            block[block == fill_value] = np.nan
+
+        return block
+
+def read_netcdf_dask_array(
+    filename: str,
+    variable: str,
+    group: Optional[str] = None,
+    window: Optional[Window] = None,
+    bands: Optional[Union[int, slice, Sequence[int]]] = None,
+    wavelength_range: Optional[Tuple[float, float]] = None,
+    good_bands_only: bool = False,
+    qmask: Optional[Union[np.ndarray, da.Array]] = None,
+    fill_to_nan: bool = True,
+    chunks: Optional[Union[str, Tuple[int, ...]]] = None
+) -> da.Array:
+    """
+    Lazily read a variable from a NetCDF file as a dask array with chunks matching the on-disk HDF5 chunks.
+
+    Nothing is read until the array is computed, so windowing, band selection, quality masking and
+    reductions compose into a single graph that only touches the chunks it needs.
+
+    Parameters
+    ----------
+    filename : str
+        Path to the NetCDF file to read from.
+    variable : str
+        Name of the variable to read.
+    group : Optional[str], default None
+        Name of the group containing the variable. If None, reads from the root group.
+    window : Optional[rasterio.windows.Window], default None
+        Spatial window (row_off, col_off, height, width) to select.
+    bands : Optional[Union[int, slice, Sequence[int]]], default None
+        Zero-based band indices to select. If None, all bands are kept.
+    wavelength_range : Optional[Tuple[float, float]], default None
+        Inclusive (min, max) wavelength range in nanometers to select.
+    good_bands_only : bool, default False
+        If True, drop bands flagged as bad in `sensor_band_parameters/good_wavelengths`.
+    qmask : Optional[Union[np.ndarray, da.Array]], default None
+        (rows, cols) quality mask for the selected window, where True or 1 marks pixels to set to NaN.
+    fill_to_nan : bool, default True
+        Replace fill values with NaN for floating-point variables.
+    chunks : Optional[Union[str, Tuple[int, ...]]], default None
+        Override the chunking. If None, the on-disk chunk shape is used.
+
+    Returns
+    -------
+    dask.array.Array
+        Lazy array, transposed to (bands, rows, cols) for 3-D variables.
+    """
+    proxy = NetCDFVariableProxy(
+        filename=filename,
+        variable=variable,
+        group=group,
+        fill_to_nan=fill_to_nan
+    )
+
+    if chunks is None:
+        chunks = tuple(proxy.chunks) if proxy.chunks is not None else "auto"
+
+    array = da.from_array(
+        proxy,
+        chunks=chunks,
+        lock=NETCDF_READ_LOCK,
+        meta=np.empty((0,) * proxy.ndim, dtype=proxy.dtype),
+        name=f"netcdf-{variable}-{tokenize(filename, group, variable, chunks, fill_to_nan)}"
+    )
+
+    if window is not None:
+        row_off, col_off = int(window.row_off), int(window.col_off)
+        height, width = int(window.height), int(window.width)
+        array = array[row_off:row_off + height, col_off:col_off + width]
+
+    band_indices = select_bands(
+        filename=filename,
+        bands=bands,
+        wavelength_range=wavelength_range,
+        good_bands_only=good_bands_only
+    )
+
+    if band_indices is not None:
+        if array.ndim != 3:
+            raise ValueError(f"variable {variable} has no band dimension to select from")
+
+        array = array[..., band_indices]
+
+    if qmask is not None:
+        qmask = da.asarray(qmask).astype(bool)
+
+        if array.ndim == 3:
+            qmask = qmask[..., np.newaxis]
+
+        array = da.where(qmask, np.nan, array)
+
+    # If the array has 3 dimensions, transpose from (rows, cols, bands) to (bands, rows, cols)
+    if array.ndim == 3:
+        array = da.transpose(array, (2, 0, 1))
+
+    return array
@@ -0,0 +1,148 @@
+import logging
+from typing import Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .constants import *
+from .netcdf_auto_mask import netcdf_auto_mask
+from .netcdf_handle_pool import open_netcdf
+from .select_bands import band_index_slices
+
+logger = logging.getLogger(__name__)
+
+def _split_gaps(values: np.ndarray, max_gap: int) -> Iterator[np.ndarray]:
+    # positions of sorted values, split wherever consecutive values are more than max_gap apart
+    breaks = np.flatnonzero(np.diff(values) > max_gap) + 1
+    yield from np.split(np.arange(values.size), breaks)
+
+def pixel_hyperslabs(rows: np.ndarray, cols: np.ndarray, max_gap: int = PIXEL_READ_MAX_GAP) -> Iterator[Tuple[slice, slice, np.ndarray]]:
+    """
+    Coalesce scattered pixels into the rectangular hyperslabs that cover them.
+
+    Pixels are sorted by row and split where the rows are more than `max_gap` apart, then each run is
+    sorted by column and split where the columns are more than `max_gap` apart, so nearby pixels share
+    one read and distant pixels never pull in the area between them.
+
+    Parameters
+    ----------
+    rows, cols : np.ndarray
+        Zero-based row and column of each pixel.
+    max_gap : int, default PIXEL_READ_MAX_GAP
+        Largest gap in rows or columns that is read through rather than split.
+
+    Yields
+    ------
+    Tuple[slice, slice, np.ndarray]
+        The row and column slices of a hyperslab and the positions of the pixels it covers.
+    """
+    rows = np.asarray(rows)
+    cols = np.asarray(cols)
+
+    if rows.size == 0:
+        return
+
+    row_order = np.argsort(rows, kind="stable")
+
+    for row_run in _split_gaps(rows[row_order], max_gap):
+        run = row_order[row_run]
+        col_order = run[np.argsort(cols[run], kind="stable")]
+
+        for col_run in _split_gaps(cols[col_order], max_gap):
+            members = col_order[col_run]
+            yield (
+                slice(int(rows[members].min()), int(rows[members].max()) + 1),
+                slice(int(cols[members].min()), int(cols[members].max()) + 1),
+                members
+            )
+
+def read_netcdf_pixels(
+    filename: str,
+    variable: str,
+    rows: Sequence[int],
+    cols: Sequence[int],
+    group: Optional[str] = None,
+    band_indices: Optional[Sequence[int]] = None,
+    dtype: Optional[np.dtype] = None,
+    fill_to_nan: bool = True,
+    max_gap: int = PIXEL_READ_MAX_GAP
+) -> np.ndarray:
+    """
+    Read the values of a variable at scattered pixels, reading only the hyperslabs around the pixels.
+
+    The pixels are coalesced with `pixel_hyperslabs`, so the amount of data read scales with the
+    number of pixels rather than with the area they span.
+
+    Parameters
+    ----------
+    filename : str
+        Path to the NetCDF file to read from.
+    variable : str
+        Name of the 2-D (rows, cols) or 3-D (rows, cols, bands) variable to read.
+    rows, cols : Sequence[int]
+        Zero-based row and column of each pixel.
+    group : Optional[str], default None
+        Name of the group containing the variable. If None, reads from the root group.
+    band_indices : Optional[Sequence[int]], default None
+        Sorted, unique zero-based band indices of a 3-D variable to read. If None, all bands are read.
+    dtype : Optional[np.dtype], default None
+        Output dtype. Defaults to the variable dtype.
+    fill_to_nan : bool, default True
+        If True, replace the variable `_FillValue` with NaN. Only applies to floating-point outputs.
+    max_gap : int, default PIXEL_READ_MAX_GAP
+        Largest gap in rows or columns between pixels that is read through rather than split.
+
+    Returns
+    -------
+    np.ndarray
+        (pixels,) values for 2-D variables or (pixels, bands) values for 3-D variables, in the order of the pixels.
+    """
+    rows = np.atleast_1d(np.asarray(rows, dtype=np.int64))
+    cols = np.atleast_1d(np.asarray(cols, dtype=np.int64))
+
+    if rows.shape != cols.shape:
+        raise ValueError(f"rows and cols must have the same shape, got {rows.shape} and {cols.shape}")
+
+    with open_netcdf(filename) as ds:
+        var = ds.variables[variable] if group is None else ds.groups[group].variables[variable]
+
+        if var.ndim not in (2, 3):
+            raise ValueError(f"variable {variable} must be 2-D or 3-D, got {var.ndim} dimensions")
+
+        if var.ndim == 3:
+            if band_indices is None:
+                band_indices = np.arange(var.shape[2])
+
+            band_indices = np.asarray(band_indices, dtype=int)
+            band_slices = band_index_slices(band_indices)
+            out = np.empty((rows.size, band_indices.size), dtype=dtype or var.dtype)
+        elif band_indices is not None:
+            raise ValueError(f"variable {variable} has no band dimension to select from")
+        else:
+            band_slices = [None]
+            out = np.empty(rows.size, dtype=dtype or var.dtype)
+
+        fill_value = getattr(var, "_FillValue", None)
+        hyperslab_count = 0
+
+        with netcdf_auto_mask(var, False):
+            for row_slice, col_slice, members in pixel_hyperslabs(rows, cols, max_gap=max_gap):
+                hyperslab_count += 1
+                member_rows = rows[members] - row_slice.start
+                member_cols = cols[members] - col_slice.start
+                band_offset = 0
+
+                for band_slice in band_slices:
+                    if band_slice is None:
+                        out[members] = var[row_slice, col_slice][member_rows, member_cols]
+                    else:
+                        band_count = band_slice.stop - band_slice.start
+                        block = var[row_slice, col_slice, band_slice]
+                        out[members, band_offset:band_offset + band_count] = block[member_rows, member_cols]
+                        band_offset += band_count
+
+    logger.debug(f"read {rows.size} pixels of {variable} from {filename} in {hyperslab_count} hyperslabs")
+
+    if fill_to_nan and np.issubdtype(out.dtype, np.floating) and fill_value is not None:
+        out[out == fill_value] = np.nan
+
+    return out
@@ -1,14 +1,16 @@
 from typing import List
 
 import numpy as np
-from typing import Optional
+from typing import Optional, Sequence, Tuple, Union
 from rasterio.windows import Window
 import rasters as rt
 from rasters import Raster, MultiRaster, RasterGeometry
 
 from .constants import *
-from .read_netcdf_array import read_netcdf_array
+from .read_netcdf_array_into import read_netcdf_array_into
 from .read_geolocation import read_geolocation
+from .SwathResampler import SwathResampler
+from .swath_footprint_index import geometry_swath_window
 from .read_qmask import read_qmask
 from .apply_qmask import apply_qmask
 
@@ -19,7 +21,13 @@ def read_netcdf_raster(
     geometry: Optional[RasterGeometry] = None,
     swath_window: Optional[Window] = None,
     qmask: Optional[np.ndarray] = None,
-    resampling: str = "nearest"
+    resampling: str = "nearest",
+    bands: Optional[Union[int, slice, Sequence[int]]] = None,
+    wavelength_range: Optional[Tuple[float, float]] = None,
+    good_bands_only: bool = False,
+    tie_point_step: Optional[int] = None,
+    resampler: Optional[SwathResampler] = None,
+    skip_chunks: Optional[np.ndarray] = None
 ) -> Raster:
     """
     Read a variable array from a NetCDF file and return as a rasters.Raster object with geolocation, supporting spatial subsetting.
@@ -38,34 +46,62 @@ def read_netcdf_raster(
         If provided, must be a rasterio Window object specifying the spatial subset (window) to read. Takes precedence over geometry.
     resampling : str, default "nearest"
         Resampling method to use if geometry is provided and a reprojection or resampling is needed.
+    bands : Optional[Union[int, slice, Sequence[int]]], default None
+        Zero-based band indices to read. If None, all bands are read.
+    wavelength_range : Optional[Tuple[float, float]], default None
+        Inclusive (min, max) wavelength range in nanometers to read.
+    good_bands_only : bool, default False
+        If True, skip bands flagged as bad in `sensor_band_parameters/good_wavelengths`.
+    tie_point_step : Optional[int], default None
+        If provided, attach a compact TiePointGeolocation with a tie point every `tie_point_step` pixels
+        instead of the full-resolution geolocation arrays.
+    resampler : Optional[SwathResampler], default None
+        If provided, a precomputed nearest-neighbour resampler onto its target grid. The data is read from the
+        swath window of the resampler and gathered onto the grid, without reading the geolocation.
+    skip_chunks : Optional[np.ndarray], default None
+        If provided, a (chunk rows, chunk cols) boolean array over the on-disk chunk grid of the variable, True for
+        chunks that are not needed, such as fully clouded chunks. They are filled with NaN without being read.
 
     Returns
     -------
     Raster
         The requested data as a Raster object with geolocation, optionally spatially subsetted.
     """
+    if resampler is not None:
+        # the resampler was built for its own swath window and target grid
+        swath_window = resampler.swath_window
+        geometry = resampler.geometry
+
     # If a window is not provided but a geometry is, compute the window from the geometry
     if swath_window is None and geometry is not None:
-        # read the scene geolocation
-        geolocation = read_geolocation(filename=filename)
-
-        # calculate the indices window that covers the target geometry
-        swath_window = geolocation.window(geometry)
+        # calculate the indices window that covers the target geometry from the cached footprint index,
+        # reading the geolocation only for the blocks that intersect the geometry
+        swath_window = geometry_swath_window(filename, geometry)
 
-    # Read the data array from the NetCDF file, using the window if provided
-    array = read_netcdf_array(
+    # Read the data array from the NetCDF file straight into a (bands, rows, cols) buffer,
+    # using the window if provided and converting fill values to NaN in place
+    array = read_netcdf_array_into(
         filename=filename,
         variable=variable,
         group=group,
-        window=swath_window
+        window=swath_window,
+        layout="BSQ",
+        bands=bands,
+        wavelength_range=wavelength_range,
+        good_bands_only=good_bands_only,
+        skip_chunks=skip_chunks
     )
 
     if qmask is not None:
         # apply qmask to data array
         array = apply_qmask(array=array, qmask=qmask)
 
+    if resampler is not None:
+        # a single gather onto the target grid replaces the geolocation read and the neighbour search
+        return MultiRaster(resampler.apply(array), geometry=resampler.geometry)
+
     # Read the geolocation, using the same window for spatial alignment
-    geolocation = read_geolocation(filename, window=swath_window)
+    geolocation = read_geolocation(filename, window=swath_window, tie_point_step=tie_point_step)
 
     # Wrap the data array and geolocation in a Raster object
     raster = MultiRaster(array, geometry=geolocation)
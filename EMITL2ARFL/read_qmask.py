@@ -1,57 +1,86 @@
 from typing import List
 import numpy as np
-import xarray as xr
 from rasterio.windows import Window
 
-from rasters import RasterGeometry
-
+from .chunk_row_blocks import chunk_row_blocks
 from .constants import *
+from .netcdf_auto_mask import netcdf_auto_mask
+from .netcdf_handle_pool import open_netcdf
 
 def read_qmask(
-        filename: str, 
+        filename: str,
         window: Window = None,
-        quality_bands: List[str] = QUALITY_BANDS, 
+        quality_bands: List[str] = QUALITY_BANDS,
         engine: str = ENGINE) -> np.ndarray:
     """
     This function builds a single layer mask to apply based on the bands selected from an EMIT L2A Mask file.
 
+    Only the contiguous range of mask bands covering `quality_bands` is read, one block of rows at a time
+    through a pooled netCDF4 handle, and the flags are combined with an in-place logical OR, so neither
+    the whole mask cube nor a (rows, cols, bands) float intermediate is ever held in memory.
+
     Parameters:
     filepath: an EMIT L2A Mask netCDF file.
+    window: the swath window to read, the whole swath if None.
     quality_bands: a list of bands (quality flags only) from the mask file that should be used in creation of  mask.
+    engine: kept for compatibility, the mask is always read with netCDF4.
 
     Returns:
     qmask: a numpy array that can be used with the emit_xarray function to apply a quality mask.
+        1 where any selected flag is set, 0 where none is, NaN where the mask holds its fill value.
     """
-    # Open Dataset
-    mask_ds = xr.open_dataset(filename, engine=ENGINE)
-
-    # Open Sensor band Group
-    mask_parameters_ds = xr.open_dataset(
-        filename,
-        engine=engine,
-        group="sensor_band_parameters"
-    )
-
-    # Print Flags used
-    flags_used = mask_parameters_ds["mask_bands"].data[quality_bands]
-
-    # Check for data bands and build mask
+    # Check for data bands
     if any(x in quality_bands for x in [5, 6]):
         err_str = f"Selected flags include a data band (5 or 6) not just flag bands"
-        
+
         raise AttributeError(err_str)
-    else:
-        if window is not None:
-            # window: Window(col_off, row_off, width, height)
-            row_off, col_off = int(window.row_off), int(window.col_off)
-            height, width = int(window.height), int(window.width)
-            qmask = np.sum(
-                mask_ds["mask"][row_off:row_off+height, col_off:col_off+width, quality_bands].values,
-                axis=-1
-            )
-        else:
-            qmask = np.sum(mask_ds["mask"][:, :, quality_bands].values, axis=-1)
-
-        qmask[qmask > 1] = 1
+
+    quality_bands = sorted(set(int(band) for band in quality_bands))
+
+    with open_netcdf(filename) as ds:
+        variable = ds.variables["mask"]
+        total_rows, total_cols, total_bands = variable.shape
+
+        if quality_bands[0] < 0 or quality_bands[-1] >= total_bands:
+            raise IndexError(f"quality bands {quality_bands} out of range for {total_bands} mask bands")
+
+        if window is None:
+            window = Window(col_off=0, row_off=0, width=total_cols, height=total_rows)
+
+        # window: Window(col_off, row_off, width, height)
+        row_off, col_off = int(window.row_off), int(window.col_off)
+        height, width = int(window.height), int(window.width)
+        band_start, band_stop = quality_bands[0], quality_bands[-1] + 1
+        # positions of the selected flags within the band range
+        band_positions = [band - band_start for band in quality_bands]
+        fill_value = getattr(variable, "_FillValue", None)
+
+        qmask = np.empty((height, width), dtype=np.float32)
+
+        # the fill value is detected on the raw values, so no masked intermediate is needed
+        with netcdf_auto_mask(variable, False):
+            # align the row blocks to the on-disk chunks so that every chunk is decompressed once
+            for row, block_end in chunk_row_blocks(variable, row_off, height):
+                block = variable[row:block_end, col_off:col_off + width, band_start:band_stop]
+
+                # EMIT writes the fill value to every band of a pixel, so the first flag marks missing pixels
+                first_band = block[..., band_positions[0]]
+                missing = np.isnan(first_band)
+
+                if fill_value is not None:
+                    missing |= first_band == fill_value
+
+                flagged = first_band != 0
+
+                for position in band_positions[1:]:
+                    # stop as soon as every pixel of the block is flagged
+                    if flagged.all():
+                        break
+
+                    np.logical_or(flagged, block[..., position] != 0, out=flagged)
+
+                block_mask = qmask[row - row_off:block_end - row_off]
+                block_mask[...] = flagged
+                block_mask[missing] = np.nan
 
     return qmask
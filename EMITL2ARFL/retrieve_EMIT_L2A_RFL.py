@@ -12,7 +12,8 @@ from .retrieve_EMIT_L2A_RFL_granule import retrieve_EMIT_L2A_RFL_granule
 def retrieve_EMIT_L2A_RFL(
         date_UTC: Union[date, datetime, str],
         geometry: Union[Point, Polygon, RasterGeometry],
-        download_directory: str = DOWNLOAD_DIRECTORY) -> MultiRaster:
+        download_directory: str = DOWNLOAD_DIRECTORY,
+        good_bands_only: bool = False) -> MultiRaster:
     search_results = search_EMIT_L2A_RFL_granules(
         start_UTC=date_UTC,
         end_UTC=date_UTC,
@@ -31,7 +32,11 @@ def retrieve_EMIT_L2A_RFL(
         in search_results
     ]
     
-    subset_cubes = [granule.reflectance(geometry=geometry) for granule in granules]
+    subset_cubes = [
+        granule.reflectance(geometry=geometry, good_bands_only=good_bands_only)
+        for granule
+        in granules
+    ]
     
     merged_cube = rt.mosaic(subset_cubes, geometry=geometry)
 
@@ -6,6 +6,7 @@ import earthaccess
 from .constants import *
 from .EMITL2ARFLGranule import EMITL2ARFLGranule
 from .find_EMIT_L2A_RFL_granule import find_EMIT_L2A_RFL_granule
+from .metadata_sidecar import read_netcdf_metadata
 
 def retrieve_EMIT_L2A_RFL_granule(
         remote_granule: earthaccess.search.DataGranule = None,
@@ -74,6 +75,10 @@ def retrieve_EMIT_L2A_RFL_granule(
     if missing_files:
         raise FileNotFoundError(f"The following required files do not exist: {missing_files}")
 
+    # index the granule metadata into sidecars so later scans and accessors do not reopen the files
+    for filename in (reflectance_filename, mask_filename, uncertainty_filename):
+        read_netcdf_metadata(filename)
+
     local_granule = EMITL2ARFLGranule(
         reflectance_filename=reflectance_filename,
         mask_filename=mask_filename,
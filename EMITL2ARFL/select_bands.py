@@ -0,0 +1,111 @@
+from typing import List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .metadata_sidecar import read_netcdf_metadata
+
+def select_bands(
+        filename: str,
+        bands: Optional[Union[int, slice, Sequence[int]]] = None,
+        wavelength_range: Optional[Tuple[float, float]] = None,
+        good_bands_only: bool = False) -> Optional[np.ndarray]:
+    """
+    Resolve a band selection against the `sensor_band_parameters` group of an EMIT NetCDF file.
+
+    Parameters
+    ----------
+    filename : str
+        Path to the NetCDF file.
+    bands : Optional[Union[int, slice, Sequence[int]]], default None
+        Zero-based band indices to select. If None, all bands are candidates.
+    wavelength_range : Optional[Tuple[float, float]], default None
+        Inclusive (min, max) wavelength range in nanometers, resolved against `wavelengths`.
+    good_bands_only : bool, default False
+        If True, drop bands flagged as bad in `good_wavelengths` (water absorption bands).
+
+    Returns
+    -------
+    Optional[np.ndarray]
+        Sorted, unique zero-based band indices, or None if no selection was requested.
+
+    Raises
+    ------
+    KeyError
+        If a wavelength-based selection is requested on a file without wavelength metadata.
+    ValueError
+        If the selection is out of range or does not match any band.
+    """
+    if bands is None and wavelength_range is None and not good_bands_only:
+        return None
+
+    # band count and wavelengths are served from the metadata index instead of reopening the file
+    metadata = read_netcdf_metadata(filename)
+    band_count = int(metadata["dimensions"]["bands"])
+    sensor_band_parameters = metadata["sensor_band_parameters"]
+
+    if (wavelength_range is not None or good_bands_only) and "wavelengths" not in sensor_band_parameters:
+        raise KeyError(f"no sensor_band_parameters/wavelengths in file: {filename}")
+
+    if wavelength_range is not None:
+        wavelengths = np.asarray(sensor_band_parameters["wavelengths"])
+
+    if good_bands_only:
+        good_wavelengths = np.asarray(sensor_band_parameters["good_wavelengths"])
+
+    selected = np.ones(band_count, dtype=bool)
+
+    if bands is not None:
+        if isinstance(bands, slice):
+            band_indices = np.arange(band_count)[bands]
+        else:
+            band_indices = np.atleast_1d(np.asarray(bands, dtype=int))
+
+        if np.any(band_indices < 0) or np.any(band_indices >= band_count):
+            raise ValueError(f"band indices must be within [0, {band_count}), got {band_indices.tolist()}")
+
+        requested = np.zeros(band_count, dtype=bool)
+        requested[band_indices] = True
+        selected &= requested
+
+    if wavelength_range is not None:
+        wavelength_min, wavelength_max = wavelength_range
+        selected &= (wavelengths >= wavelength_min) & (wavelengths <= wavelength_max)
+
+    if good_bands_only:
+        selected &= good_wavelengths == 1
+
+    band_indices = np.flatnonzero(selected)
+
+    if band_indices.size == 0:
+        raise ValueError(
+            f"band selection matches no bands: bands={bands}, "
+            f"wavelength_range={wavelength_range}, good_bands_only={good_bands_only}"
+        )
+
+    return band_indices
+
+def band_index_slices(band_indices: Sequence[int]) -> List[slice]:
+    """
+    Coalesce sorted band indices into the minimal list of contiguous slices (HDF5 hyperslabs).
+
+    Parameters
+    ----------
+    band_indices : Sequence[int]
+        Sorted, unique zero-based band indices.
+
+    Returns
+    -------
+    List[slice]
+        Contiguous slices covering exactly the given indices.
+    """
+    band_indices = np.asarray(band_indices, dtype=int)
+
+    if band_indices.size == 0:
+        return []
+
+    # split wherever consecutive indices are not adjacent
+    breaks = np.flatnonzero(np.diff(band_indices) != 1) + 1
+    starts = np.concatenate([[0], breaks])
+    stops = np.concatenate([breaks, [band_indices.size]])
+
+    return [slice(int(band_indices[start]), int(band_indices[stop - 1]) + 1) for start, stop in zip(starts, stops)]
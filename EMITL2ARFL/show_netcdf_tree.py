@@ -1,18 +1,16 @@
-import netCDF4
+from .netcdf_handle_pool import open_netcdf
 
 def show_netcdf_tree(filename, indent=0, group=None):
     """
     Recursively returns the structure of a NetCDF file as a tree string.
     """
-    lines = []
     if group is None:
-        ds = netCDF4.Dataset(filename, 'r')
-        group = ds
-        lines.append(f"File: {filename}")
-        close_ds = True
-    else:
-        ds = group
-        close_ds = False
+        # check out a pooled handle for the file and render it from the root group
+        with open_netcdf(filename) as ds:
+            return "\n".join([f"File: {filename}", show_netcdf_tree(filename, indent, ds)])
+
+    lines = []
+    ds = group
 
     prefix = "  " * indent
     # Dimensions
@@ -40,6 +38,4 @@ def show_netcdf_tree(filename, indent=0, group=None):
             lines.append(f"{prefix}  Group: {group_name}")
             lines.append(show_netcdf_tree(filename, indent + 2, subgroup))
 
-    if close_ds:
-        ds.close()
     return "\n".join(lines)
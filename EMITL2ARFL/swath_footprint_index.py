@@ -0,0 +1,203 @@
+import threading
+from os.path import abspath, expanduser
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+from rasterio.windows import Window
+from rasters import WGS84, RasterGeometry, wrap_geometry
+
+from .constants import *
+from .metadata_sidecar import read_netcdf_metadata
+from .read_netcdf_array import read_netcdf_array
+
+_FOOTPRINT_INDEX_CACHE: Dict[str, Tuple[Tuple[int, int], "SwathFootprintIndex"]] = {}
+_FOOTPRINT_INDEX_CACHE_LOCK = threading.Lock()
+
+def _read_clipped_lon_lat(filename: str, window: Optional[Window] = None) -> Tuple[np.ndarray, np.ndarray]:
+    # clip like RasterGeolocation so that the refined window matches geolocation.window exactly
+    lon = np.clip(np.asarray(read_netcdf_array(filename, "lon", group="location", window=window)), -180, 179.9999)
+    lat = np.clip(np.asarray(read_netcdf_array(filename, "lat", group="location", window=window)), -90, 90)
+
+    return lon, lat
+
+class SwathFootprintIndex:
+    """
+    Coarse index of the swath geolocation holding the longitude and latitude bounding box of each block of pixels.
+
+    A geometry is resolved to a swath window by testing its bounding box against the block bounds and
+    reading the `lat` and `lon` arrays only for the blocks that intersect it.
+    """
+    def __init__(
+            self,
+            filename: str,
+            block_size: int,
+            xmin: np.ndarray,
+            ymin: np.ndarray,
+            xmax: np.ndarray,
+            ymax: np.ndarray,
+            shape: Tuple[int, int]) -> None:
+        self.filename = filename
+        self.block_size = block_size
+        self.xmin = xmin
+        self.ymin = ymin
+        self.xmax = xmax
+        self.ymax = ymax
+        self.shape = tuple(shape)
+
+    def __repr__(self) -> str:
+        return f"SwathFootprintIndex(filename=\"{self.filename}\", shape={self.shape}, block_size={self.block_size})"
+
+    @classmethod
+    def build(cls, filename: str, block_size: int = GEOLOCATION_FOOTPRINT_BLOCK_SIZE) -> "SwathFootprintIndex":
+        """
+        Build the index from the full geolocation arrays of a NetCDF file.
+
+        Args:
+            filename (str): Path to a NetCDF file with `lat` and `lon` in the `location` group.
+            block_size (int, optional): Height and width of the index blocks in pixels.
+
+        Returns:
+            SwathFootprintIndex: Block bounds of the swath.
+        """
+        lon, lat = _read_clipped_lon_lat(filename)
+        rows, cols = lon.shape
+        row_starts = np.arange(0, rows, block_size)
+        col_starts = np.arange(0, cols, block_size)
+
+        def reduce_blocks(ufunc: np.ufunc, array: np.ndarray) -> np.ndarray:
+            return ufunc.reduceat(ufunc.reduceat(array, row_starts, axis=0), col_starts, axis=1)
+
+        return cls(
+            filename=filename,
+            block_size=block_size,
+            xmin=reduce_blocks(np.minimum, lon),
+            ymin=reduce_blocks(np.minimum, lat),
+            xmax=reduce_blocks(np.maximum, lon),
+            ymax=reduce_blocks(np.maximum, lat),
+            shape=(rows, cols)
+        )
+
+    def candidate_blocks(self, bbox: Tuple[float, float, float, float]) -> List[Window]:
+        """
+        List the blocks whose bounding box intersects a longitude/latitude bounding box.
+
+        Args:
+            bbox (Tuple[float, float, float, float]): (xmin, ymin, xmax, ymax) in WGS84.
+
+        Returns:
+            List[Window]: Swath windows of the intersecting blocks.
+        """
+        xmin, ymin, xmax, ymax = bbox
+        intersects = (self.xmin <= xmax) & (self.xmax >= xmin) & (self.ymin <= ymax) & (self.ymax >= ymin)
+        rows, cols = self.shape
+        blocks = []
+
+        for block_row, block_col in zip(*np.nonzero(intersects)):
+            row_off = int(block_row) * self.block_size
+            col_off = int(block_col) * self.block_size
+            blocks.append(Window(
+                col_off=col_off,
+                row_off=row_off,
+                width=min(self.block_size, cols - col_off),
+                height=min(self.block_size, rows - row_off)
+            ))
+
+        return blocks
+
+    def window(
+            self,
+            geometry: Union[RasterGeometry, Tuple[float, float, float, float]],
+            buffer: int = None) -> Window:
+        """
+        Compute the swath window covering a geometry, equivalent to `RasterGeolocation.window`.
+
+        Args:
+            geometry (Union[RasterGeometry, Tuple[float, float, float, float]]): Target geometry.
+            buffer (int, optional): Buffer in pixels to add around the geometry. Defaults to None.
+
+        Returns:
+            Window: Swath window covering the geometry.
+
+        Raises:
+            ValueError: If no swath pixels fall within the geometry.
+        """
+        bbox = wrap_geometry(geometry).bbox.transform(WGS84)
+        xmin, ymin, xmax, ymax = bbox
+        row_min = col_min = None
+        row_max = col_max = None
+
+        for block in self.candidate_blocks((xmin, ymin, xmax, ymax)):
+            lon, lat = _read_clipped_lon_lat(self.filename, window=block)
+            mask = (lon >= xmin) & (lon <= xmax) & (lat >= ymin) & (lat <= ymax)
+            rows, cols = np.nonzero(mask)
+
+            if rows.size == 0:
+                continue
+
+            rows = rows + block.row_off
+            cols = cols + block.col_off
+            row_min = rows.min() if row_min is None else min(row_min, rows.min())
+            row_max = rows.max() if row_max is None else max(row_max, rows.max())
+            col_min = cols.min() if col_min is None else min(col_min, cols.min())
+            col_max = cols.max() if col_max is None else max(col_max, cols.max())
+
+        if row_min is None:
+            raise ValueError("No points found within the target geometry.")
+
+        row_off = int(row_min)
+        col_off = int(col_min)
+        height = int(row_max - row_min + 1)
+        width = int(col_max - col_min + 1)
+
+        if buffer is not None and buffer > 0:
+            row_off = max(0, row_off - buffer)
+            col_off = max(0, col_off - buffer)
+            height = min(self.shape[0] - row_off, height + 2 * buffer)
+            width = min(self.shape[1] - col_off, width + 2 * buffer)
+
+        return Window(col_off=col_off, row_off=row_off, width=width, height=height)
+
+def read_swath_footprint_index(filename: str) -> SwathFootprintIndex:
+    """
+    Return the footprint index of a NetCDF file, building it on first use and caching it for the process.
+
+    Args:
+        filename (str): Path to a NetCDF file with `lat` and `lon` in the `location` group.
+
+    Returns:
+        SwathFootprintIndex: Cached footprint index, rebuilt if the file has changed.
+    """
+    filename = abspath(expanduser(filename))
+    # the metadata index carries the file signature, so a changed file invalidates the cached index
+    metadata = read_netcdf_metadata(filename)
+    signature = (metadata["size"], metadata["mtime_ns"])
+
+    with _FOOTPRINT_INDEX_CACHE_LOCK:
+        cached = _FOOTPRINT_INDEX_CACHE.get(filename)
+
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    index = SwathFootprintIndex.build(filename)
+
+    with _FOOTPRINT_INDEX_CACHE_LOCK:
+        _FOOTPRINT_INDEX_CACHE[filename] = (signature, index)
+
+    return index
+
+def geometry_swath_window(
+        filename: str,
+        geometry: Union[RasterGeometry, Tuple[float, float, float, float]],
+        buffer: int = None) -> Window:
+    """
+    Compute the swath window of a NetCDF file covering a geometry using the cached footprint index.
+
+    Args:
+        filename (str): Path to a NetCDF file with `lat` and `lon` in the `location` group.
+        geometry (Union[RasterGeometry, Tuple[float, float, float, float]]): Target geometry.
+        buffer (int, optional): Buffer in pixels to add around the geometry. Defaults to None.
+
+    Returns:
+        Window: Swath window covering the geometry.
+    """
+    return read_swath_footprint_index(filename).window(geometry, buffer=buffer)
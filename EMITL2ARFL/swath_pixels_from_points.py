@@ -0,0 +1,67 @@
+from typing import Sequence, Tuple
+
+import numpy as np
+
+from .extract_grid import extract_grid
+from .read_netcdf_pixels import read_netcdf_pixels
+
+def swath_pixels_from_points(
+        filename: str,
+        lats: Sequence[float],
+        lons: Sequence[float]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Map latitude/longitude points to the swath pixels that the Geometry Lookup Table (GLT) assigns to them.
+
+    Each point is located in a cell of the orthorectified grid through the geotransform, and only the GLT
+    entries of those cells are read, so the cost scales with the number of points instead of the scene size.
+
+    Args:
+        filename (str): EMIT NetCDF file with 'glt_x' and 'glt_y' in the 'location' group.
+        lats (Sequence[float]): Latitudes of the points in WGS84.
+        lons (Sequence[float]): Longitudes of the points in WGS84.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Zero-based swath rows and columns of the points, -1 for points
+            outside the grid or on grid cells without a swath pixel.
+    """
+    lats = np.atleast_1d(np.asarray(lats, dtype=np.float64))
+    lons = np.atleast_1d(np.asarray(lons, dtype=np.float64))
+
+    if lats.shape != lons.shape:
+        raise ValueError(f"lats and lons must have the same shape, got {lats.shape} and {lons.shape}")
+
+    # the grid comes from the metadata index, so locating the points does not open the file
+    grid = extract_grid(filename)
+    a, b, c, d, e, f = (float(getattr(grid.affine, coefficient)) for coefficient in "abcdef")
+    # invert the geotransform by hand, equivalent to ~affine * (lon, lat)
+    determinant = a * e - b * d
+    grid_cols = (e * (lons - c) - b * (lats - f)) / determinant
+    grid_rows = (a * (lats - f) - d * (lons - c)) / determinant
+    grid_rows = np.floor(grid_rows).astype(np.int64)
+    grid_cols = np.floor(grid_cols).astype(np.int64)
+    on_grid = (grid_rows >= 0) & (grid_rows < grid.rows) & (grid_cols >= 0) & (grid_cols < grid.cols)
+
+    swath_rows = np.full(lats.shape, -1, dtype=np.int64)
+    swath_cols = np.full(lats.shape, -1, dtype=np.int64)
+
+    if not np.any(on_grid):
+        return swath_rows, swath_cols
+
+    # the GLT holds 1-based indices with 0 as nodata, so subtracting 1 leaves -1 for cells without a swath pixel
+    for variable, indices in (("glt_y", swath_rows), ("glt_x", swath_cols)):
+        indices[on_grid] = read_netcdf_pixels(
+            filename,
+            variable,
+            rows=grid_rows[on_grid],
+            cols=grid_cols[on_grid],
+            group="location",
+            dtype=np.int64,
+            fill_to_nan=False
+        ) - 1
+
+    # a cell is only mapped when both of its indices are valid
+    unmapped = (swath_rows < 0) | (swath_cols < 0)
+    swath_rows[unmapped] = -1
+    swath_cols[unmapped] = -1
+
+    return swath_rows, swath_cols
@@ -0,0 +1,24 @@
+import hashlib
+
+from rasters import CRS, RasterGrid
+
+def target_grid_hash(grid: RasterGrid) -> str:
+    """
+    Return a stable hash of the affine transform, shape and CRS of a target grid.
+
+    Two grids with the same hash cover the same cells, so anything precomputed for one,
+    such as a resampling index, can be reused for the other.
+
+    Parameters:
+        grid (RasterGrid): Target grid.
+
+    Returns:
+        str: Hexadecimal SHA-1 digest of the grid definition.
+    """
+    if not isinstance(grid, RasterGrid):
+        raise TypeError(f"target geometry must be a RasterGrid, got {type(grid)}")
+
+    affine = tuple(float(getattr(grid.affine, coefficient)) for coefficient in "abcdef")
+    definition = f"{affine!r}|{tuple(int(size) for size in grid.shape)}|{CRS(grid.crs).to_wkt()}"
+
+    return hashlib.sha1(definition.encode("utf-8")).hexdigest()
@@ -0,0 +1,195 @@
+"""
+Shared fixtures for EMIT L2A RFL unit tests.
+
+Builds a small synthetic EMIT L2A granule (RFL, MASK and RFLUNCERT NetCDF files)
+with the same layout as the real products so that the readers can be exercised
+without NASA Earthdata credentials.
+"""
+import numpy as np
+import netCDF4
+import pytest
+
+DOWNTRACK = 40
+CROSSTRACK = 30
+BANDS = 12
+MASK_BANDS = 8
+ORTHO_Y = 52
+ORTHO_X = 46
+
+# swath pixel (row, col) -> (lon, lat) as a small rotation and scaling
+LON_ORIGIN = -116.0
+LAT_ORIGIN = 33.0
+PIXEL_SIZE = 0.0005
+
+GEOTRANSFORM = np.array([
+    LON_ORIGIN - 0.003,
+    PIXEL_SIZE,
+    -0.0,
+    LAT_ORIGIN + 0.0025,
+    -0.0,
+    -PIXEL_SIZE
+])
+
+GRANULE_ID = "EMIT_L2A_RFL_001_20240101T000000_2400101_001"
+
+
+def swath_lon_lat(rows: np.ndarray, cols: np.ndarray):
+    lon = LON_ORIGIN + PIXEL_SIZE * (0.9 * cols + 0.3 * rows)
+    lat = LAT_ORIGIN - PIXEL_SIZE * (0.9 * rows - 0.3 * cols)
+    return lon, lat
+
+
+def synthetic_GLT():
+    """
+    Nearest-neighbour GLT (1-based glt_y, glt_x) for the synthetic swath.
+    """
+    grid_rows, grid_cols = np.meshgrid(np.arange(ORTHO_Y), np.arange(ORTHO_X), indexing="ij")
+    lon = GEOTRANSFORM[0] + (grid_cols + 0.5) * GEOTRANSFORM[1]
+    lat = GEOTRANSFORM[3] + (grid_rows + 0.5) * GEOTRANSFORM[5]
+    u = (lon - LON_ORIGIN) / PIXEL_SIZE
+    v = (LAT_ORIGIN - lat) / PIXEL_SIZE
+    # invert [[0.9, 0.3], [-0.3, 0.9]] applied to (col, row)
+    det = 0.9 * 0.9 + 0.3 * 0.3
+    col = (0.9 * u - 0.3 * v) / det
+    row = (0.3 * u + 0.9 * v) / det
+    row = np.rint(row).astype(np.int32)
+    col = np.rint(col).astype(np.int32)
+    valid = (row >= 0) & (row < DOWNTRACK) & (col >= 0) & (col < CROSSTRACK)
+    glt_y = np.where(valid, row + 1, 0).astype(np.int32)
+    glt_x = np.where(valid, col + 1, 0).astype(np.int32)
+    return glt_y, glt_x
+
+
+def _write_common(ds: netCDF4.Dataset, title: str):
+    ds.createDimension("downtrack", DOWNTRACK)
+    ds.createDimension("crosstrack", CROSSTRACK)
+    ds.createDimension("ortho_y", ORTHO_Y)
+    ds.createDimension("ortho_x", ORTHO_X)
+
+    ds.setncattr("title", title)
+    ds.setncattr("software_build_version", "010619")
+    ds.setncattr("geotransform", GEOTRANSFORM)
+    ds.setncattr("spatial_ref", 'GEOGCS["WGS 84",DATUM["WGS_1984",SPHEROID["WGS 84",6378137,298.257223563]],PRIMEM["Greenwich",0],UNIT["degree",0.0174532925199433],AUTHORITY["EPSG","4326"]]')
+
+    rows, cols = np.meshgrid(np.arange(DOWNTRACK), np.arange(CROSSTRACK), indexing="ij")
+    lon, lat = swath_lon_lat(rows, cols)
+    glt_y, glt_x = synthetic_GLT()
+
+    ds.setncattr("westernmost_longitude", float(lon.min()))
+    ds.setncattr("easternmost_longitude", float(lon.max()))
+    ds.setncattr("southernmost_latitude", float(lat.min()))
+    ds.setncattr("northernmost_latitude", float(lat.max()))
+
+    location = ds.createGroup("location")
+    location.createVariable("lon", "f8", ("downtrack", "crosstrack"), fill_value=-9999.0)[:] = lon
+    location.createVariable("lat", "f8", ("downtrack", "crosstrack"), fill_value=-9999.0)[:] = lat
+    location.createVariable("elev", "f8", ("downtrack", "crosstrack"), fill_value=-9999.0)[:] = 100.0 + rows + cols
+    location.createVariable("glt_x", "i4", ("ortho_y", "ortho_x"), fill_value=0)[:] = glt_x
+    location.createVariable("glt_y", "i4", ("ortho_y", "ortho_x"), fill_value=0)[:] = glt_y
+
+
+def reflectance_values() -> np.ndarray:
+    rows, cols, bands = np.meshgrid(
+        np.arange(DOWNTRACK),
+        np.arange(CROSSTRACK),
+        np.arange(BANDS),
+        indexing="ij"
+    )
+    return (rows * 10000 + cols * 100 + bands).astype(np.float32) / 1000.0
+
+
+def mask_values() -> np.ndarray:
+    mask = np.zeros((DOWNTRACK, CROSSTRACK, MASK_BANDS), dtype=np.float32)
+    # cloud in the upper-left corner, cirrus in the lower-right corner
+    mask[:10, :12, 0] = 1
+    mask[30:, 20:, 1] = 1
+    # a data band that must never be used as a flag
+    mask[..., 5] = 0.5
+    return mask
+
+
+def wavelengths() -> np.ndarray:
+    return np.linspace(400.0, 2500.0, BANDS).astype(np.float32)
+
+
+def good_wavelengths() -> np.ndarray:
+    good = np.ones(BANDS, dtype=np.uint8)
+    good[[4, 5, 9]] = 0
+    return good
+
+
+def write_reflectance(filename: str, variable: str = "reflectance", title: str = "EMIT L2A Estimated Surface Reflectance 60 m V001"):
+    with netCDF4.Dataset(filename, "w") as ds:
+        _write_common(ds, title)
+        ds.createDimension("bands", BANDS)
+        var = ds.createVariable(
+            variable,
+            "f4",
+            ("downtrack", "crosstrack", "bands"),
+            fill_value=-9999.0,
+            zlib=True,
+            chunksizes=(16, 16, BANDS)
+        )
+        values = reflectance_values()
+        values[0, 0, :] = -9999.0
+        var[:] = values
+        sensor_band_parameters = ds.createGroup("sensor_band_parameters")
+        sensor_band_parameters.createVariable("wavelengths", "f4", ("bands",))[:] = wavelengths()
+        sensor_band_parameters.createVariable("fwhm", "f4", ("bands",))[:] = np.full(BANDS, 8.5, dtype=np.float32)
+        sensor_band_parameters.createVariable("good_wavelengths", "u1", ("bands",))[:] = good_wavelengths()
+
+
+def write_mask(filename: str):
+    with netCDF4.Dataset(filename, "w") as ds:
+        _write_common(ds, "EMIT L2A Masks 60 m V001")
+        ds.createDimension("bands", MASK_BANDS)
+        var = ds.createVariable(
+            "mask",
+            "f4",
+            ("downtrack", "crosstrack", "bands"),
+            fill_value=-9999.0,
+            zlib=True,
+            chunksizes=(16, 16, MASK_BANDS)
+        )
+        var[:] = mask_values()
+        sensor_band_parameters = ds.createGroup("sensor_band_parameters")
+        mask_bands = sensor_band_parameters.createVariable("mask_bands", str, ("bands",))
+        names = ["Cloud flag", "Cirrus flag", "Water flag", "Spacecraft Flag", "Dilated Cloud Flag", "AOD550", "H2O (g cm-2)", "Aggregate Flag"]
+        for index, name in enumerate(names):
+            mask_bands[index] = name
+
+
+@pytest.fixture
+def synthetic_granule_files(tmp_path):
+    """
+    Write a synthetic EMIT L2A granule and return the (reflectance, mask, uncertainty) filenames.
+    """
+    from EMITL2ARFL.netcdf_handle_pool import close_netcdf_handles
+
+    directory = tmp_path / GRANULE_ID
+    directory.mkdir()
+    reflectance_filename = str(directory / f"{GRANULE_ID}.nc")
+    mask_filename = str(directory / f"{GRANULE_ID.replace('_RFL_', '_MASK_')}.nc")
+    uncertainty_filename = str(directory / f"{GRANULE_ID.replace('_RFL_', '_RFLUNCERT_')}.nc")
+
+    write_reflectance(reflectance_filename)
+    write_mask(mask_filename)
+    write_reflectance(
+        uncertainty_filename,
+        variable="reflectance_uncertainty",
+        title="EMIT L2A Estimated Surface Reflectance Uncertainty 60 m V001"
+    )
+
+    yield reflectance_filename, mask_filename, uncertainty_filename
+
+    close_netcdf_handles()
+
+
+@pytest.fixture
+def reflectance_filename(synthetic_granule_files):
+    return synthetic_granule_files[0]
+
+
+@pytest.fixture
+def mask_filename(synthetic_granule_files):
+    return synthetic_granule_files[1]
@@ -0,0 +1,165 @@
+"""
+Unit tests for GeometryLookupTable bounds and storage.
+"""
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from affine import Affine
+from rasterio.windows import Window
+from rasters import RasterGrid
+
+from EMITL2ARFL.GLT import GeometryLookupTable
+from EMITL2ARFL.compact_GLT_dtype import compact_GLT_dtype
+from EMITL2ARFL.extract_GLT_array import extract_GLT_array
+
+from conftest import CROSSTRACK, GEOTRANSFORM, ORTHO_X, ORTHO_Y, synthetic_GLT
+
+
+def synthetic_GeometryLookupTable() -> GeometryLookupTable:
+    glt_y, glt_x = synthetic_GLT()
+    grid = RasterGrid.from_affine(Affine.from_gdal(*GEOTRANSFORM), ORTHO_Y, ORTHO_X)
+    return GeometryLookupTable(GLT_array=np.stack([glt_y, glt_x], axis=-1), geometry=grid)
+
+
+def brute_force_bounds(GLT_array: np.ndarray):
+    valid = (GLT_array[..., 0] != 0) & (GLT_array[..., 1] != 0)
+    rows = GLT_array[..., 0][valid] - 1
+    cols = GLT_array[..., 1][valid] - 1
+    return rows.min(), rows.max(), cols.min(), cols.max(), int(valid.sum())
+
+
+class TestGLTBounds:
+    """Test suite for the cached GLT bounds."""
+
+    def test_bounds_match_brute_force(self):
+        """Test that the fused pass matches per-axis scans."""
+        GLT = synthetic_GeometryLookupTable()
+        min_row, max_row, min_col, max_col, valid_count = brute_force_bounds(np.asarray(GLT))
+
+        assert (GLT.min_row, GLT.max_row, GLT.min_col, GLT.max_col) == (min_row, max_row, min_col, max_col)
+        assert GLT.valid_count == valid_count
+        assert GLT.swath_window == Window(min_col, min_row, max_col - min_col + 1, max_row - min_row + 1)
+
+    def test_bounds_are_computed_once(self):
+        """Test that repeated bound lookups reuse the cached pass."""
+        GLT = synthetic_GeometryLookupTable()
+        repr(GLT)
+
+        with patch("EMITL2ARFL.GLT.np.count_nonzero", side_effect=AssertionError("rescanned")):
+            GLT.swath_window
+            repr(GLT)
+
+    def test_adjust_indices_carries_bounds(self):
+        """Test that adjusted bounds are derived arithmetically and match a rescan."""
+        GLT = synthetic_GeometryLookupTable()
+        adjusted = GLT.adjust_indices(GLT.swath_window)
+
+        assert adjusted._bounds is not None
+        assert (adjusted.min_row, adjusted.min_col) == (0, 0)
+        _, max_row, _, max_col, valid_count = brute_force_bounds(np.asarray(adjusted))
+        assert (adjusted.max_row, adjusted.max_col, adjusted.valid_count) == (max_row, max_col, valid_count)
+
+    def test_slices_do_not_inherit_bounds(self):
+        """Test that a sliced GLT computes its own bounds."""
+        GLT = synthetic_GeometryLookupTable()
+        GLT.bounds
+        subset = GLT[10:20, 10:20]
+
+        assert (subset.min_row, subset.max_row, subset.min_col, subset.max_col, subset.valid_count) == brute_force_bounds(np.asarray(subset))
+
+    def test_all_nodata(self):
+        """Test that an empty GLT raises when its bounds are requested."""
+        grid = RasterGrid.from_affine(Affine.from_gdal(*GEOTRANSFORM), 4, 4)
+        GLT = GeometryLookupTable(GLT_array=np.zeros((4, 4, 2), dtype=np.int32), geometry=grid)
+
+        assert GLT.valid_count == 0
+
+        with pytest.raises(ValueError):
+            GLT.min_row
+
+    def test_adjust_all_nodata(self):
+        """Test that an empty GLT adjusts to an unchanged empty GLT."""
+        grid = RasterGrid.from_affine(Affine.from_gdal(*GEOTRANSFORM), 4, 4)
+        GLT = GeometryLookupTable(GLT_array=np.zeros((4, 4, 2), dtype=np.uint16), geometry=grid)
+        adjusted = GLT.adjust_indices(Window(col_off=5, row_off=7, width=3, height=3))
+
+        assert adjusted.valid_count == 0
+        np.testing.assert_array_equal(np.asarray(adjusted), 0)
+
+    def test_adjust_below_window_offset(self):
+        """Test that indices before the window offset raise instead of wrapping in an unsigned GLT."""
+        base = synthetic_GeometryLookupTable()
+        GLT = GeometryLookupTable(GLT_array=np.asarray(base).astype(np.uint16), geometry=base.geometry)
+        window = GLT.swath_window
+        shifted = Window(col_off=window.col_off + 1, row_off=window.row_off, width=window.width, height=window.height)
+
+        with pytest.raises(ValueError):
+            GLT.adjust_indices(shifted)
+
+
+class TestCompactGLT:
+    """Test suite for compact GLT storage."""
+
+    def test_extract_reads_uint16(self, reflectance_filename):
+        """Test that the GLT is read straight into uint16 with the on-disk values."""
+        GLT_array = extract_GLT_array(reflectance_filename)
+        glt_y, glt_x = synthetic_GLT()
+
+        assert GLT_array.dtype == np.uint16
+        np.testing.assert_array_equal(GLT_array[..., 0], glt_y)
+        np.testing.assert_array_equal(GLT_array[..., 1], glt_x)
+
+    def test_extract_window(self, reflectance_filename):
+        """Test that a windowed read matches the same window of the full GLT."""
+        window = Window(col_off=5, row_off=7, width=20, height=30)
+        GLT_array = extract_GLT_array(reflectance_filename, window=window, dtype=np.int32)
+
+        assert GLT_array.dtype == np.int32
+        np.testing.assert_array_equal(GLT_array, extract_GLT_array(reflectance_filename)[7:37, 5:25])
+
+    def test_compact_dtype(self):
+        """Test the dtype chosen for a swath size."""
+        assert compact_GLT_dtype(1280, 1242) == np.uint16
+        assert compact_GLT_dtype(70000, 1242) == np.int32
+
+    def test_zero_based_indices_do_not_wrap(self):
+        """Test that nodata becomes -1 in the zero-based rows of an unsigned GLT."""
+        GLT = synthetic_GeometryLookupTable().astype(np.uint16)
+        rows = np.asarray(GLT.rows)
+
+        assert rows.min() == -1
+        assert rows.max() == GLT.max_row
+
+    def test_linear_index_round_trip(self):
+        """Test conversion to and from linear swath indices."""
+        GLT = synthetic_GeometryLookupTable()
+        linear_index = GLT.linear_index(CROSSTRACK)
+        restored = GeometryLookupTable.from_linear_index(linear_index, CROSSTRACK, geometry=GLT.geometry)
+
+        assert linear_index.dtype == np.int32
+        np.testing.assert_array_equal(np.asarray(restored), np.asarray(GLT))
+
+
+class TestReadGLT:
+    """Test suite for the single-handle GLT reader."""
+
+    def test_single_open(self, reflectance_filename):
+        """Test that the indices and the grid of a window are read through one file handle."""
+        import importlib
+        from EMITL2ARFL.extract_grid import extract_grid
+
+        # the package re-exports the function under the module name, so import the module explicitly
+        read_GLT_module = importlib.import_module("EMITL2ARFL.read_GLT")
+
+        window = Window(col_off=5, row_off=7, width=20, height=30)
+        glt_y, glt_x = synthetic_GLT()
+
+        with patch.object(read_GLT_module, "open_netcdf", wraps=read_GLT_module.open_netcdf) as open_netcdf:
+            GLT = read_GLT_module.read_GLT(reflectance_filename, window=window)
+
+        assert open_netcdf.call_count == 1
+        assert GLT.dtype == np.uint16
+        assert GLT.geometry == extract_grid(reflectance_filename, window=window)
+        np.testing.assert_array_equal(np.asarray(GLT)[..., 0], glt_y[7:37, 5:25])
+        np.testing.assert_array_equal(np.asarray(GLT)[..., 1], glt_x[7:37, 5:25])
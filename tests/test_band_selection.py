@@ -0,0 +1,79 @@
+"""
+Unit tests for band-subset and wavelength-range reads.
+"""
+import pytest
+import numpy as np
+from rasterio.windows import Window
+
+from EMITL2ARFL.select_bands import select_bands, band_index_slices
+from EMITL2ARFL.read_netcdf_array import read_netcdf_array
+from EMITL2ARFL.EMITNetCDF import EMITNetCDF
+
+from conftest import reflectance_values, wavelengths
+
+
+class TestSelectBands:
+    """Test suite for resolving band selections."""
+
+    def test_no_selection(self, reflectance_filename):
+        """Test that no selection resolves to None (all bands)."""
+        assert select_bands(reflectance_filename) is None
+
+    def test_band_indices(self, reflectance_filename):
+        """Test that explicit indices are sorted and deduplicated."""
+        np.testing.assert_array_equal(select_bands(reflectance_filename, bands=[7, 2, 2, 3]), [2, 3, 7])
+        np.testing.assert_array_equal(select_bands(reflectance_filename, bands=slice(0, 3)), [0, 1, 2])
+
+    def test_wavelength_range(self, reflectance_filename):
+        """Test that a wavelength range resolves against the wavelengths variable."""
+        expected = np.flatnonzero((wavelengths() >= 900) & (wavelengths() <= 1600))
+        np.testing.assert_array_equal(select_bands(reflectance_filename, wavelength_range=(900, 1600)), expected)
+
+    def test_good_bands_only(self, reflectance_filename):
+        """Test that bad bands are dropped."""
+        band_indices = select_bands(reflectance_filename, good_bands_only=True)
+        assert not set(band_indices.tolist()) & {4, 5, 9}
+        assert len(band_indices) == 9
+
+    def test_out_of_range(self, reflectance_filename):
+        """Test that out-of-range indices are rejected."""
+        with pytest.raises(ValueError):
+            select_bands(reflectance_filename, bands=[12])
+
+    def test_wavelengths_required(self, mask_filename):
+        """Test that wavelength selection fails on a file without wavelengths."""
+        with pytest.raises(KeyError):
+            select_bands(mask_filename, wavelength_range=(400, 500))
+
+    def test_band_index_slices(self):
+        """Test coalescing band indices into contiguous hyperslabs."""
+        assert band_index_slices([0, 1, 2, 5, 6, 9]) == [slice(0, 3), slice(5, 7), slice(9, 10)]
+        assert band_index_slices([]) == []
+
+
+class TestBandSubsetReads:
+    """Test suite for band-subset reads."""
+
+    def test_read_band_subset(self, reflectance_filename):
+        """Test that only the selected bands are returned in (bands, rows, cols) order."""
+        window = Window(col_off=2, row_off=5, width=6, height=4)
+        array = read_netcdf_array(reflectance_filename, "reflectance", window=window, bands=[1, 2, 8])
+        expected = np.transpose(reflectance_values()[5:9, 2:8, [1, 2, 8]], (2, 0, 1))
+
+        assert array.shape == (3, 4, 6)
+        np.testing.assert_allclose(array, expected)
+
+    def test_read_wavelength_range(self, reflectance_filename):
+        """Test that the EMITNetCDF reader honors wavelength ranges."""
+        netcdf = EMITNetCDF(reflectance_filename)
+        array = netcdf.read_array("reflectance", wavelength_range=(900, 1600), good_bands_only=True)
+        band_indices = netcdf.select_bands(wavelength_range=(900, 1600), good_bands_only=True)
+
+        assert array.shape == (len(band_indices), 40, 30)
+        np.testing.assert_allclose(array[:, 1:, :], np.transpose(reflectance_values()[1:, :, band_indices], (2, 0, 1)))
+        np.testing.assert_allclose(netcdf.wavelengths, wavelengths())
+
+    def test_band_selection_requires_band_dimension(self, reflectance_filename):
+        """Test that selecting bands of a 2-D variable is rejected."""
+        with pytest.raises(ValueError):
+            read_netcdf_array(reflectance_filename, "lat", group="location", bands=[0])
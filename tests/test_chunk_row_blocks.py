@@ -0,0 +1,58 @@
+"""
+Unit tests for the shared NetCDF row block and masking helpers.
+"""
+import netCDF4
+import numpy as np
+import pytest
+
+from EMITL2ARFL.chunk_row_blocks import chunk_row_blocks
+from EMITL2ARFL.constants import NETCDF_READ_BLOCK_ROWS
+from EMITL2ARFL.netcdf_auto_mask import netcdf_auto_mask
+
+
+@pytest.fixture
+def netcdf_dataset(tmp_path):
+    ds = netCDF4.Dataset(str(tmp_path / "blocks.nc"), "w")
+    ds.createDimension("rows", 150)
+    ds.createDimension("cols", 4)
+    ds.createVariable("chunked", "f4", ("rows", "cols"), chunksizes=(16, 4))
+    ds.createVariable("contiguous", "f4", ("rows", "cols"), contiguous=True)
+    yield ds
+    ds.close()
+
+
+class TestChunkRowBlocks:
+    """Test suite for chunk_row_blocks."""
+
+    def test_blocks_align_to_chunks(self, netcdf_dataset):
+        """Test that blocks end on chunk boundaries and cover the range exactly."""
+        blocks = list(chunk_row_blocks(netcdf_dataset.variables["chunked"], 5, 40))
+
+        assert blocks == [(5, 16), (16, 32), (32, 45)]
+
+    def test_contiguous_blocks(self, netcdf_dataset):
+        """Test that contiguous variables are split into fixed blocks of rows."""
+        blocks = list(chunk_row_blocks(netcdf_dataset.variables["contiguous"], 0, 150))
+
+        assert blocks[0] == (0, NETCDF_READ_BLOCK_ROWS)
+        assert blocks[-1][1] == 150
+        assert all(start == stop for (_, stop), (start, _) in zip(blocks, blocks[1:]))
+
+    def test_empty_range(self, netcdf_dataset):
+        """Test that an empty range yields no blocks."""
+        assert list(chunk_row_blocks(netcdf_dataset.variables["chunked"], 10, 0)) == []
+
+
+class TestNetCDFAutoMask:
+    """Test suite for netcdf_auto_mask."""
+
+    def test_restores_on_error(self, netcdf_dataset):
+        """Test that the previous masking is restored when the read fails."""
+        var = netcdf_dataset.variables["chunked"]
+
+        with pytest.raises(RuntimeError):
+            with netcdf_auto_mask(var, False):
+                assert not var.mask
+                raise RuntimeError("read failed")
+
+        assert var.mask
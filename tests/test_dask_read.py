@@ -0,0 +1,62 @@
+"""
+Unit tests for lazy dask-backed NetCDF reads.
+"""
+import pickle
+from unittest.mock import patch
+
+import numpy as np
+import dask.array as da
+from rasterio.windows import Window
+
+from EMITL2ARFL.EMITNetCDF import EMITNetCDF
+from EMITL2ARFL.EMITL2ARFLGranule import EMITL2ARFLGranule
+from EMITL2ARFL.read_netcdf_dask_array import NetCDFVariableProxy, read_netcdf_dask_array
+
+from conftest import mask_values, reflectance_values
+
+
+class TestDaskRead:
+    """Test suite for lazy reads."""
+
+    def test_chunks_match_file(self, reflectance_filename):
+        """Test that the dask chunks follow the on-disk chunk shape."""
+        array = read_netcdf_dask_array(reflectance_filename, "reflectance")
+
+        assert isinstance(array, da.Array)
+        assert array.shape == (12, 40, 30)
+        assert array.chunks[1] == (16, 16, 8)
+        assert array.chunks[2] == (16, 14)
+
+    def test_nothing_read_until_compute(self, reflectance_filename):
+        """Test that building the graph does not read pixels."""
+        with patch.object(NetCDFVariableProxy, "__getitem__", side_effect=AssertionError("read")) as mock_getitem:
+            array = EMITNetCDF(reflectance_filename).read_dask("reflectance", window=Window(2, 3, 10, 5), bands=[1, 3])
+            reduced = array.mean(axis=0)
+            mock_getitem.assert_not_called()
+
+        assert reduced.shape == (5, 10)
+
+    def test_window_and_bands(self, reflectance_filename):
+        """Test that the computed values match an eager read."""
+        array = EMITNetCDF(reflectance_filename).read_dask("reflectance", window=Window(2, 3, 10, 20), bands=[1, 3, 4])
+        expected = np.transpose(reflectance_values()[3:23, 2:12, [1, 3, 4]], (2, 0, 1))
+        np.testing.assert_allclose(array.compute(), expected)
+
+    def test_fill_to_nan(self, reflectance_filename):
+        """Test that fill values become NaN."""
+        array = read_netcdf_dask_array(reflectance_filename, "reflectance", window=Window(0, 0, 2, 2)).compute()
+        assert np.all(np.isnan(array[:, 0, 0]))
+
+    def test_proxy_is_picklable(self, reflectance_filename):
+        """Test that the proxy can be shipped to other processes."""
+        proxy = pickle.loads(pickle.dumps(NetCDFVariableProxy(reflectance_filename, "lat", group="location")))
+        assert proxy.shape == (40, 30)
+
+    def test_granule_quality_masking(self, synthetic_granule_files):
+        """Test that lazy quality masking matches the mask file."""
+        granule = EMITL2ARFLGranule(*synthetic_granule_files)
+        cube = granule.reflectance_dask(bands=[0]).compute()
+        masked = mask_values()[..., [0, 1, 2, 3, 4]].sum(axis=-1) >= 1
+
+        assert np.all(np.isnan(cube[0][masked]))
+        assert not np.any(np.isnan(cube[0][~masked][1:]))
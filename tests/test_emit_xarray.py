@@ -0,0 +1,69 @@
+"""
+Unit tests for the single-handle windowed read behind emit_xarray.
+"""
+import importlib
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+import xarray as xr
+from rasterio.windows import Window
+
+from EMITL2ARFL.read_GLT import read_GLT
+from EMITL2ARFL.read_emit_window import read_emit_window
+
+from conftest import mask_values
+
+# the package re-exports the emit_xarray function under the module name
+emit_xarray_module = importlib.import_module("EMITL2ARFL.emit_xarray")
+
+WINDOW = Window(col_off=3, row_off=5, width=11, height=17)
+
+
+class TestReadEmitWindow:
+    """Test suite for read_emit_window."""
+
+    @pytest.mark.parametrize("good_bands_only", [False, True])
+    def test_matches_xarray_groups(self, reflectance_filename, good_bands_only):
+        """Test that every group matches the windowed groups opened through xarray."""
+        fast = read_emit_window(reflectance_filename, WINDOW, wavelength_group="sensor_band_parameters", good_bands_only=good_bands_only)
+        expected = emit_xarray_module._open_emit_groups(
+            reflectance_filename,
+            swath_window=WINDOW,
+            wvl_group="sensor_band_parameters",
+            engine="netcdf4",
+            good_bands_only=good_bands_only,
+            granule_id="test"
+        )
+
+        for actual, reference in zip(fast, expected):
+            xr.testing.assert_identical(actual, reference)
+
+    def test_emit_xarray_window_skips_xarray_open(self, mask_filename):
+        """Test that a windowed emit_xarray reads through the pooled handle instead of xr.open_dataset."""
+        with patch.object(emit_xarray_module.xr, "open_dataset", side_effect=AssertionError("xr.open_dataset called")):
+            ds = emit_xarray_module.emit_xarray(mask_filename, swath_window=WINDOW)
+
+        expected = mask_values()[5:22, 3:14]
+
+        np.testing.assert_array_equal(ds["mask"].values, expected)
+        assert list(ds["mask_bands"].values[:2]) == ["Cloud flag", "Cirrus flag"]
+
+    def test_ortho_window_matches_full_ortho(self, reflectance_filename):
+        """Test that orthorectifying a grid window from its swath window matches the same window of the full orthorectification."""
+        grid_window = Window(col_off=10, row_off=12, width=20, height=15)
+        swath_window = read_GLT(reflectance_filename, window=grid_window).swath_window
+
+        windowed = emit_xarray_module.emit_xarray(
+            reflectance_filename,
+            ortho=True,
+            swath_window=swath_window,
+            grid_window=grid_window
+        )
+        expected = emit_xarray_module.emit_xarray(reflectance_filename, ortho=True)
+
+        assert windowed["reflectance"].shape == (15, 20, expected["reflectance"].shape[2])
+        np.testing.assert_array_equal(windowed["reflectance"].values, expected["reflectance"].values[12:27, 10:30])
+        np.testing.assert_array_equal(windowed["elev"].values, expected["elev"].values[12:27, 10:30])
+        np.testing.assert_array_equal(windowed["latitude"].values, expected["latitude"].values[12:27])
+        np.testing.assert_array_equal(windowed["longitude"].values, expected["longitude"].values[10:30])
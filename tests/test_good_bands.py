@@ -0,0 +1,37 @@
+"""
+Unit tests for dropping bad-wavelength bands at read time.
+"""
+import numpy as np
+from rasterio.windows import Window
+
+from EMITL2ARFL.EMITL2ARFLGranule import EMITL2ARFLGranule
+from EMITL2ARFL.emit_xarray import emit_xarray
+
+from conftest import good_wavelengths, reflectance_values, wavelengths
+
+
+class TestGoodBandsOnly:
+    """Test suite for the good_bands_only mode."""
+
+    def test_granule_reflectance(self, synthetic_granule_files):
+        """Test that the granule reflectance cube only carries good bands."""
+        granule = EMITL2ARFLGranule(*synthetic_granule_files)
+        window = Window(col_off=14, row_off=12, width=8, height=6)
+
+        cube = granule.reflectance(swath_window=window, filter_clouds=False, good_bands_only=True)
+        good_band_indices = np.flatnonzero(good_wavelengths() == 1)
+
+        assert cube.shape == (len(good_band_indices), 6, 8)
+        np.testing.assert_allclose(
+            cube.array,
+            np.transpose(reflectance_values()[12:18, 14:22, good_band_indices], (2, 0, 1))
+        )
+
+    def test_emit_xarray(self, reflectance_filename):
+        """Test that emit_xarray drops bad bands and their wavelengths."""
+        ds = emit_xarray(reflectance_filename, good_bands_only=True)
+        good = good_wavelengths() == 1
+
+        assert ds["reflectance"].shape == (40, 30, int(good.sum()))
+        np.testing.assert_allclose(ds["wavelengths"].values, wavelengths()[good])
+        np.testing.assert_allclose(ds["reflectance"].values[1:], reflectance_values()[1:, :, good])
@@ -0,0 +1,114 @@
+"""
+Unit tests for the inverse Geometry Lookup Table.
+"""
+import numpy as np
+import pytest
+from rasterio.windows import Window
+
+from EMITL2ARFL.extract_GLT import extract_GLT
+from EMITL2ARFL.InverseGLT import InverseGLT, read_inverse_GLT
+
+from conftest import CROSSTRACK, DOWNTRACK, ORTHO_X, ORTHO_Y, synthetic_GLT
+from test_GLT import synthetic_GeometryLookupTable
+
+
+def brute_force_swath_window(grid_window: Window) -> Window:
+    GLT = synthetic_GeometryLookupTable()
+    rows, cols = grid_window.toslices()
+    return GLT[rows, cols].swath_window
+
+
+def brute_force_grid_window(swath_window: Window) -> Window:
+    glt_y, glt_x = synthetic_GLT()
+    rows, cols = swath_window.toslices()
+    inside = (
+        (glt_y - 1 >= rows.start) & (glt_y - 1 < rows.stop) &
+        (glt_x - 1 >= cols.start) & (glt_x - 1 < cols.stop) &
+        (glt_y != 0) & (glt_x != 0)
+    )
+    grid_rows, grid_cols = np.nonzero(inside)
+    return Window(
+        grid_cols.min(),
+        grid_rows.min(),
+        grid_cols.max() - grid_cols.min() + 1,
+        grid_rows.max() - grid_rows.min() + 1
+    )
+
+
+GRID_WINDOWS = [
+    Window(0, 0, ORTHO_X, ORTHO_Y),
+    Window(5, 7, 20, 30),
+    Window(10, 12, 3, 4),
+    Window(1, 1, 44, 9),
+]
+
+
+class TestInverseGLT:
+    """Test suite for InverseGLT."""
+
+    @pytest.mark.parametrize("block_size", [4, 7, 64])
+    @pytest.mark.parametrize("grid_window", GRID_WINDOWS)
+    def test_grid_to_swath_window(self, block_size, grid_window):
+        """Test that block summaries plus edge scans match a full rescan of the GLT window."""
+        inverse_GLT = InverseGLT.from_GLT(
+            synthetic_GeometryLookupTable(),
+            swath_shape=(DOWNTRACK, CROSSTRACK),
+            block_size=block_size
+        )
+
+        assert inverse_GLT.grid_to_swath_window(grid_window) == brute_force_swath_window(grid_window)
+
+    @pytest.mark.parametrize("swath_window", [Window(0, 0, CROSSTRACK, DOWNTRACK), Window(3, 5, 10, 8), Window(29, 39, 1, 1)])
+    def test_swath_to_grid_window(self, swath_window):
+        """Test that the grid window of a swath window matches a scan of the GLT."""
+        inverse_GLT = InverseGLT.from_GLT(synthetic_GeometryLookupTable(), swath_shape=(DOWNTRACK, CROSSTRACK))
+
+        assert inverse_GLT.swath_to_grid_window(swath_window) == brute_force_grid_window(swath_window)
+
+    def test_grid_cells(self):
+        """Test that every grid cell is found from the swath pixel it samples."""
+        glt_y, glt_x = synthetic_GLT()
+        inverse_GLT = InverseGLT.from_GLT(synthetic_GeometryLookupTable(), swath_shape=(DOWNTRACK, CROSSTRACK))
+
+        for row, col in [(0, 0), (12, 17), (39, 29)]:
+            grid_rows, grid_cols = inverse_GLT.grid_cells(row, col)
+            expected_rows, expected_cols = np.nonzero((glt_y == row + 1) & (glt_x == col + 1))
+            np.testing.assert_array_equal(np.sort(grid_rows * ORTHO_X + grid_cols), expected_rows * ORTHO_X + expected_cols)
+
+    def test_empty_window_raises(self):
+        """Test that a grid window without swath pixels raises."""
+        inverse_GLT = InverseGLT.from_GLT(synthetic_GeometryLookupTable(), swath_shape=(DOWNTRACK, CROSSTRACK))
+
+        with pytest.raises(ValueError):
+            inverse_GLT.grid_to_swath_window(Window(0, 0, 1, 1))
+
+    def test_valid_pixels_only_in_edge_strips(self):
+        """Test that empty full blocks do not leak their placeholder bounds into the window."""
+        GLT_array = np.zeros((64, 64, 2), dtype=np.uint16)
+        GLT_array[:3, :, 0] = np.arange(1, 4)[:, np.newaxis]
+        GLT_array[:3, :, 1] = np.arange(1, 65)
+        inverse_GLT = InverseGLT.from_GLT(GLT_array, swath_shape=(10, 64), block_size=16)
+
+        assert inverse_GLT.grid_to_swath_window(Window(0, 1, 64, 63)) == Window(0, 1, 64, 2)
+
+    def test_empty_blocks_and_strips_raise(self):
+        """Test that a window of empty full blocks and empty strips reports that it has no swath pixels."""
+        GLT_array = np.zeros((64, 64, 2), dtype=np.uint16)
+        GLT_array[0, 0] = (1, 1)
+        inverse_GLT = InverseGLT.from_GLT(GLT_array, swath_shape=(10, 64), block_size=16)
+
+        with pytest.raises(ValueError, match="no swath pixels"):
+            inverse_GLT.grid_to_swath_window(Window(0, 1, 64, 63))
+
+    def test_extract_GLT_uses_swath_window(self, reflectance_filename):
+        """Test that the adjusted GLT of a grid window indexes into its swath window."""
+        grid_window = Window(5, 7, 20, 30)
+        GLT, adjusted_GLT, swath_window = extract_GLT(reflectance_filename, window=grid_window)
+
+        assert read_inverse_GLT(reflectance_filename) is read_inverse_GLT(reflectance_filename)
+        assert swath_window == brute_force_swath_window(grid_window)
+        assert (adjusted_GLT.min_row, adjusted_GLT.min_col) == (0, 0)
+        np.testing.assert_array_equal(
+            np.asarray(adjusted_GLT)[adjusted_GLT.valid_mask] + [swath_window.row_off, swath_window.col_off],
+            np.asarray(GLT)[GLT.valid_mask]
+        )
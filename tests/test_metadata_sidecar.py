@@ -0,0 +1,85 @@
+"""
+Unit tests for the per-granule metadata sidecar index.
+"""
+import json
+import os
+from os.path import exists
+from unittest.mock import patch
+
+import numpy as np
+
+from EMITL2ARFL.EMITNetCDF import EMITNetCDF
+from EMITL2ARFL.extract_grid import extract_grid
+from EMITL2ARFL.metadata_sidecar import (
+    build_netcdf_metadata,
+    ingest_EMIT_metadata,
+    read_metadata_sidecar,
+    read_netcdf_metadata,
+    sidecar_filename
+)
+
+from conftest import GEOTRANSFORM, wavelengths
+
+
+class TestMetadataSidecar:
+    """Test suite for the metadata sidecar."""
+
+    def test_sidecar_written_on_first_access(self, reflectance_filename):
+        """Test that the first access writes a JSON sidecar with the expected content."""
+        metadata = read_netcdf_metadata(reflectance_filename)
+
+        assert exists(sidecar_filename(reflectance_filename))
+        assert metadata["dimensions"]["bands"] == 12
+        np.testing.assert_allclose(metadata["geotransform"], GEOTRANSFORM)
+        assert metadata["variables"]["reflectance"]["chunks"] == [16, 16, 12]
+        assert set(metadata["bounds"]) == {"northernmost_latitude", "southernmost_latitude", "easternmost_longitude", "westernmost_longitude"}
+
+        with open(sidecar_filename(reflectance_filename)) as file:
+            assert json.load(file) == metadata
+
+    def test_accessors_served_from_sidecar(self, reflectance_filename):
+        """Test that the accessors do not reopen the NetCDF file once the sidecar exists."""
+        read_netcdf_metadata(reflectance_filename)
+        netcdf = EMITNetCDF(reflectance_filename)
+
+        with patch("EMITL2ARFL.metadata_sidecar.build_netcdf_metadata") as mock_build:
+            assert netcdf.dimensions["ortho_x"] == 46
+            assert netcdf.metadata["software_build_version"] == "010619"
+            assert netcdf.affine.c == GEOTRANSFORM[0]
+            assert netcdf.northernmost_latitude > netcdf.southernmost_latitude
+            assert netcdf.chunking("glt_x", group="location") is None or len(netcdf.chunking("glt_x", group="location")) == 2
+            assert netcdf.variables("location") == ["lon", "lat", "elev", "glt_x", "glt_y"]
+            assert netcdf.grid.shape == (52, 46)
+            np.testing.assert_allclose(netcdf.wavelengths, wavelengths())
+            mock_build.assert_not_called()
+
+    def test_stale_sidecar_is_ignored(self, reflectance_filename):
+        """Test that a sidecar is invalidated when the file modification time changes."""
+        read_netcdf_metadata(reflectance_filename)
+        assert read_metadata_sidecar(reflectance_filename) is not None
+
+        stat = os.stat(reflectance_filename)
+        os.utime(reflectance_filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+        assert read_metadata_sidecar(reflectance_filename) is None
+        metadata = read_netcdf_metadata(reflectance_filename)
+        assert metadata["mtime_ns"] == stat.st_mtime_ns + 10 ** 9
+        assert read_metadata_sidecar(reflectance_filename) is not None
+
+    def test_mask_band_names(self, mask_filename):
+        """Test that mask band names are indexed for the mask product."""
+        metadata = build_netcdf_metadata(mask_filename)
+        assert metadata["sensor_band_parameters"]["mask_bands"][0] == "Cloud flag"
+
+    def test_ingest_directory(self, synthetic_granule_files, tmp_path):
+        """Test scanning a download directory."""
+        index = ingest_EMIT_metadata(str(tmp_path))
+
+        assert sorted(index) == sorted(synthetic_granule_files)
+        assert all(exists(sidecar_filename(filename)) for filename in synthetic_granule_files)
+
+    def test_extract_grid(self, reflectance_filename):
+        """Test that the grid is derived from the indexed geotransform."""
+        grid = extract_grid(reflectance_filename)
+        assert grid.shape == (52, 46)
+        assert grid.affine.a == GEOTRANSFORM[1]
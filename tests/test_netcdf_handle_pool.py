@@ -0,0 +1,125 @@
+"""
+Unit tests for the pooled NetCDF handles shared by the EMIT readers.
+"""
+import os
+import threading
+
+import pytest
+import numpy as np
+from rasterio.windows import Window
+
+from EMITL2ARFL.netcdf_handle_pool import NetCDFHandlePool, NETCDF_HANDLE_POOL, open_netcdf
+from EMITL2ARFL.read_netcdf_array import read_netcdf_array
+from EMITL2ARFL.read_dimensions import read_dimensions
+from EMITL2ARFL.EMITNetCDF import EMITNetCDF
+
+
+class TestNetCDFHandlePool:
+    """Test suite for the NetCDF handle pool."""
+
+    def test_handle_is_reused(self, reflectance_filename):
+        """Test that consecutive check-outs return the same open handle."""
+        pool = NetCDFHandlePool(max_open_files=2)
+
+        with pool.open(reflectance_filename) as first:
+            pass
+
+        with pool.open(reflectance_filename) as second:
+            assert second is first
+            assert second.isopen()
+
+        pool.close()
+        assert not first.isopen()
+
+    def test_lru_eviction(self, synthetic_granule_files):
+        """Test that the least-recently-used idle handle is closed when the limit is exceeded."""
+        reflectance_filename, mask_filename, uncertainty_filename = synthetic_granule_files
+        pool = NetCDFHandlePool(max_open_files=2)
+
+        with pool.open(reflectance_filename) as reflectance_ds:
+            pass
+        with pool.open(mask_filename):
+            pass
+        with pool.open(uncertainty_filename):
+            pass
+
+        assert len(pool) == 2
+        assert reflectance_filename not in pool
+        assert not reflectance_ds.isopen()
+        pool.close()
+
+    def test_checked_out_handles_are_not_evicted(self, synthetic_granule_files):
+        """Test that a handle in use survives eviction pressure."""
+        reflectance_filename, mask_filename, uncertainty_filename = synthetic_granule_files
+        pool = NetCDFHandlePool(max_open_files=1)
+
+        with pool.open(reflectance_filename) as reflectance_ds:
+            with pool.open(mask_filename):
+                pass
+            assert reflectance_ds.isopen()
+
+        assert len(pool) == 1
+        pool.close()
+
+    def test_replaced_file_is_reopened(self, reflectance_filename):
+        """Test that a handle is refreshed when the file changes on disk."""
+        pool = NetCDFHandlePool()
+
+        with pool.open(reflectance_filename) as first:
+            pass
+
+        stat = os.stat(reflectance_filename)
+        os.utime(reflectance_filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+        with pool.open(reflectance_filename) as second:
+            assert second is not first
+
+        pool.close()
+
+    def test_invalid_limit(self):
+        """Test that a non-positive limit is rejected."""
+        with pytest.raises(ValueError):
+            NetCDFHandlePool(max_open_files=0)
+
+    def test_checkout_is_exclusive_per_thread(self, reflectance_filename):
+        """Test that a handle checked out by one thread blocks other threads but not nested checkouts."""
+        pool = NetCDFHandlePool(max_open_files=2)
+        entered = threading.Event()
+
+        def check_out():
+            with pool.open(reflectance_filename):
+                entered.set()
+
+        with pool.open(reflectance_filename) as ds:
+            with pool.open(reflectance_filename) as nested:
+                assert nested is ds
+
+            thread = threading.Thread(target=check_out)
+            thread.start()
+            assert not entered.wait(0.2)
+
+        thread.join(timeout=5)
+        assert entered.is_set()
+        pool.close()
+
+    def test_readers_share_pool(self, reflectance_filename):
+        """Test that the module-level readers go through the shared pool."""
+        dimensions = read_dimensions(reflectance_filename)
+        assert dimensions["bands"] == 12
+        assert reflectance_filename in NETCDF_HANDLE_POOL
+
+        with open_netcdf(reflectance_filename) as ds:
+            expected = ds["reflectance"][2:5, 3:7, :]
+
+        array = read_netcdf_array(
+            reflectance_filename,
+            "reflectance",
+            window=Window(col_off=3, row_off=2, width=4, height=3)
+        )
+        np.testing.assert_array_equal(array, np.transpose(expected, (2, 0, 1)))
+
+        netcdf = EMITNetCDF(reflectance_filename)
+        assert "location" in netcdf.groups
+        assert "reflectance" in netcdf.variables()
+        assert netcdf.metadata["software_build_version"] == "010619"
+        assert netcdf.tree.startswith(f"File: {reflectance_filename}")
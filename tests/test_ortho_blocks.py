@@ -0,0 +1,62 @@
+"""
+Unit tests for band-blocked streaming orthorectification.
+"""
+import numpy as np
+import rasterio
+from rasterio.windows import Window
+
+from EMITL2ARFL.emit_ortho_blocks import emit_ortho_blocks
+from EMITL2ARFL.emit_ortho_raster import emit_ortho_raster
+
+from conftest import BANDS, ORTHO_X, ORTHO_Y, reflectance_values
+from test_ortho_plan import brute_force_ortho
+
+
+def expected_ortho(bands=slice(None)) -> np.ndarray:
+    swath = reflectance_values()
+    swath[0, 0, :] = np.nan
+    return np.moveaxis(brute_force_ortho(swath[..., bands]), -1, 0)
+
+
+class TestOrthoBlocks:
+    """Test suite for emit_ortho_blocks."""
+
+    def test_blocks_match_full_ortho(self, reflectance_filename):
+        """Test that blocked output matches a one-shot orthorectification."""
+        ortho = emit_ortho_blocks(reflectance_filename, "reflectance", block_bands=5)
+
+        assert ortho.shape == (BANDS, ORTHO_Y, ORTHO_X)
+        np.testing.assert_allclose(ortho, expected_ortho())
+
+    def test_memmap_destination(self, reflectance_filename, tmp_path):
+        """Test writing band blocks into a memory-mapped file."""
+        destination = np.lib.format.open_memmap(tmp_path / "ortho.npy", mode="w+", dtype=np.float32, shape=(3, ORTHO_Y, ORTHO_X))
+        emit_ortho_blocks(reflectance_filename, "reflectance", destination=destination, bands=[1, 4, 7], block_bands=2)
+        destination.flush()
+
+        np.testing.assert_allclose(np.load(tmp_path / "ortho.npy"), expected_ortho([1, 4, 7]))
+
+    def test_geotiff_destination(self, reflectance_filename, tmp_path):
+        """Test writing band blocks into an open GeoTIFF."""
+        filename = tmp_path / "ortho.tif"
+        profile = dict(driver="GTiff", width=ORTHO_X, height=ORTHO_Y, count=BANDS, dtype="float32")
+
+        with rasterio.open(filename, "w", **profile) as destination:
+            emit_ortho_blocks(reflectance_filename, "reflectance", destination=destination, block_bands=4)
+
+        with rasterio.open(filename) as source:
+            np.testing.assert_allclose(source.read(), expected_ortho())
+
+    def test_two_dimensional_variable(self, reflectance_filename):
+        """Test orthorectifying a 2-D variable."""
+        elevation = emit_ortho_blocks(reflectance_filename, "elev", group="location")
+        rows, cols = np.meshgrid(np.arange(40), np.arange(30), indexing="ij")
+        expected = brute_force_ortho((100.0 + rows + cols)[..., np.newaxis])[..., 0]
+
+        np.testing.assert_allclose(elevation, expected)
+
+    def test_emit_ortho_raster_block_mode(self, reflectance_filename):
+        """Test that emit_ortho_raster can stream band blocks into its raster."""
+        raster = emit_ortho_raster(reflectance_filename, "reflectance", block_bands=5)
+
+        np.testing.assert_allclose(np.asarray(raster), expected_ortho())
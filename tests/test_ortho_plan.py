@@ -0,0 +1,206 @@
+"""
+Unit tests for the reusable orthorectification plan.
+"""
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from rasterio.windows import Window
+
+from EMITL2ARFL.apply_geometry_lookup_table import apply_GLT
+from EMITL2ARFL.emit_xarray import emit_xarray
+from EMITL2ARFL.get_pixel_center_coords import get_pixel_center_coords
+from EMITL2ARFL.OrthoPlan import OrthoPlan
+from EMITL2ARFL.ortho_fill_value import ortho_fill_value
+from EMITL2ARFL.ortho_xr import ortho_xr
+from EMITL2ARFL.read_GLT import read_GLT
+
+from conftest import CROSSTRACK, DOWNTRACK, reflectance_values, synthetic_GLT
+from test_GLT import synthetic_GeometryLookupTable
+
+
+def brute_force_ortho(swath_array: np.ndarray, fill_value=np.nan) -> np.ndarray:
+    glt_y, glt_x = synthetic_GLT()
+    ortho = np.full(glt_y.shape + swath_array.shape[2:], fill_value, dtype=np.float64)
+
+    for row in range(glt_y.shape[0]):
+        for col in range(glt_y.shape[1]):
+            if glt_y[row, col] != 0 and glt_x[row, col] != 0:
+                ortho[row, col] = swath_array[glt_y[row, col] - 1, glt_x[row, col] - 1]
+
+    return ortho
+
+
+class TestOrthoPlan:
+    """Test suite for OrthoPlan."""
+
+    def test_apply_matches_brute_force(self):
+        """Test that the gather matches a per-pixel lookup for 2-D and 3-D arrays."""
+        GLT = synthetic_GeometryLookupTable()
+        plan = OrthoPlan.from_GLT(np.asarray(GLT), swath_shape=(DOWNTRACK, CROSSTRACK))
+        cube = reflectance_values()
+
+        np.testing.assert_array_equal(plan.apply(cube), brute_force_ortho(cube))
+        np.testing.assert_array_equal(plan.apply(cube[..., 3], fill_value=-1), brute_force_ortho(cube[..., 3], fill_value=-1))
+        assert plan.size == GLT.valid_count
+
+    def test_plan_is_cached_on_GLT(self):
+        """Test that the GLT builds its plan once per swath shape."""
+        GLT = synthetic_GeometryLookupTable()
+        plan = GLT.ortho_plan((DOWNTRACK, CROSSTRACK))
+
+        with patch.object(OrthoPlan, "from_GLT", side_effect=AssertionError("rebuilt")):
+            assert GLT.ortho_plan((DOWNTRACK, CROSSTRACK)) is plan
+            apply_GLT(reflectance_values(), GLT)
+
+    def test_swath_shape_mismatch(self):
+        """Test that a plan refuses arrays of another swath shape."""
+        plan = synthetic_GeometryLookupTable().ortho_plan((DOWNTRACK, CROSSTRACK))
+
+        with pytest.raises(ValueError):
+            plan.apply(np.zeros((DOWNTRACK, CROSSTRACK + 1)))
+
+    def test_GLT_out_of_swath(self):
+        """Test that indices past the swath raise instead of gathering from another row."""
+        with pytest.raises(IndexError):
+            OrthoPlan.from_GLT(np.array([[[1, 3]]]), swath_shape=(2, 2))
+
+        with pytest.raises(IndexError):
+            synthetic_GeometryLookupTable().ortho_plan((DOWNTRACK - 1, CROSSTRACK))
+
+    def test_GLT_before_swath(self):
+        """Test that negative indices raise instead of wrapping to the far end of the swath."""
+        with pytest.raises(IndexError):
+            OrthoPlan.from_GLT(np.array([[[-1, 2]]], dtype=np.int32), swath_shape=(2, 2))
+
+        with pytest.raises(IndexError):
+            OrthoPlan.from_GLT(np.array([[[2, -1]]], dtype=np.int32), swath_shape=(2, 2))
+
+    def test_default_fill_of_integer_arrays(self):
+        """Test that the default fill value fits integer swath arrays."""
+        plan = OrthoPlan.from_GLT(np.array([[[1, 1], [0, 0]], [[3, 3], [2, 1]]]), swath_shape=(3, 3))
+        ortho = plan.apply(np.arange(9, dtype=np.int16).reshape(3, 3))
+
+        assert ortho.dtype == np.int16
+        np.testing.assert_array_equal(ortho, [[0, ortho_fill_value(np.int16)], [8, 3]])
+
+    def test_ortho_xr_builds_one_plan(self, reflectance_filename):
+        """Test that every variable and the elevation share one plan."""
+        swath_ds = emit_xarray(reflectance_filename, ortho=False)
+
+        with patch.object(OrthoPlan, "from_GLT", wraps=OrthoPlan.from_GLT) as from_GLT:
+            ortho_ds = ortho_xr(swath_ds)
+
+        assert from_GLT.call_count == 1
+        expected = brute_force_ortho(reflectance_values())
+        expected[expected == -9999] = np.nan
+        np.testing.assert_allclose(ortho_ds["reflectance"].values, expected)
+
+
+class TestStackedOrtho:
+    """Test suite for the stacked multi-variable gather."""
+
+    def test_apply_stacked_matches_separate_gathers(self):
+        """Test that stacking 2-D and 3-D arrays gives the separate gathers side by side."""
+        plan = synthetic_GeometryLookupTable().ortho_plan((DOWNTRACK, CROSSTRACK))
+        cube = reflectance_values()
+        stacked = plan.apply_stacked([cube, cube[..., 0] * 2], fill_value=-1, workers=3)
+
+        assert stacked.shape == plan.grid_shape + (cube.shape[2] + 1,)
+        np.testing.assert_array_equal(stacked[..., :-1], plan.apply(cube, fill_value=-1))
+        np.testing.assert_array_equal(stacked[..., -1], plan.apply(cube[..., 0] * 2, fill_value=-1))
+
+    @pytest.mark.parametrize("preserve_dtype", [False, True])
+    def test_ortho_xr_matches_apply_GLT(self, reflectance_filename, preserve_dtype):
+        """Test that every variable and the elevation match orthorectifying them one at a time."""
+        swath_ds = emit_xarray(reflectance_filename, ortho=False).load()
+        swath_ds["flag"] = (("downtrack", "crosstrack"), (reflectance_values()[..., 1] * 10).astype(np.uint8) % 3)
+        GLT = synthetic_GeometryLookupTable()
+
+        with patch.object(OrthoPlan, "apply", side_effect=AssertionError("gathered one variable at a time")):
+            ortho_ds = ortho_xr(swath_ds, GLT_array=GLT, preserve_dtype=preserve_dtype)
+
+        for var in ["reflectance", "flag"]:
+            expected = apply_GLT(swath_ds[var].values, GLT, preserve_dtype=preserve_dtype)
+            np.testing.assert_array_equal(ortho_ds[var].values, expected.reshape(ortho_ds[var].shape))
+            assert ortho_ds[var].dtype == expected.dtype
+
+        expected_elev = apply_GLT(swath_ds["elev"].values, GLT, preserve_dtype=preserve_dtype)[..., 0]
+        np.testing.assert_array_equal(ortho_ds["elev"].values, expected_elev)
+
+    def test_pixel_center_coords_are_writable_copies(self, reflectance_filename):
+        """Test that the cached pixel centers are returned as copies the caller can modify."""
+        swath_ds = emit_xarray(reflectance_filename, ortho=False)
+        lon, lat = get_pixel_center_coords(swath_ds)
+        expected_lon, expected_lat = lon.copy(), lat.copy()
+
+        lon[:] = 0
+        lat[:] = 0
+        lon, lat = get_pixel_center_coords(swath_ds)
+
+        np.testing.assert_array_equal(lon, expected_lon)
+        np.testing.assert_array_equal(lat, expected_lat)
+
+    def test_ortho_xr_grid_window(self, reflectance_filename):
+        """Test that orthorectifying a grid window of the GLT matches the same window of the whole grid."""
+        grid_window = Window(col_off=10, row_off=12, width=20, height=15)
+        swath_ds = emit_xarray(reflectance_filename, ortho=False)
+        expected = ortho_xr(swath_ds)
+        ortho_ds = ortho_xr(swath_ds, GLT_array=read_GLT(reflectance_filename, window=grid_window), grid_window=grid_window)
+
+        assert ortho_ds["reflectance"].shape == (15, 20, expected["reflectance"].shape[2])
+        np.testing.assert_array_equal(ortho_ds["reflectance"].values, expected["reflectance"].values[12:27, 10:30])
+        np.testing.assert_array_equal(ortho_ds["elev"].values, expected["elev"].values[12:27, 10:30])
+        np.testing.assert_array_equal(ortho_ds["latitude"].values, expected["latitude"].values[12:27])
+        np.testing.assert_array_equal(ortho_ds["longitude"].values, expected["longitude"].values[10:30])
+
+
+class TestParallelOrtho:
+    """Test suite for the row-strip parallel gather."""
+
+    @pytest.mark.parametrize("workers", [2, 3, 64, None])
+    def test_workers_match_serial(self, workers):
+        """Test that any number of workers gives the serial result."""
+        GLT = synthetic_GeometryLookupTable()
+        cube = reflectance_values()
+        serial = apply_GLT(cube, GLT)
+
+        np.testing.assert_array_equal(apply_GLT(cube, GLT, workers=workers), serial)
+        np.testing.assert_array_equal(apply_GLT(cube[..., 0], GLT, workers=workers), apply_GLT(cube[..., 0], GLT))
+
+
+class TestPreserveDtype:
+    """Test suite for dtype-preserving orthorectification."""
+
+    def test_ortho_fill_value(self):
+        """Test that the fill value falls back to a sentinel the dtype can represent."""
+        assert np.isnan(ortho_fill_value(np.float32))
+        assert ortho_fill_value(np.int16) == -9999
+        assert ortho_fill_value(np.uint8) == 255
+        assert ortho_fill_value(np.int8) == -128
+        assert ortho_fill_value(np.bool_) is False
+        assert ortho_fill_value(np.uint16, fill_value=0) == 0
+
+    def test_uint8_mask_preserved(self):
+        """Test that a uint8 mask keeps its dtype and gets the sentinel on unmapped pixels."""
+        GLT = synthetic_GeometryLookupTable()
+        mask = (reflectance_values()[..., 0] * 10).astype(np.uint8) % 2
+        ortho = apply_GLT(mask, GLT, preserve_dtype=True)
+        expected = brute_force_ortho(mask, fill_value=255)
+
+        assert ortho.dtype == np.uint8
+        np.testing.assert_array_equal(ortho[..., 0], expected)
+
+    def test_float_fill_is_nan(self):
+        """Test that float outputs get NaN on unmapped pixels in both modes."""
+        GLT = synthetic_GeometryLookupTable()
+        cube = reflectance_values().astype(np.float64)
+        expected = brute_force_ortho(cube)
+
+        preserved = apply_GLT(cube, GLT, preserve_dtype=True)
+        assert preserved.dtype == np.float64
+        np.testing.assert_array_equal(preserved, expected)
+
+        converted = apply_GLT(cube, GLT)
+        assert converted.dtype == np.float32
+        np.testing.assert_allclose(converted, expected.astype(np.float32))
@@ -0,0 +1,61 @@
+"""
+Unit tests for the bit-packed quality mask cache.
+"""
+from unittest.mock import patch
+
+import numpy as np
+from rasterio.windows import Window
+
+from EMITL2ARFL.EMITL2ARFLGranule import EMITL2ARFLGranule
+from EMITL2ARFL.PackedMask import PackedMask
+from EMITL2ARFL.read_qmask import read_qmask
+
+from conftest import mask_values
+
+WINDOW = Window(col_off=7, row_off=4, width=13, height=21)
+
+
+def expected_qmask(quality_bands=(0, 1, 2, 3, 4)) -> np.ndarray:
+    return mask_values()[..., list(quality_bands)].sum(axis=-1) >= 1
+
+
+class TestPackedMask:
+    """Test suite for PackedMask."""
+
+    def test_round_trip(self):
+        """Test that whole masks and windows unpack to the original values at 1 bit per pixel."""
+        mask = np.random.default_rng(0).random((37, 29)) > 0.5
+        packed = PackedMask.from_array(mask)
+
+        assert packed.nbytes == 37 * 4
+        np.testing.assert_array_equal(packed.unpack(), mask)
+        np.testing.assert_array_equal(packed.unpack(WINDOW), mask[4:25, 7:20])
+        assert packed.unpack(WINDOW).dtype == bool
+
+
+class TestGranuleQualityMaskCache:
+    """Test suite for the granule-scoped quality mask cache."""
+
+    def test_mask_is_read_once_per_window(self, synthetic_granule_files):
+        """Test that repeated masks for a window and bands read the mask file once."""
+        granule = EMITL2ARFLGranule(*synthetic_granule_files)
+
+        with patch("EMITL2ARFL.EMITL2ARFLGranule.read_qmask", wraps=read_qmask) as reader:
+            first = granule.swath_quality_mask(swath_window=WINDOW)
+            granule.reflectance(swath_window=WINDOW, bands=[0], skip_masked_chunks=False)
+            second = granule.swath_quality_mask(swath_window=WINDOW)
+            granule.swath_quality_mask(swath_window=WINDOW, quality_bands=[1])
+
+        assert reader.call_count == 2
+        np.testing.assert_array_equal(first, expected_qmask()[4:25, 7:20])
+        np.testing.assert_array_equal(second, first)
+
+    def test_window_of_cached_swath_mask(self, synthetic_granule_files):
+        """Test that a window is unpacked from the cached whole-swath mask without reading the file."""
+        granule = EMITL2ARFLGranule(*synthetic_granule_files)
+        np.testing.assert_array_equal(granule.swath_quality_mask(quality_bands=[0]), expected_qmask([0]))
+
+        with patch("EMITL2ARFL.EMITL2ARFLGranule.read_qmask", side_effect=AssertionError("mask read")):
+            window = granule.swath_quality_mask(swath_window=WINDOW, quality_bands=[0])
+
+        np.testing.assert_array_equal(window, expected_qmask([0])[4:25, 7:20])
@@ -0,0 +1,46 @@
+"""
+Unit tests for multi-threaded chunk decompression.
+"""
+import numpy as np
+import pytest
+from rasterio.windows import Window
+
+from EMITL2ARFL.read_netcdf_array import read_netcdf_array
+from EMITL2ARFL.read_netcdf_array_parallel import UnsupportedChunkLayout, read_netcdf_array_parallel
+
+
+class TestParallelRead:
+    """Test suite for reading raw chunks on a thread pool."""
+
+    def test_full_read_matches_serial(self, reflectance_filename):
+        """Test that a full parallel read matches the netCDF4 read."""
+        serial = read_netcdf_array(reflectance_filename, "reflectance")
+        parallel = read_netcdf_array(reflectance_filename, "reflectance", workers=4)
+
+        np.testing.assert_array_equal(parallel.filled(np.nan), serial.filled(np.nan))
+        np.testing.assert_array_equal(np.ma.getmaskarray(parallel), np.ma.getmaskarray(serial))
+
+    def test_window_and_bands_match_serial(self, reflectance_filename):
+        """Test a window straddling chunk boundaries with a discontiguous band selection."""
+        window = Window(col_off=5, row_off=13, width=20, height=22)
+        serial = read_netcdf_array(reflectance_filename, "reflectance", window=window, bands=[0, 2, 3, 10])
+        parallel = read_netcdf_array(reflectance_filename, "reflectance", window=window, bands=[0, 2, 3, 10], workers=3)
+
+        assert parallel.shape == (4, 22, 20)
+        np.testing.assert_array_equal(parallel, serial)
+
+    def test_single_worker(self, reflectance_filename):
+        """Test that one worker decodes the chunks in the calling thread."""
+        window = Window(col_off=14, row_off=30, width=16, height=10)
+        serial = read_netcdf_array(reflectance_filename, "reflectance", window=window, bands=slice(4, 9))
+        parallel = read_netcdf_array_parallel(reflectance_filename, "reflectance", window=window, band_indices=range(4, 9), workers=1)
+
+        np.testing.assert_array_equal(np.transpose(parallel, (2, 0, 1)), serial)
+
+    def test_unsupported_layout_falls_back(self, reflectance_filename):
+        """Test that unchunked variables raise and read_netcdf_array falls back to netCDF4."""
+        with pytest.raises(UnsupportedChunkLayout):
+            read_netcdf_array_parallel(reflectance_filename, "wavelengths", group="sensor_band_parameters")
+
+        wavelengths = read_netcdf_array(reflectance_filename, "wavelengths", group="sensor_band_parameters", workers=4)
+        assert wavelengths.shape == (12,)
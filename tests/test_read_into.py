@@ -0,0 +1,143 @@
+"""
+Unit tests for reading NetCDF arrays into preallocated buffers.
+"""
+from unittest.mock import patch
+
+import netCDF4
+import pytest
+import numpy as np
+from rasterio.windows import Window
+
+from EMITL2ARFL.EMITL2ARFLGranule import EMITL2ARFLGranule
+from EMITL2ARFL.EMITNetCDF import EMITNetCDF
+from EMITL2ARFL.read_netcdf_array_into import read_netcdf_array_into
+from EMITL2ARFL.read_qmask import read_qmask
+
+from conftest import reflectance_values
+
+
+class TestReadInto:
+    """Test suite for read_into."""
+
+    @pytest.mark.parametrize("layout,axes", [("BSQ", (2, 0, 1)), ("BIP", (0, 1, 2)), ("BIL", (0, 2, 1))])
+    def test_layouts(self, reflectance_filename, layout, axes):
+        """Test that each interleave layout is filled correctly across chunk boundaries."""
+        window = Window(col_off=3, row_off=10, width=20, height=25)
+        expected = np.transpose(reflectance_values()[10:35, 3:23, [0, 1, 6, 7, 8]], axes)
+        out = np.empty(expected.shape, dtype=np.float32)
+
+        result = EMITNetCDF(reflectance_filename).read_into(
+            "reflectance",
+            out=out,
+            window=window,
+            bands=[0, 1, 6, 7, 8],
+            layout=layout
+        )
+
+        assert result is out
+        np.testing.assert_allclose(out, expected)
+
+    def test_fill_to_nan(self, reflectance_filename):
+        """Test that fill values become NaN in place."""
+        out = read_netcdf_array_into(reflectance_filename, "reflectance", window=Window(0, 0, 2, 2))
+        assert np.all(np.isnan(out[:, 0, 0]))
+        assert not np.any(np.isnan(out[:, 1, 1]))
+
+    def test_raw_fill_values(self, reflectance_filename):
+        """Test that raw fill values are kept when NaN conversion is disabled."""
+        out = read_netcdf_array_into(reflectance_filename, "reflectance", window=Window(0, 0, 2, 2), fill_to_nan=False)
+        assert np.all(out[:, 0, 0] == -9999)
+
+    def test_auto_mask(self, reflectance_filename):
+        """Test that auto-masked elements are written as NaN and the handle state is restored."""
+        out = read_netcdf_array_into(reflectance_filename, "reflectance", window=Window(0, 0, 2, 2), auto_mask=True, fill_to_nan=False)
+        assert np.all(np.isnan(out[:, 0, 0]))
+
+        array = EMITNetCDF(reflectance_filename).read_array("reflectance", window=Window(0, 0, 2, 2))
+        assert np.ma.isMaskedArray(array)
+        assert array.mask[:, 0, 0].all()
+
+    def test_2d_variable(self, reflectance_filename):
+        """Test reading a 2-D variable into a buffer of another dtype."""
+        out = np.empty((52, 46), dtype=np.int64)
+        read_netcdf_array_into(reflectance_filename, "glt_x", group="location", out=out)
+        assert out.max() <= 30
+
+    def test_shape_mismatch(self, reflectance_filename):
+        """Test that a mismatched buffer is rejected."""
+        with pytest.raises(ValueError):
+            read_netcdf_array_into(reflectance_filename, "reflectance", out=np.empty((12, 40, 29), dtype=np.float32))
+
+    def test_non_contiguous_buffer(self, reflectance_filename):
+        """Test that a non-contiguous buffer is rejected."""
+        out = np.empty((30, 40, 12), dtype=np.float32).transpose(2, 1, 0)
+        with pytest.raises(ValueError):
+            read_netcdf_array_into(reflectance_filename, "reflectance", out=out)
+
+
+class TestSkipChunks:
+    """Test suite for skipping fully masked chunks."""
+
+    @pytest.mark.parametrize("layout,axes", [("BSQ", (2, 0, 1)), ("BIP", (0, 1, 2)), ("BIL", (0, 2, 1))])
+    def test_skipped_chunks_are_nan(self, reflectance_filename, layout, axes):
+        """Test that skipped 16x16 chunks are NaN and every other pixel is read."""
+        skip_chunks = np.array([[True, False], [False, True], [False, False]])
+        expected = reflectance_values()
+        expected[:16, :16] = np.nan
+        expected[16:32, 16:] = np.nan
+        expected = np.transpose(expected[10:35, 3:23, [0, 1, 6]], axes)
+
+        out = read_netcdf_array_into(
+            reflectance_filename,
+            "reflectance",
+            window=Window(col_off=3, row_off=10, width=20, height=25),
+            bands=[0, 1, 6],
+            layout=layout,
+            skip_chunks=skip_chunks
+        )
+
+        np.testing.assert_allclose(out, expected)
+
+    def test_chunk_grid_mismatch(self, reflectance_filename):
+        """Test that a summary of another chunk grid is refused."""
+        with pytest.raises(ValueError):
+            read_netcdf_array_into(reflectance_filename, "reflectance", skip_chunks=np.zeros((2, 2), dtype=bool))
+
+    def test_granule_skips_clouded_chunks(self, synthetic_granule_files):
+        """Test that a fully clouded chunk is flagged and skipping it leaves the filtered reflectance unchanged."""
+        with netCDF4.Dataset(synthetic_granule_files[1], "a") as ds:
+            ds["mask"][:16, :16, 0] = 1
+
+        granule = EMITL2ARFLGranule(*synthetic_granule_files)
+        expected_chunks = np.zeros((3, 2), dtype=bool)
+        expected_chunks[0, 0] = True
+
+        np.testing.assert_array_equal(granule.masked_reflectance_chunks(), expected_chunks)
+
+        skipped = np.asarray(granule.reflectance(bands=[0, 2]).array)
+        read = np.asarray(granule.reflectance(bands=[0, 2], skip_masked_chunks=False).array)
+
+        np.testing.assert_array_equal(skipped, read)
+        assert np.all(np.isnan(skipped[:, :16, :16]))
+
+    def test_window_reads_mask_of_its_chunks(self, synthetic_granule_files):
+        """Test that a windowed read summarizes only the chunks around the window from one mask read."""
+        with netCDF4.Dataset(synthetic_granule_files[1], "a") as ds:
+            ds["mask"][:16, :16, 0] = 1
+            ds["mask"][16:32, 16:, 0] = 1
+
+        granule = EMITL2ARFLGranule(*synthetic_granule_files)
+        window = Window(col_off=2, row_off=3, width=5, height=6)
+
+        with patch("EMITL2ARFL.EMITL2ARFLGranule.read_qmask", wraps=read_qmask) as reader:
+            skipped = np.asarray(granule.reflectance(swath_window=window, bands=[0]).array)
+
+        assert reader.call_count == 1
+        assert reader.call_args.kwargs["window"] == Window(col_off=0, row_off=0, width=16, height=16)
+
+        expected_chunks = np.zeros((3, 2), dtype=bool)
+        expected_chunks[0, 0] = True
+        np.testing.assert_array_equal(granule.masked_reflectance_chunks(swath_window=window), expected_chunks)
+
+        read = np.asarray(granule.reflectance(swath_window=window, bands=[0], skip_masked_chunks=False).array)
+        np.testing.assert_array_equal(skipped, read)
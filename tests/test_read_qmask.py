@@ -0,0 +1,46 @@
+"""
+Unit tests for the direct mask band reader.
+"""
+import netCDF4
+import numpy as np
+import pytest
+from rasterio.windows import Window
+
+from EMITL2ARFL.read_qmask import read_qmask
+
+from conftest import mask_values
+
+
+def reference_qmask(mask: np.ndarray, quality_bands) -> np.ndarray:
+    # the original reduction: sum the decoded flags and clamp, with fill values as NaN
+    qmask = np.sum(np.where(mask == -9999.0, np.nan, mask)[..., quality_bands], axis=-1)
+    qmask[qmask > 1] = 1
+    return qmask
+
+
+class TestReadQmask:
+    """Test suite for read_qmask."""
+
+    @pytest.mark.parametrize("quality_bands", [[0, 1, 2, 3, 4], [1], [4, 0], [0, 7]])
+    @pytest.mark.parametrize("window", [None, Window(col_off=3, row_off=5, width=11, height=30)])
+    def test_matches_sum_of_flags(self, mask_filename, quality_bands, window):
+        """Test that the OR of the flags matches the clamped sum, fill values included."""
+        with netCDF4.Dataset(mask_filename, "a") as ds:
+            ds["mask"][6:8, 4:6, :] = -9999.0
+
+        mask = mask_values()
+        mask[6:8, 4:6, :] = -9999.0
+        expected = reference_qmask(mask, quality_bands)
+
+        if window is not None:
+            expected = expected[5:35, 3:14]
+
+        qmask = read_qmask(mask_filename, window=window, quality_bands=quality_bands)
+
+        assert qmask.dtype == np.float32
+        np.testing.assert_array_equal(qmask, expected)
+
+    def test_data_bands_rejected(self, mask_filename):
+        """Test that the AOD and water vapour bands cannot be used as flags."""
+        with pytest.raises(AttributeError):
+            read_qmask(mask_filename, quality_bands=[0, 5])
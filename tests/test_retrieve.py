@@ -47,7 +47,7 @@ class TestRetrieveEMITData:
             remote_granule=mock_search_result,
             download_directory="/tmp/emit"
         )
-        mock_granule.reflectance.assert_called_once_with(geometry=location)
+        mock_granule.reflectance.assert_called_once_with(geometry=location, good_bands_only=False)
         mock_mosaic.assert_called_once()
     
     @patch('EMITL2ARFL.retrieve_EMIT_L2A_RFL.retrieve_EMIT_L2A_RFL_granule')
@@ -0,0 +1,101 @@
+"""
+Unit tests for point sampling through coalesced pixel reads.
+"""
+import numpy as np
+
+from EMITL2ARFL.EMITL2ARFLGranule import EMITL2ARFLGranule
+from EMITL2ARFL.read_netcdf_pixels import pixel_hyperslabs, read_netcdf_pixels
+from EMITL2ARFL.swath_pixels_from_points import swath_pixels_from_points
+
+from conftest import GEOTRANSFORM, mask_values, reflectance_values, synthetic_GLT
+
+
+def grid_cell_centers(grid_rows: np.ndarray, grid_cols: np.ndarray):
+    lons = GEOTRANSFORM[0] + (grid_cols + 0.5) * GEOTRANSFORM[1]
+    lats = GEOTRANSFORM[3] + (grid_rows + 0.5) * GEOTRANSFORM[5]
+    return lats, lons
+
+
+class TestPixelHyperslabs:
+    """Test suite for pixel_hyperslabs."""
+
+    def test_covers_every_pixel_once(self):
+        """Test that every pixel falls in exactly one hyperslab that contains it."""
+        rng = np.random.default_rng(0)
+        rows = rng.integers(0, 500, 200)
+        cols = rng.integers(0, 500, 200)
+        seen = np.zeros(rows.size, dtype=int)
+
+        for row_slice, col_slice, members in pixel_hyperslabs(rows, cols, max_gap=8):
+            seen[members] += 1
+            assert np.all((rows[members] >= row_slice.start) & (rows[members] < row_slice.stop))
+            assert np.all((cols[members] >= col_slice.start) & (cols[members] < col_slice.stop))
+
+        assert np.all(seen == 1)
+
+    def test_coalesces_nearby_and_splits_distant_pixels(self):
+        """Test that nearby pixels share a hyperslab and distant pixels do not span the gap."""
+        rows = np.array([0, 1, 2, 100])
+        cols = np.array([0, 3, 1, 100])
+        hyperslabs = list(pixel_hyperslabs(rows, cols, max_gap=8))
+
+        assert len(hyperslabs) == 2
+        assert (hyperslabs[0][0], hyperslabs[0][1]) == (slice(0, 3), slice(0, 4))
+        assert (hyperslabs[1][0], hyperslabs[1][1]) == (slice(100, 101), slice(100, 101))
+
+
+class TestReadNetCDFPixels:
+    """Test suite for read_netcdf_pixels."""
+
+    def test_matches_full_read(self, reflectance_filename):
+        """Test that scattered pixels match the full cube, in the order they were requested, with fill values as NaN."""
+        rows = np.array([39, 0, 5, 6, 20])
+        cols = np.array([29, 0, 7, 7, 15])
+        pixels = read_netcdf_pixels(reflectance_filename, "reflectance", rows, cols, band_indices=[1, 2, 7])
+
+        expected = reflectance_values()[rows, cols][:, [1, 2, 7]]
+        # the synthetic cube stores the fill value at swath pixel (0, 0)
+        expected[1] = np.nan
+
+        np.testing.assert_allclose(pixels, expected)
+
+
+class TestSamplePoints:
+    """Test suite for EMITL2ARFLGranule.sample_points."""
+
+    def test_swath_pixels_follow_GLT(self, reflectance_filename):
+        """Test that points at grid cell centers map to the swath pixels in the GLT."""
+        glt_y, glt_x = synthetic_GLT()
+        grid_rows, grid_cols = np.meshgrid(np.arange(0, 52, 5), np.arange(0, 46, 5), indexing="ij")
+        lats, lons = grid_cell_centers(grid_rows.ravel(), grid_cols.ravel())
+        rows, cols = swath_pixels_from_points(reflectance_filename, lats, lons)
+
+        np.testing.assert_array_equal(rows, glt_y[grid_rows, grid_cols].ravel() - 1)
+        np.testing.assert_array_equal(cols, glt_x[grid_rows, grid_cols].ravel() - 1)
+
+    def test_samples_match_swath_values(self, synthetic_granule_files):
+        """Test that spectra and quality flags match the swath values at the mapped pixels."""
+        granule = EMITL2ARFLGranule(*synthetic_granule_files)
+        glt_y, glt_x = synthetic_GLT()
+        grid_rows, grid_cols = np.nonzero(glt_y)
+        lats, lons = grid_cell_centers(grid_rows[::37], grid_cols[::37])
+        samples = granule.sample_points(lats, lons, bands=[0, 3, 4], quality_bands=[1, 0])
+        rows = glt_y[grid_rows[::37], grid_cols[::37]] - 1
+        cols = glt_x[grid_rows[::37], grid_cols[::37]] - 1
+
+        np.testing.assert_array_equal(samples.rows, rows)
+        np.testing.assert_allclose(samples.spectra, reflectance_values()[rows, cols][:, [0, 3, 4]])
+        np.testing.assert_array_equal(samples.quality_flags, mask_values()[rows, cols][:, [1, 0]])
+
+    def test_points_off_the_swath_are_nan(self, synthetic_granule_files):
+        """Test that points outside the grid or on unmapped cells return NaN and -1 indices."""
+        granule = EMITL2ARFLGranule(*synthetic_granule_files)
+        glt_y, _ = synthetic_GLT()
+        unmapped_rows, unmapped_cols = np.nonzero(glt_y == 0)
+        lats, lons = grid_cell_centers(unmapped_rows[:1], unmapped_cols[:1])
+        samples = granule.sample_points(np.append(lats, 10.0), np.append(lons, 10.0))
+
+        assert samples.spectra.shape == (2, 12)
+        assert np.all(np.isnan(samples.spectra))
+        assert np.all(np.isnan(samples.quality_flags))
+        np.testing.assert_array_equal(samples.rows, [-1, -1])
@@ -0,0 +1,57 @@
+"""
+Unit tests for the coarse geolocation footprint index.
+"""
+from unittest.mock import patch
+
+import pytest
+from rasters import RasterGrid
+
+from EMITL2ARFL.read_geolocation import read_geolocation
+from EMITL2ARFL.swath_footprint_index import SwathFootprintIndex, geometry_swath_window, read_swath_footprint_index
+
+
+BBOXES = [
+    (-115.998, 32.990, -115.990, 32.996),
+    (-116.1, 32.9, -115.9, 33.1),
+    (-115.9935, 32.9845, -115.9925, 32.9855),
+    (-116.0005, 32.9990, -115.9970, 33.0005),
+]
+
+
+class TestSwathFootprintIndex:
+    """Test suite for computing swath windows from block bounds."""
+
+    @pytest.mark.parametrize("bbox", BBOXES)
+    def test_window_matches_geolocation(self, reflectance_filename, bbox):
+        """Test that the index gives the same window as RasterGeolocation.window."""
+        grid = RasterGrid.from_bbox(bbox, cell_size=0.0005)
+        expected = read_geolocation(reflectance_filename).window(grid)
+
+        assert SwathFootprintIndex.build(reflectance_filename, block_size=8).window(grid) == expected
+        assert geometry_swath_window(reflectance_filename, grid) == expected
+
+    def test_buffer_matches_geolocation(self, reflectance_filename):
+        """Test that the pixel buffer is clipped to the swath like RasterGeolocation.window."""
+        grid = RasterGrid.from_bbox(BBOXES[3], cell_size=0.0005)
+        expected = read_geolocation(reflectance_filename).window(grid, buffer=3)
+
+        assert SwathFootprintIndex.build(reflectance_filename, block_size=8).window(grid, buffer=3) == expected
+
+    def test_only_intersecting_blocks_are_refined(self, reflectance_filename):
+        """Test that a small geometry reads the geolocation of a fraction of the blocks."""
+        index = SwathFootprintIndex.build(reflectance_filename, block_size=8)
+        blocks = index.candidate_blocks(BBOXES[2])
+
+        assert 0 < len(blocks) < index.xmin.size / 4
+
+    def test_no_intersection(self, reflectance_filename):
+        """Test that a geometry outside the swath raises like RasterGeolocation.window."""
+        with pytest.raises(ValueError):
+            geometry_swath_window(reflectance_filename, RasterGrid.from_bbox((10.0, 10.0, 10.1, 10.1), cell_size=0.01))
+
+    def test_index_is_cached(self, reflectance_filename):
+        """Test that the index is built once per file."""
+        first = read_swath_footprint_index(reflectance_filename)
+
+        with patch.object(SwathFootprintIndex, "build", side_effect=AssertionError("rebuilt")):
+            assert read_swath_footprint_index(reflectance_filename) is first
@@ -0,0 +1,160 @@
+"""
+Unit tests for the cached swath-to-grid resampler.
+"""
+import os
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+import rasters as rt
+from rasterio.windows import Window
+from rasters import RasterGrid
+
+from EMITL2ARFL.EMITL2ARFLGranule import EMITL2ARFLGranule
+from EMITL2ARFL.metadata_sidecar import read_netcdf_metadata
+from EMITL2ARFL.read_geolocation import read_geolocation
+from EMITL2ARFL.read_netcdf_array_into import read_netcdf_array_into
+from EMITL2ARFL.read_netcdf_raster import read_netcdf_raster
+from EMITL2ARFL.swath_footprint_index import geometry_swath_window
+from EMITL2ARFL.SwathResampler import _SWATH_RESAMPLER_CACHE, SwathResampler, read_swath_resampler, swath_resampler_filename
+from EMITL2ARFL.target_grid_hash import target_grid_hash
+
+from conftest import CROSSTRACK, DOWNTRACK
+
+
+BBOX = (-115.998, 32.990, -115.990, 32.996)
+
+
+@pytest.fixture(autouse=True)
+def clear_resampler_cache():
+    # every synthetic granule has the same granule ID, so resamplers must not leak between tests
+    _SWATH_RESAMPLER_CACHE.clear()
+    yield
+    _SWATH_RESAMPLER_CACHE.clear()
+
+
+def target_grid() -> RasterGrid:
+    return RasterGrid.from_bbox(BBOX, cell_size=0.0005)
+
+
+class TestSwathResampler:
+    """Test suite for SwathResampler."""
+
+    def test_matches_kd_tree_resample(self, reflectance_filename):
+        """Test that the gather matches a nearest-neighbour resample of the same swath window."""
+        grid = target_grid()
+        swath_window = geometry_swath_window(reflectance_filename, grid)
+        geolocation = read_geolocation(reflectance_filename, window=swath_window)
+        array = read_netcdf_array_into(reflectance_filename, "reflectance", window=swath_window, bands=[0, 5])
+        expected = rt.MultiRaster(array, geometry=geolocation).resample(grid)
+
+        resampler = SwathResampler.from_geolocation(geolocation, grid, swath_window=swath_window)
+
+        np.testing.assert_array_equal(resampler.apply(array), expected.array)
+        np.testing.assert_array_equal(resampler.apply(array[0]), expected.array[0])
+
+    def test_cached_per_granule_and_grid(self, reflectance_filename):
+        """Test that the resampler is built once per granule and grid."""
+        resampler = read_swath_resampler(reflectance_filename, target_grid())
+
+        assert read_swath_resampler(reflectance_filename, target_grid()) is resampler
+        assert read_swath_resampler(reflectance_filename, RasterGrid.from_bbox(BBOX, cell_size=0.001)) is not resampler
+
+    def test_changed_granule_is_not_served_from_memory(self, reflectance_filename):
+        """Test that a granule replaced under the same name does not reuse the in-memory resampler."""
+        resampler = read_swath_resampler(reflectance_filename, target_grid(), persist=False)
+        stat = os.stat(reflectance_filename)
+        os.utime(reflectance_filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert read_swath_resampler(reflectance_filename, target_grid(), persist=False) is not resampler
+
+    def test_grid_hash(self):
+        """Test that equal grids hash equally and different grids do not."""
+        assert target_grid_hash(target_grid()) == target_grid_hash(target_grid())
+        assert target_grid_hash(target_grid()) != target_grid_hash(RasterGrid.from_bbox(BBOX, cell_size=0.001))
+
+    def test_read_netcdf_raster_skips_geolocation(self, reflectance_filename):
+        """Test that reads with a resampler gather onto the grid without reading the geolocation."""
+        resampler = read_swath_resampler(reflectance_filename, target_grid())
+
+        with patch("EMITL2ARFL.read_netcdf_raster.read_geolocation", side_effect=AssertionError("geolocation read")):
+            raster = read_netcdf_raster(reflectance_filename, "reflectance", bands=[0], resampler=resampler)
+
+        assert raster.geometry is resampler.geometry
+        assert raster.shape[-2:] == resampler.source_index.shape
+
+    def test_granule_reflectance_on_grid(self, synthetic_granule_files):
+        """Test that granule reflectance on a grid masks clouds through the resampler."""
+        granule = EMITL2ARFLGranule(*synthetic_granule_files)
+        # straddles the edge of the cloud in the upper-left corner of the swath
+        grid = RasterGrid.from_bbox((-116.001, 32.993, -115.992, 33.002), cell_size=0.0005)
+        resampler = granule.resampler(grid)
+
+        clear = np.asarray(granule.reflectance(geometry=grid, bands=[0], filter_clouds=False).array)
+        filtered = np.asarray(granule.reflectance(geometry=grid, bands=[0]).array)
+        cloud = np.asarray(granule.quality_mask(geometry=grid).array)
+
+        assert cloud.shape == resampler.source_index.shape
+        assert cloud.any() and not cloud.all()
+        assert np.all(np.isnan(filtered[:, cloud]))
+        np.testing.assert_array_equal(filtered[:, ~cloud], clear[:, ~cloud])
+
+
+class TestPersistedSwathResampler:
+    """Test suite for resamplers persisted next to the granule."""
+
+    def test_reload_skips_geolocation(self, reflectance_filename):
+        """Test that a persisted resampler is reused without reading the geolocation."""
+        grid = target_grid()
+        built = read_swath_resampler(reflectance_filename, grid)
+        assert os.path.exists(swath_resampler_filename(reflectance_filename, grid))
+
+        _SWATH_RESAMPLER_CACHE.clear()
+
+        with patch("EMITL2ARFL.SwathResampler.read_geolocation", side_effect=AssertionError("geolocation read")), \
+                patch("EMITL2ARFL.SwathResampler.geometry_swath_window", side_effect=AssertionError("footprint read")):
+            loaded = read_swath_resampler(reflectance_filename, grid)
+
+        assert loaded is not built
+        assert loaded.swath_window == built.swath_window
+        np.testing.assert_array_equal(loaded.source_index, built.source_index)
+
+    def test_stale_build_version_is_rebuilt(self, reflectance_filename):
+        """Test that a resampler written for another software build is not reused."""
+        grid = target_grid()
+        resampler = read_swath_resampler(reflectance_filename, grid)
+        resampler_filename = swath_resampler_filename(reflectance_filename, grid)
+        resampler.save(resampler_filename, software_build_version="000000")
+
+        assert SwathResampler.load(resampler_filename, grid, software_build_version="010619") is None
+        assert SwathResampler.load(resampler_filename, grid, software_build_version="000000") is not None
+        assert SwathResampler.load(resampler_filename, RasterGrid.from_bbox(BBOX, cell_size=0.001), software_build_version="000000") is None
+
+    def test_resampler_for_another_swath_is_rebuilt(self, reflectance_filename):
+        """Test that a persisted resampler whose swath window does not fit the granule is rebuilt instead of failing in apply."""
+        grid = target_grid()
+        built = read_swath_resampler(reflectance_filename, grid)
+        resampler_filename = swath_resampler_filename(reflectance_filename, grid)
+        software_build_version = read_netcdf_metadata(reflectance_filename)["attributes"].get("software_build_version")
+        window = built.swath_window
+        mismatched = SwathResampler(
+            source_index=built.source_index,
+            geometry=grid,
+            swath_window=Window(window.col_off, window.row_off + DOWNTRACK, window.width, window.height),
+            swath_shape=built.swath_shape
+        )
+        mismatched.save(resampler_filename, software_build_version=software_build_version)
+
+        assert SwathResampler.load(resampler_filename, grid, software_build_version=software_build_version) is not None
+        assert SwathResampler.load(
+            resampler_filename,
+            grid,
+            software_build_version=software_build_version,
+            swath_dimensions=(DOWNTRACK, CROSSTRACK)
+        ) is None
+
+        _SWATH_RESAMPLER_CACHE.clear()
+        rebuilt = read_swath_resampler(reflectance_filename, grid)
+
+        assert rebuilt.swath_window == built.swath_window
+        np.testing.assert_array_equal(rebuilt.source_index, built.source_index)
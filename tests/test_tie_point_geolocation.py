@@ -0,0 +1,91 @@
+"""
+Unit tests for the tie-point compressed geolocation.
+"""
+import numpy as np
+from rasters import RasterGeolocation, RasterGrid
+
+from EMITL2ARFL.read_geolocation import read_geolocation
+from EMITL2ARFL.read_netcdf_raster import read_netcdf_raster
+from EMITL2ARFL.TiePointGeolocation import TiePointGeolocation
+
+
+def curved_lon_lat(rows: int = 70, cols: int = 50):
+    row, col = np.meshgrid(np.arange(rows), np.arange(cols), indexing="ij")
+    lon = -116.0 + 0.0005 * col + 1e-7 * (col - 25) ** 2
+    lat = 33.0 - 0.0005 * row + 2e-7 * row * col
+    return lon, lat
+
+
+class TestTiePointGeolocation:
+    """Test suite for compressing geolocation into tie points."""
+
+    def test_max_error_is_measured(self):
+        """Test that max_error is the largest deviation from the full arrays."""
+        lon, lat = curved_lon_lat()
+        geolocation = TiePointGeolocation.from_arrays(lon, lat, step=16)
+        error = max(np.abs(geolocation.x - lon).max(), np.abs(geolocation.y - lat).max())
+
+        assert geolocation.max_error == error
+        assert 0 < geolocation.max_error < 1e-4
+        assert geolocation.shape == (70, 50)
+
+    def test_tie_points_are_exact_and_compact(self):
+        """Test that the tie points and edges are reproduced exactly and the storage is small."""
+        lon, lat = curved_lon_lat()
+        geolocation = TiePointGeolocation.from_arrays(lon, lat, step=16)
+
+        np.testing.assert_array_equal(geolocation.x[::16, ::16], lon[::16, ::16])
+        np.testing.assert_array_equal(geolocation.y[-1, [0, 16, 32, 48, 49]], lat[-1, [0, 16, 32, 48, 49]])
+        assert geolocation.nbytes < (lon.nbytes + lat.nbytes) / 20
+
+    def test_slice_matches_full_interpolation(self):
+        """Test that subsets interpolate only the sliced pixels."""
+        lon, lat = curved_lon_lat()
+        geolocation = TiePointGeolocation.from_arrays(lon, lat, step=16)
+        subset = geolocation[10:30, 5:45]
+
+        assert isinstance(subset, RasterGeolocation)
+        np.testing.assert_array_equal(subset.x, geolocation.x[10:30, 5:45])
+        np.testing.assert_array_equal(subset.y, geolocation.y[10:30, 5:45])
+
+    def test_antimeridian(self):
+        """Test that longitudes are interpolated across the antimeridian."""
+        row, col = np.meshgrid(np.arange(20), np.arange(20), indexing="ij")
+        lon = np.mod(179.995 + 0.001 * col + 180, 360) - 180
+        lat = 10.0 - 0.001 * row
+        geolocation = TiePointGeolocation.from_arrays(lon, lat, step=8)
+
+        assert geolocation.wrap_longitude
+        assert geolocation.max_error < 1e-6
+
+    def test_window_matches_full_geolocation(self, reflectance_filename):
+        """Test that spatial queries give the same window as the full geolocation."""
+        geolocation = read_geolocation(reflectance_filename)
+        compact = read_geolocation(reflectance_filename, tie_point_step=8)
+        grid = RasterGrid.from_bbox((-115.998, 32.990, -115.990, 32.996), cell_size=0.0005)
+
+        assert isinstance(compact, TiePointGeolocation)
+        assert compact.max_error < 1e-9
+        assert compact.window(grid) == geolocation.window(grid)
+
+    def test_read_netcdf_raster(self, reflectance_filename):
+        """Test that read_netcdf_raster attaches the compact geolocation."""
+        raster = read_netcdf_raster(reflectance_filename, "reflectance", bands=[2], tie_point_step=8)
+
+        assert isinstance(raster.geometry, TiePointGeolocation)
+        assert raster.geometry.shape == (40, 30)
+
+    def test_inherited_geolocation_api(self):
+        """Test that the inherited RasterGeolocation API works without the full-resolution arrays."""
+        lon, lat = curved_lon_lat()
+        geolocation = TiePointGeolocation.from_arrays(lon, lat, step=16)
+        full = geolocation.to_geolocation()
+        resized = geolocation.resize((35, 25))
+
+        assert isinstance(resized, RasterGeolocation)
+        assert resized.shape == (35, 25)
+        np.testing.assert_array_equal(resized.x, full.resize((35, 25)).x)
+        np.testing.assert_array_equal(resized.y, full.resize((35, 25)).y)
+        assert geolocation.bbox == full.bbox
+        assert geolocation.corner_polygon.wkt == full.corner_polygon.wkt
+        assert geolocation == full
@@ -311,5 +311,28 @@ class TestTimeSeriesEdgeCases:
         assert len(filenames) == 0
 
 
+class TestTimeSeriesBandSelection:
+    """Test suite for band selection in time-series generation."""
+
+    @patch('EMITL2ARFL.generate_EMIT_L2A_RFL_timeseries.retrieve_EMIT_L2A_RFL')
+    @patch('EMITL2ARFL.generate_EMIT_L2A_RFL_timeseries.exists')
+    def test_generate_timeseries_good_bands_only(self, mock_exists, mock_retrieve):
+        """Test that good_bands_only is passed through to retrieval."""
+        from rasters import Point
+
+        mock_exists.return_value = False
+        mock_retrieve.return_value = Mock()
+
+        generate_EMIT_L2A_RFL_timeseries(
+            start_date_UTC=date(2023, 8, 15),
+            end_date_UTC=date(2023, 8, 15),
+            geometry=Point(-118.5, 36.5, crs=4326),
+            output_directory="/tmp/emit_output",
+            good_bands_only=True
+        )
+
+        assert mock_retrieve.call_args[1]["good_bands_only"] is True
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])